@@ -5,6 +5,8 @@ dans index-supabase.js de manière sécurisée
 """
 
 import re
+import sys
+import importlib
 
 def read_file(filepath):
     with open(filepath, 'r', encoding='utf-8') as f:
@@ -14,10 +16,7 @@ def write_file(filepath, content):
     with open(filepath, 'w', encoding='utf-8') as f:
         f.write(content)
 
-def add_helper_functions(content):
-    """Ajoute generatePDFHTML et sendBrevoEmail avant export default"""
-    
-    helper_functions = '''
+HELPER_FUNCTIONS = '''
 // ============================================
 // PDF TEMPLATE: Rapport Ikigai
 // ============================================
@@ -129,6 +128,9 @@ async function sendBrevoEmail(env, templateId, toEmail, params) {
 }
 
 '''
+
+def add_helper_functions(content):
+    """Ajoute generatePDFHTML et sendBrevoEmail avant export default"""
     
     # Find the export default position
     export_match = re.search(r'export default \{', content)
@@ -138,20 +140,14 @@ async function sendBrevoEmail(env, templateId, toEmail, params) {
     insert_pos = export_match.start()
     
     # Insert helper functions before export
-    new_content = content[:insert_pos] + helper_functions + content[insert_pos:]
+    new_content = content[:insert_pos] + HELPER_FUNCTIONS + content[insert_pos:]
     
     return new_content
 
 if __name__ == '__main__':
-    filepath = 'index-supabase.js'
-    
-    print("📖 Reading index-supabase.js...")
-    content = read_file(filepath)
-    
-    print("✏️  Adding helper functions...")
-    new_content = add_helper_functions(content)
-    
-    print("💾 Writing updated file...")
-    write_file(filepath, new_content)
-    
-    print("✅ Done! Helper functions added before 'export default'")
+    # Applied through patch-worker.py: it records the patch in the worker's
+    # "// @patch" ledger and skips it when it is already there, so running
+    # this script twice (or after patch-worker.py) no longer duplicates code.
+    # Extra arguments (--dry-run, --file) are passed through.
+    patcher = importlib.import_module('patch-worker')
+    patcher.main(['--only', 'helpers'] + sys.argv[1:])
@@ -5,6 +5,8 @@ Endpoints: PDF, Google OAuth (3), Brevo Notification
 """
 
 import re
+import sys
+import importlib
 
 def read_file(filepath):
     with open(filepath, 'r', encoding='utf-8') as f:
@@ -14,10 +16,7 @@ def write_file(filepath, content):
     with open(filepath, 'w', encoding='utf-8') as f:
         f.write(content)
 
-def add_all_remaining_endpoints(content):
-    """Ajoute tous les endpoints restants après /api/send-invitation"""
-    
-    all_endpoints = '''\t\t// ============ PDF GENERATION ENDPOINT ============
+ALL_ENDPOINTS = '''\t\t// ============ PDF GENERATION ENDPOINT ============
 
 \t\t// POST /api/generate-pdf
 \t\tif (path === '/api/generate-pdf' && method === 'POST') {
@@ -234,6 +233,9 @@ def add_all_remaining_endpoints(content):
 \t\t}
 
 '''
+
+def add_all_remaining_endpoints(content):
+    """Ajoute tous les endpoints restants après /api/send-invitation"""
     
     # Find the admin stats endpoint
     admin_match = re.search(r'(\t\t// GET /api/dashboard/admin/stats)', content)
@@ -243,26 +245,14 @@ def add_all_remaining_endpoints(content):
     insert_pos = admin_match.start()
     
     # Insert all endpoints before admin
-    new_content = content[:insert_pos] + all_endpoints + content[insert_pos:]
+    new_content = content[:insert_pos] + ALL_ENDPOINTS + content[insert_pos:]
     
     return new_content
 
 if __name__ == '__main__':
-    filepath = 'index-supabase.js'
-    
-    print("📖 Reading index-supabase.js...")
-    content = read_file(filepath)
-    
-    print("✏️  Adding remaining endpoints:")
-    print("   - /api/generate-pdf")
-    print("   - /api/google/oauth/init")
-    print("   - /api/google/oauth/callback")
-    print("   - /api/google/create-event")
-    print("   - /api/notify/new-client")
-    
-    new_content = add_all_remaining_endpoints(content)
-    
-    print("💾 Writing updated file...")
-    write_file(filepath, new_content)
-    
-    print("✅ Done! All endpoints added")
+    # Applied through patch-worker.py: it records the patch in the worker's
+    # "// @patch" ledger and skips it when it is already there, so running
+    # this script twice (or after patch-worker.py) no longer duplicates code.
+    # Extra arguments (--dry-run, --file) are passed through.
+    patcher = importlib.import_module('patch-worker')
+    patcher.main(['--only', 'remaining-endpoints'] + sys.argv[1:])
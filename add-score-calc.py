@@ -1,25 +1,13 @@
 #!/usr/bin/env python3
 # Add score calculation after Claude returns analysis
 
-file_path = 'index-supabase.js'
-
-# Read file
-with open(file_path, 'r', encoding='utf-8') as f:
-    lines = f.readlines()
-
-# Find the line with "return analysis;" after Claude
-insert_at = None
-for i, line in enumerate(lines):
-    if i > 450 and 'return analysis;' in line and i < 460:
-        insert_at = i
-        break
+import sys
+import importlib
 
-if not insert_at:
-    print("❌ Could not find insertion point")
-    exit(1)
+file_path = 'index-supabase.js'
 
 # Code to insert (with 3 tabs indentation)
-score_calc_code = """\t\t\t
+SCORE_CALC_CODE = """\t\t\t
 \t\t\t// CRITIQUE: Claude ne génère PAS les scores - calcul depuis les réponses
 \t\t\tif (!analysis.score || typeof analysis.score !== 'object') {
 \t\t\t\tconsole.log('📊 Calcul scores depuis questionnaire...');
@@ -38,12 +26,10 @@ score_calc_code = """\t\t\t
 \t\t\t}
 """
 
-# Insert the code before return statement
-lines.insert(insert_at, score_calc_code)
-
-# Write back
-with open(file_path, 'w', encoding='utf-8') as f:
-    f.writelines(lines)
-
-print(f"✅ Code inserted at line {insert_at + 1}")
-print("📝 Added score calculation after Claude returns analysis")
+if __name__ == '__main__':
+    # Applied through patch-worker.py: it records the patch in the worker's
+    # "// @patch" ledger and skips it when it is already there, so running
+    # this script twice (or after patch-worker.py) no longer duplicates code.
+    # Extra arguments (--dry-run, --file) are passed through.
+    patcher = importlib.import_module('patch-worker')
+    patcher.main(['--only', 'score-calc'] + sys.argv[1:])
@@ -5,6 +5,8 @@ et la fonction generateInvitationEmailHTML
 """
 
 import re
+import sys
+import importlib
 
 def read_file(filepath):
     with open(filepath, 'r', encoding='utf-8') as f:
@@ -14,11 +16,8 @@ def write_file(filepath, content):
     with open(filepath, 'w', encoding='utf-8') as f:
         f.write(content)
 
-def add_send_invitation_endpoint(content):
-    """Ajoute l'endpoint /api/send-invitation et generateInvitationEmailHTML"""
-    
-    # Code de l'endpoint
-    endpoint_code = '''\t\t// ============ INVITATION ENDPOINT ============
+# Code de l'endpoint
+ENDPOINT_CODE = '''\t\t// ============ INVITATION ENDPOINT ============
 
 \t\t// POST /api/send-invitation
 \t\tif (path === '/api/send-invitation' && method === 'POST') {
@@ -78,9 +77,9 @@ def add_send_invitation_endpoint(content):
 \t\t}
 
 '''
-    
-    # Template email (à ajouter avant generatePDFHTML)
-    email_template = '''// ============================================
+
+# Template email (à ajouter avant generatePDFHTML)
+EMAIL_TEMPLATE = '''// ============================================
 // EMAIL TEMPLATE: Invitation Client
 // ============================================
 
@@ -121,6 +120,9 @@ function generateInvitationEmailHTML(to, clientName, coachName, personalMessage,
 }
 
 '''
+
+def add_send_invitation_endpoint(content):
+    """Ajoute l'endpoint /api/send-invitation et generateInvitationEmailHTML"""
     
     # Find the admin stats endpoint
     admin_match = re.search(r'(\t\t// GET /api/dashboard/admin/stats)', content)
@@ -130,7 +132,7 @@ function generateInvitationEmailHTML(to, clientName, coachName, personalMessage,
     insert_pos = admin_match.start()
     
     # Insert endpoint before admin
-    new_content = content[:insert_pos] + endpoint_code + content[insert_pos:]
+    new_content = content[:insert_pos] + ENDPOINT_CODE + content[insert_pos:]
     
     # Now insert email template before generatePDFHTML
     pdf_match = re.search(r'// ============================================\n// PDF TEMPLATE: Rapport Ikigai', new_content)
@@ -138,22 +140,14 @@ function generateInvitationEmailHTML(to, clientName, coachName, personalMessage,
         raise Exception("Cannot find PDF template marker")
     
     template_pos = pdf_match.start()
-    final_content = new_content[:template_pos] + email_template + new_content[template_pos:]
+    final_content = new_content[:template_pos] + EMAIL_TEMPLATE + new_content[template_pos:]
     
     return final_content
 
 if __name__ == '__main__':
-    filepath = 'index-supabase.js'
-    
-    print("📖 Reading index-supabase.js...")
-    content = read_file(filepath)
-    
-    print("✏️  Adding /api/send-invitation endpoint...")
-    new_content = add_send_invitation_endpoint(content)
-    
-    print("💾 Writing updated file...")
-    write_file(filepath, new_content)
-    
-    print("✅ Done! Endpoint /api/send-invitation added")
-    print("   - generateInvitationEmailHTML() added")
-    print("   - POST /api/send-invitation added before admin endpoints")
+    # Applied through patch-worker.py: it records the patch in the worker's
+    # "// @patch" ledger and skips it when it is already there, so running
+    # this script twice (or after patch-worker.py) no longer duplicates code.
+    # Extra arguments (--dry-run, --file) are passed through.
+    patcher = importlib.import_module('patch-worker')
+    patcher.main(['--only', 'send-invitation-endpoint', 'invitation-email-template'] + sys.argv[1:])
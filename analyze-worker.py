@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Analyse de la taille du worker et suppression du code mort
+
+Cold starts grow with script size, and index-supabase.js keeps accumulating
+helpers through the patch scripts. This tool:
+  - attributes the bundle bytes (raw and gzip) to every top-level declaration
+    and, inside handleRequest, to every endpoint of the route chain
+  - builds the reference graph from the export default entry point and lists
+    the functions and constants nothing reaches
+  - finds duplicated inserted blocks: top-level names declared twice,
+    identical function bodies under different names, routes declared twice
+    (the second copy can never run) and repeated "// @patch" ledger entries
+  - writes a stripped bundle without the dead and shadowed code (optionally
+    minified with the build-assets.py JS minifier), checked with node --check
+  - appends a before/after size record to a history file, one line per run
+
+Works on the source worker and on the one produced by generate-router.py.
+
+Usage:
+    python3 analyze-worker.py                          # report + build/index-supabase.stripped.js
+    python3 analyze-worker.py --file build/index-supabase.js --minify
+    python3 analyze-worker.py --report-only
+"""
+
+import re
+import sys
+import gzip
+import json
+import hashlib
+import argparse
+import importlib
+import subprocess
+from datetime import datetime
+from pathlib import Path
+
+router = importlib.import_module("generate-router")
+
+WORKER_FILE = "index-supabase.js"
+OUTPUT_FOLDER = Path("build")
+HISTORY_FILE = Path("bench-results") / "worker-size.jsonl"
+TOP_ITEMS = 25  # rows shown in the size table
+
+DECLARATION_RE = re.compile(
+    r"(?P<default>export\s+default\b)"
+    r"|(?:export\s+)?(?:async\s+)?function\s*\*?\s*(?P<function>[\w$]+)"
+    r"|(?:export\s+)?(?:const|let|var)\s+(?P<variable>[\w$]+)"
+    r"|(?P<import>import\b)"
+)
+IDENTIFIER_RE = re.compile(r"[A-Za-z_$][\w$]*")
+LEDGER_RE = re.compile(r"^[ \t]*// @patch ([\w-]+) ([0-9a-f]{12})$", re.M)
+
+
+def gzip_size(text):
+    return len(gzip.compress(text.encode("utf-8"), compresslevel=9, mtime=0))
+
+
+class Item:
+    """One top-level statement of the worker"""
+
+    def __init__(self, kind, name, start, end, text, code):
+        self.kind = kind    # function | variable | import | export | other
+        self.name = name
+        self.start = start
+        self.end = end
+        self.text = text
+        self.refs = set(IDENTIFIER_RE.findall(code)) - {name}
+        self.status = "kept"
+
+    @property
+    def size(self):
+        return len(self.text.encode("utf-8"))
+
+
+# ============================================
+# Parsing
+# ============================================
+
+def statement_end(source, start, is_function):
+    """End offset of the top-level statement starting at start"""
+    depth = 0
+    for i, c in router.scan_code(source, start):
+        if c in "([{":
+            depth += 1
+        elif c in ")]}":
+            depth -= 1
+            if depth == 0 and c == "}" and is_function:
+                return i + 1
+        elif c == ";" and depth == 0:
+            return i + 1
+    return len(source)
+
+
+def code_only(text):
+    """Code characters of text, literals and comments removed (${...} kept)"""
+    return "".join(c for _, c in router.scan_code(text, 0))
+
+
+def parse_items(source):
+    """Split the worker into top-level statements"""
+    line_starts = set()
+    depth = 0
+    for i, c in router.scan_code(source, 0):
+        if depth == 0 and not c.isspace() and (i == 0 or source[i - 1] == "\n"):
+            line_starts.add(i)
+        if c in "([{":
+            depth += 1
+        elif c in ")]}":
+            depth -= 1
+
+    items = []
+    pos = 0
+    for start in sorted(line_starts):
+        if start < pos:
+            continue
+        match = DECLARATION_RE.match(source, start)
+        kind = match.lastgroup if match else "other"
+        end = statement_end(source, start, kind in ("function", "default"))
+        if kind == "default" and source.startswith(";", end):
+            end += 1  # export default { ... };
+        if kind == "other":
+            name = source[start:source.find("\n", start)].strip()[:40]
+        elif kind == "import":
+            name = source[start:end].split("from")[-1].strip(" ;'\"")
+        elif kind == "default":
+            kind, name = "export", "export default"
+        else:
+            name = match.group(kind)
+        text = source[start:end]
+        items.append(Item(kind, name, start, end, text, code_only(text)))
+        pos = end
+    return items
+
+
+# ============================================
+# Analysis
+# ============================================
+
+def reachable(items):
+    """Names reachable from the entry points (export default, imports, other statements)"""
+    by_name = {}
+    for item in items:
+        if item.kind in ("function", "variable"):
+            by_name.setdefault(item.name, []).append(item)
+
+    roots = [item for item in items if item.kind not in ("function", "variable")]
+    seen = set()
+    stack = [ref for item in roots for ref in item.refs if ref in by_name]
+    while stack:
+        name = stack.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        for item in by_name[name]:
+            stack.extend(ref for ref in item.refs if ref in by_name and ref not in seen)
+    return seen
+
+
+def body_hash(item):
+    """Hash of a function's code with its name removed and whitespace collapsed"""
+    code = code_only(item.text)
+    code = code.replace(item.name, "", 1)
+    return hashlib.sha256(re.sub(r"\s+", " ", code).encode("utf-8")).hexdigest()
+
+
+def find_duplicates(items, routes, source):
+    findings = []
+    declared = {}
+    for item in items:
+        if item.kind in ("function", "variable"):
+            declared.setdefault(item.name, []).append(item)
+    for name, copies in declared.items():
+        if len(copies) > 1:
+            for item in copies[:-1]:
+                item.status = "duplicate"
+            findings.append(f"{name} declared {len(copies)} times (last one kept)")
+
+    by_body = {}
+    for item in items:
+        if item.kind == "function" and item.status == "kept":
+            by_body.setdefault(body_hash(item), []).append(item.name)
+    for names in by_body.values():
+        if len(names) > 1:
+            findings.append(f"identical bodies: {', '.join(names)}")
+
+    seen_routes = {}
+    for route in routes:
+        label = route.label()
+        if label in seen_routes:
+            route.shadowed = True
+            findings.append(f"route {label} declared twice, the second block never runs")
+        else:
+            seen_routes[label] = route
+            route.shadowed = False
+
+    ledger = {}
+    for name, fp in LEDGER_RE.findall(source):
+        ledger.setdefault(name, []).append(fp)
+    for name, fps in ledger.items():
+        if len(fps) > 1:
+            findings.append(f"patch {name} applied {len(fps)} times ({', '.join(fps)})")
+    return findings
+
+
+def chain_routes(source):
+    """Endpoints of the handleRequest if-chain (empty for a generated router)"""
+    try:
+        _, try_pos, catch_pos, _ = router.split_handler(source)
+        return router.extract_routes(source, try_pos, catch_pos)
+    except (router.RouterError, ValueError):
+        return []
+
+
+def route_spans(source, routes):
+    """Offsets of every route's if-block, leading comments included"""
+    _, pos, _, _ = router.split_handler(source)
+    spans = []
+    for route in routes:
+        body_start = source.index(route.body, pos)
+        start = source.rindex("\n" + router.BLOCK_INDENT + "if (", pos, body_start) + 1
+        for comment in reversed(route.comments):
+            previous = source.rfind("\n", 0, start - 1) + 1
+            if source[previous:start].strip() == comment:
+                start = previous
+        pos = source.index("\n", body_start + len(route.body)) + 1
+        spans.append((start, pos))
+    return spans
+
+
+# ============================================
+# Stripping
+# ============================================
+
+def strip_worker(source, items, routes):
+    """Remove dead / duplicate top-level items and shadowed routes"""
+    spans = [(item.start, item.end) for item in items if item.status != "kept"]
+    if routes:
+        spans += [span for route, span in zip(routes, route_spans(source, routes)) if route.shadowed]
+
+    out = []
+    pos = 0
+    for start, end in sorted(spans):
+        out.append(source[pos:start])
+        pos = end
+        # drop the blank line left behind
+        while source.startswith("\n", pos) and out and out[-1].endswith("\n\n"):
+            pos += 1
+    out.append(source[pos:])
+    return "".join(out)
+
+
+# ============================================
+# Reporting
+# ============================================
+
+def size_table(source, items, routes):
+    rows = [
+        {"name": item.name, "kind": item.kind, "bytes": item.size,
+         "gzip": gzip_size(item.text), "status": item.status}
+        for item in items
+    ]
+    for route in routes:
+        rows.append({
+            "name": f"↳ {route.label()}", "kind": "endpoint", "bytes": len(route.body.encode("utf-8")),
+            "gzip": gzip_size(route.body), "status": "shadowed" if route.shadowed else "kept",
+        })
+    covered = sum(item.size for item in items)
+    rows.append({"name": "(comments and blank lines)", "kind": "other",
+                 "bytes": len(source.encode("utf-8")) - covered, "gzip": None, "status": "kept"})
+    return sorted(rows, key=lambda row: row["bytes"], reverse=True)
+
+
+def print_table(rows, total):
+    print(f"\n📊 Size by declaration / endpoint ({total / 1024:.1f} KB total, ↳ endpoints are part of handleRequest)")
+    for row in rows[:TOP_ITEMS]:
+        marker = {"kept": "  ", "dead": "💀", "duplicate": "♊", "shadowed": "🚫"}[row["status"]]
+        share = row["bytes"] / total if total else 0
+        gz = f"{row['gzip'] / 1024:5.1f} KB gz" if row["gzip"] is not None else " " * 11
+        print(f"   {marker} {row['name'][:44]:<44} {row['kind']:<9} {row['bytes'] / 1024:6.1f} KB  {gz}  {share:5.1%}")
+    if len(rows) > TOP_ITEMS:
+        print(f"   ... {len(rows) - TOP_ITEMS} more (see the JSON report)")
+
+
+def git_revision():
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Report worker size and strip dead code")
+    parser.add_argument("--file", default=WORKER_FILE, help=f"Worker to analyse (default: {WORKER_FILE})")
+    parser.add_argument("--output", "-o", type=Path,
+                        help="Stripped bundle (default: build/<name>.stripped.js)")
+    parser.add_argument("--minify", action="store_true", help="Also minify the stripped bundle")
+    parser.add_argument("--report-only", action="store_true", help="Do not write the stripped bundle")
+    parser.add_argument("--report", type=Path, help="Write the full report as JSON")
+    parser.add_argument("--history", default=str(HISTORY_FILE),
+                        help=f"Append a size record here (default: {HISTORY_FILE}, '' to disable)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    print(f"📖 Reading {args.file}...")
+    with open(args.file, "r", encoding="utf-8") as f:
+        source = f.read()
+
+    try:
+        items = parse_items(source)
+        routes = chain_routes(source)
+    except router.RouterError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    findings = find_duplicates(items, routes, source)
+    live = reachable([item for item in items if item.status == "kept"])
+    for item in items:
+        if item.kind in ("function", "variable") and item.status == "kept" and item.name not in live:
+            item.status = "dead"
+
+    rows = size_table(source, items, routes)
+    print_table(rows, len(source.encode("utf-8")))
+
+    dead = [item for item in items if item.status == "dead"]
+    print(f"\n💀 {len(dead)} unreferenced declaration(s)")
+    for item in dead:
+        print(f"   {item.name} ({item.size / 1024:.1f} KB)")
+    print(f"♊ {len(findings)} duplicate finding(s)")
+    for finding in findings:
+        print(f"   {finding}")
+
+    stripped = strip_worker(source, items, routes)
+    if args.minify:
+        stripped = importlib.import_module("build-assets").minify_js(stripped)
+
+    before = {"bytes": len(source.encode("utf-8")), "gzip": gzip_size(source)}
+    after = {"bytes": len(stripped.encode("utf-8")), "gzip": gzip_size(stripped)}
+    print(f"\n📉 {before['bytes'] / 1024:.1f} KB ({before['gzip'] / 1024:.1f} KB gz) → "
+          f"{after['bytes'] / 1024:.1f} KB ({after['gzip'] / 1024:.1f} KB gz)")
+
+    if not args.report_only:
+        if not router.node_check_syntax(stripped):
+            print("❌ Stripped bundle does not parse, nothing written")
+            sys.exit(1)
+        output = args.output or OUTPUT_FOLDER / f"{Path(args.file).stem}.stripped.js"
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(stripped)
+        print(f"💾 Written {output}")
+
+    record = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "file": str(args.file),
+        "minified": args.minify,
+        "before": before,
+        "after": after,
+        "dead": [item.name for item in dead],
+        "duplicates": findings,
+    }
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(dict(record, items=rows), f, indent=2, ensure_ascii=False)
+        print(f"💾 Report saved to {args.report}")
+    if args.history:
+        Path(args.history).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.history, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        print(f"🗂️  Size record appended to {args.history}")
+
+
+if __name__ == "__main__":
+    main()
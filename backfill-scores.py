@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Génération SQL du backfill des scores (UPDATE ... FROM (VALUES ...) par lots)
+
+Set-based replacement for the hand-edited fix-existing-scores.sql: streams an
+analyses export (JSONL or CSV, as read by ikigai_scoring.py) and writes a few
+large UPDATE statements that fill passion_score / profession_score /
+mission_score / vocation_score and merge the new-style keys into the score
+JSONB, one statement per --batch-size rows.
+
+Modes:
+  normalise  take the stored score (new 'passion' keys first, then the legacy
+             'passion_score' keys, like fix-existing-scores.sql) and recompute
+             from the answers only when no score is stored; rows with neither
+             are skipped, like the NULL scores in fix-existing-scores.sql
+  recompute  always recompute from the answers with the worker formula
+
+Rows whose columns and score JSONB already hold the target values are left
+out, and each statement only touches rows that actually change.
+
+Usage:
+    python3 backfill-scores.py analyses.jsonl -o backfill.sql
+    python3 backfill-scores.py analyses.csv --mode recompute --batch-size 2000
+    psql "$DATABASE_URL" -f backfill.sql
+"""
+
+import sys
+import json
+import math
+import uuid
+import argparse
+
+import ikigai_scoring
+
+DIMENSIONS = ikigai_scoring.DIMENSIONS
+SCORE_COLUMNS = tuple(f'{dim}_score' for dim in DIMENSIONS)
+
+
+def parse_score(value):
+    """score column from an export: dict, JSON text, or empty"""
+    if isinstance(value, str):
+        value = json.loads(value) if value.strip() else None
+    return value if isinstance(value, dict) else {}
+
+
+def to_int(value):
+    """Score value -> integer 0..100 (Math.round semantics), None if not a number"""
+    if isinstance(value, bool) or value in (None, ''):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    if math.isnan(number):
+        return None
+    return max(0, min(ikigai_scoring.MAX_SCORE, math.floor(number + 0.5)))
+
+
+def stored_scores(score):
+    """{'passion': .., ...} from a score object with new or legacy keys, None if it holds none"""
+    values = {}
+    for dim in DIMENSIONS:
+        value = to_int(score.get(dim))
+        values[dim] = value if value is not None else to_int(score.get(f'{dim}_score'))
+    if all(value is None for value in values.values()):
+        return None
+    return {dim: value or 0 for dim, value in values.items()}
+
+
+def row_has_answers(row):
+    """Whether an export row carries a non-empty answers object"""
+    if not any(key in row for key in ('answers', 'questionnaire_data')):
+        return False
+    return any(True for _ in ikigai_scoring.iter_answer_values(ikigai_scoring.row_answers(row)))
+
+
+def target_scores(row, mode):
+    """-> (scores, source) where source is 'stored' or 'answers'
+
+    (None, 'noData') in normalise mode when the row has neither a stored score
+    nor answers: scoring {} would only write the default scores.
+    """
+    if mode == 'normalise':
+        scores = stored_scores(parse_score(row.get('score')))
+        if scores is not None:
+            return scores, 'stored'
+        if not row_has_answers(row):
+            return None, 'noData'
+    return ikigai_scoring.score_answers(ikigai_scoring.row_answers(row)), 'answers'
+
+
+def up_to_date(row, scores):
+    score = parse_score(row.get('score'))
+    return all(
+        to_int(row.get(f'{dim}_score')) == value and to_int(score.get(dim)) == value
+        for dim, value in scores.items()
+    )
+
+
+def parse_id(value):
+    """Canonical UUID text, None for ids that would make the whole batch fail"""
+    try:
+        return str(uuid.UUID(str(value)))
+    except ValueError:
+        return None
+
+
+def sql_string(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def update_statement(table, values):
+    """One set-based UPDATE for a batch of (id, passion, profession, mission, vocation)"""
+    rows = ',\n'.join(
+        f'    ({sql_string(row_id)}, {", ".join(str(v) for v in scores)})' for row_id, *scores in values
+    )
+    assignments = ',\n'.join(f'    {column} = v.{column}' for column in SCORE_COLUMNS)
+    merged_keys = ', '.join(f"'{dim}', v.{dim}_score" for dim in DIMENSIONS)
+    changed = '\n    OR '.join(f'a.{column} IS DISTINCT FROM v.{column}' for column in SCORE_COLUMNS)
+    return (
+        f'UPDATE {table} AS a\nSET\n{assignments},\n'
+        f"    score = COALESCE(a.score, '{{}}'::jsonb) || jsonb_build_object({merged_keys})\n"
+        f'FROM (VALUES\n{rows}\n) AS v(id, {", ".join(SCORE_COLUMNS)})\n'
+        f'WHERE a.id = v.id::uuid\n'
+        f"  AND (\n    {changed}\n    OR NOT (COALESCE(a.score, '{{}}'::jsonb) @> jsonb_build_object({merged_keys}))\n  );\n"
+    )
+
+
+def iter_batches(rows, mode, batch_size, include_all, stats):
+    batch = []
+    for row in rows:
+        stats['rows'] += 1
+        row_id = parse_id(row.get('id'))
+        if not row_id:
+            stats['badId'] += 1
+            continue
+        scores, source = target_scores(row, mode)
+        if scores is None:
+            stats[source] += 1
+            continue
+        if not include_all and up_to_date(row, scores):
+            stats['upToDate'] += 1
+            continue
+        stats[source] += 1
+        batch.append((row_id, *(scores[dim] for dim in DIMENSIONS)))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate set-based SQL to backfill the analyses score columns")
+    parser.add_argument('input', nargs='?', default='-', help="analyses export (JSONL or CSV, '-' = stdin)")
+    parser.add_argument('--format', choices=('jsonl', 'csv'), help="Input format (default: from extension)")
+    parser.add_argument('--output', '-o', help="Write the SQL here instead of stdout")
+    parser.add_argument('--mode', choices=('normalise', 'recompute'), default='normalise',
+                        help="normalise stored scores or recompute them from the answers (default: normalise)")
+    parser.add_argument('--batch-size', '-b', type=int, default=5000, help="Rows per UPDATE statement (default: 5000)")
+    parser.add_argument('--table', default='public.analyses', help="Target table (default: public.analyses)")
+    parser.add_argument('--lock-timeout', default='5s',
+                        help="SET lock_timeout emitted before the updates, '' to omit (default: 5s)")
+    parser.add_argument('--all', action='store_true', help="Include rows that already look up to date")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.batch_size < 1:
+        sys.exit("❌ --batch-size must be at least 1")
+
+    fmt = args.format or ('csv' if args.input.lower().endswith('.csv') else 'jsonl')
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    stats = {'rows': 0, 'badId': 0, 'noData': 0, 'upToDate': 0, 'stored': 0, 'answers': 0, 'statements': 0}
+    try:
+        out.write(f'-- Backfill des scores ({args.mode}) généré par backfill-scores.py\n')
+        out.write('-- Each statement runs in its own transaction: row locks are held for one batch only.\n')
+        if args.lock_timeout:
+            out.write(f'SET lock_timeout = {sql_string(args.lock_timeout)};\n')
+        rows = ikigai_scoring.read_rows(args.input, fmt)
+        for batch in iter_batches(rows, args.mode, args.batch_size, args.all, stats):
+            stats['statements'] += 1
+            out.write(f'\n-- Lot {stats["statements"]}: {len(batch)} lignes\n')
+            out.write(update_statement(args.table, batch))
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    updated = stats['stored'] + stats['answers']
+    print(f"✅ {updated} of {stats['rows']} analyses in {stats['statements']} statement(s) "
+          f"({stats['stored']} from stored scores, {stats['answers']} from answers, "
+          f"{stats['upToDate']} up to date, {stats['noData']} without score or answers, "
+          f"{stats['badId']} without a valid id)", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
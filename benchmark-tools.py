@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Python asset and patch tooling on synthetic inputs
+
+Generates a synthetic PDF corpus and a synthetic index-supabase.js of
+configurable size in a temporary folder, then times each phase of:
+  - images: render_cover's --profile phases      (extract-pdf-images.py)
+            open, render, resize, encode_png, derivative_resize,
+            derivative_encode, placeholder
+  - text:   open, extract                        (extract-text.py)
+  - patch:  read, anchor index, splice, write    (patch-worker.py)
+Every benchmark runs in a fresh process so its peak RSS is reported on its own.
+Results are saved as JSON and can be compared with a previous run.
+
+Usage:
+    python3 benchmark-tools.py --pdfs 50 --pages 5 --worker-kb 500
+    python3 benchmark-tools.py --compare bench-results/previous.json
+    python3 benchmark-tools.py --only images --budget 60     # time the budget search
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import importlib
+import statistics
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+RESULTS_FOLDER = Path("bench-results")
+BENCHMARKS = ("images", "text", "patch")
+
+
+class PhaseTimer:
+    """Accumulate wall and CPU time per named phase"""
+
+    def __init__(self):
+        self.samples = {}
+
+    @contextmanager
+    def phase(self, name):
+        wall, cpu = time.perf_counter(), time.process_time()
+        yield
+        self.add(name, time.perf_counter() - wall, time.process_time() - cpu)
+
+    def add(self, name, wall, cpu):
+        """Record a sample timed elsewhere (e.g. by a PhaseProfile)"""
+        sample = self.samples.setdefault(name, {"wall": [], "cpu": []})
+        sample["wall"].append(wall)
+        sample["cpu"].append(cpu)
+
+    def summary(self):
+        return {
+            name: {
+                "count": len(s["wall"]),
+                "totalWall": sum(s["wall"]),
+                "meanWall": statistics.mean(s["wall"]),
+                "maxWall": max(s["wall"]),
+                "totalCpu": sum(s["cpu"]),
+            }
+            for name, s in self.samples.items()
+        }
+
+
+def peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # bytes on macOS, KB on Linux
+
+
+# ============================================
+# Synthetic inputs
+# ============================================
+
+def make_pdf_corpus(folder, count, pages):
+    """Write count article PDFs named like the real archive (Article_NN_...)"""
+    fitz = importlib.import_module("extract-text").fitz
+    folder.mkdir(parents=True, exist_ok=True)
+    paragraph = ("L'Ikigai est l'intersection de ce que vous aimez, de ce pour quoi vous êtes doué, "
+                 "de ce dont le monde a besoin et de ce pour quoi vous pouvez être payé. ") * 4
+
+    for n in range(1, count + 1):
+        doc = fitz.open()
+        for p in range(pages):
+            page = doc.new_page()
+            page.draw_rect(fitz.Rect(36, 36, 559, 260), color=(0.55, 0.36, 0.96), fill=(0.55, 0.36, 0.96))
+            page.insert_text((56, 120), f"Article {n}", fontsize=36, color=(1, 1, 1))
+            page.insert_textbox(fitz.Rect(56, 290, 540, 800), f"Page {p + 1}. " + paragraph * 3, fontsize=11)
+        doc.save(str(folder / f"Article_{n:02d}_Synthetique.pdf"))
+        doc.close()
+
+
+def make_worker_source(path, size_kb):
+    """Write a worker of roughly size_kb KB containing every patch anchor"""
+    endpoint = (
+        "\t\t// GET /api/synthetic/{i}\n"
+        "\t\tif (path === '/api/synthetic/{i}' && method === 'GET') {{\n"
+        "\t\t\ttry {{\n"
+        "\t\t\t\tconst supabase = getSupabaseClient(env);\n"
+        "\t\t\t\tconst {{ data, error }} = await supabase.from('table_{i}').select('*');\n"
+        "\t\t\t\tif (error) return errorResponse(error.message, 500);\n"
+        "\t\t\t\treturn jsonResponse(data);\n"
+        "\t\t\t}} catch (error) {{\n"
+        "\t\t\t\treturn errorResponse(error.message, 500);\n"
+        "\t\t\t}}\n"
+        "\t\t}}\n\n"
+    )
+    blocks = []
+    size, i = 0, 0
+    while size < size_kb * 1024:
+        block = endpoint.format(i=i)
+        blocks.append(block)
+        size += len(block)
+        i += 1
+
+    half = len(blocks) // 2
+    source = (
+        "async function generateRecommendations(answers) {\n"
+        "\t\tif (json) {\n"
+        "\t\t\tconsole.log('✅ Recommandations générées par Claude');\n"
+        "\t\t\treturn analysis;\n"
+        "\t\t}\n"
+        "}\n\n"
+        "async function handleRequest(request, env) {\n"
+        + "".join(blocks[:half])
+        + "\t\t// GET /api/dashboard/admin/stats\n"
+        + "".join(blocks[half:])
+        + "}\n\nexport default {\n\tasync fetch(request, env) { return handleRequest(request, env); }\n};\n"
+    )
+    path.write_text(source, encoding="utf-8")
+
+
+# ============================================
+# Benchmarks (each runs in its own process)
+# ============================================
+
+def bench_images(workdir, budget_kb=None):
+    """Time render_cover() through its --profile phase hooks, one render_job() per PDF"""
+    images = importlib.import_module("extract-pdf-images")
+    images.OUTPUT_FOLDER = workdir / "images"  # keep the renders out of blog/assets
+    images.OUTPUT_FOLDER.mkdir(exist_ok=True)
+    budget = {"bytes": int(budget_kb * 1024), "seconds": images.BUDGET_TIME_CAP} if budget_kb else None
+    options = {"profile": True, "budget": budget}
+    timer = PhaseTimer()
+
+    for article_num, pdf_path in enumerate(sorted((workdir / "pdfs").glob("*.pdf")), 1):
+        _, outputs, lines, phases = images.render_job((article_num, pdf_path, f"{pdf_path.stem}.png", options))
+        if outputs is None:
+            raise RuntimeError("\n".join(lines))
+        for name, stats in phases.items():
+            timer.add(name, stats["wall"], stats["cpu"])
+
+    return {"phases": timer.summary(), "peakRssKb": peak_rss_kb()}
+
+
+def bench_text(workdir):
+    extract_text = importlib.import_module("extract-text")
+    timer = PhaseTimer()
+    chars = 0
+
+    for pdf_path in sorted((workdir / "pdfs").glob("*.pdf")):
+        with timer.phase("open"):
+            doc = extract_text.fitz.open(str(pdf_path))
+        with timer.phase("extract"):
+            for _, text in extract_text.iter_page_text(doc, sys.maxsize, sys.maxsize):
+                chars += len(text)
+        doc.close()
+
+    return {"phases": timer.summary(), "peakRssKb": peak_rss_kb(), "chars": chars}
+
+
+def bench_patch(workdir):
+    patcher = importlib.import_module("patch-worker")
+    timer = PhaseTimer()
+    worker = workdir / "index-supabase.js"
+
+    with timer.phase("read"):
+        content = patcher.read_file(worker)
+    with timer.phase("anchor-index"):
+        markers = [m for patch in patcher.PATCHES for m in patcher.patch_markers(patch)]
+        doc = patcher.WorkerDocument(content, markers)
+    payloads = [patcher.load_payload(patch) for patch in patcher.PATCHES]
+    with timer.phase("splice"):
+        for patch, payload in zip(patcher.PATCHES, payloads):
+            fp = patcher.fingerprint(patch, payload)
+            patcher.apply_patch(doc, patch, payload, patcher.fingerprint_line(patch, fp))
+    with timer.phase("write"):
+        patcher.write_file(workdir / "index-supabase.patched.js", doc.text)
+
+    return {"phases": timer.summary(), "peakRssKb": peak_rss_kb(), "bytes": len(content)}
+
+
+def run_benchmark(name, workdir, options=None):
+    """Entry point of the per-benchmark child process"""
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    with open(os.devnull, "w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull  # silence the tools' progress output
+        try:
+            return globals()[f"bench_{name}"](Path(workdir), **(options or {}))
+        finally:
+            sys.stdout = stdout
+
+
+# ============================================
+# Reporting
+# ============================================
+
+def print_results(results, previous=None):
+    for name, result in results.items():
+        print(f"\n📊 {name}  (peak RSS {result.get('peakRssKb') or '?'} KB)")
+        old_phases = (previous or {}).get(name, {}).get("phases", {})
+        for phase, stats in result["phases"].items():
+            line = f"   {phase:<17} {stats['totalWall'] * 1000:9.1f} ms  (mean {stats['meanWall'] * 1000:.2f} ms × {stats['count']})"
+            if phase in old_phases and old_phases[phase]["totalWall"]:
+                change = stats["totalWall"] / old_phases[phase]["totalWall"] - 1
+                marker = "🔺" if change > 0.10 else ("🔻" if change < -0.10 else "  ")
+                line += f"  {marker} {change:+.0%} vs previous"
+            print(line)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the asset and patch tooling")
+    parser.add_argument("--pdfs", type=int, default=30, help="Synthetic PDFs to generate (default: 30)")
+    parser.add_argument("--pages", type=int, default=5, help="Pages per synthetic PDF (default: 5)")
+    parser.add_argument("--worker-kb", type=int, default=75, help="Synthetic worker size in KB (default: 75)")
+    parser.add_argument("--budget", type=float, metavar="KB",
+                        help="Time the images benchmark with extract-pdf-images.py --budget KB")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, help="Run only these benchmarks")
+    parser.add_argument("--output", "-o", type=Path, help="Results file (default: bench-results/<timestamp>.json)")
+    parser.add_argument("--compare", type=Path, help="Previous results file to compare against")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    names = args.only or BENCHMARKS
+
+    print("⏱️  Tooling Benchmark")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory(prefix="ikigai-bench-") as tmp:
+        workdir = Path(tmp)
+        print(f"🔧 Generating {args.pdfs} PDFs × {args.pages} pages and a {args.worker_kb} KB worker...")
+        if {"images", "text"} & set(names):
+            make_pdf_corpus(workdir / "pdfs", args.pdfs, args.pages)
+        make_worker_source(workdir / "index-supabase.js", args.worker_kb)
+
+        results = {}
+        for name in names:
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                options = {"budget_kb": args.budget} if name == "images" else None
+                results[name] = pool.submit(run_benchmark, name, str(workdir), options).result()
+
+    previous = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            previous = json.load(f)["results"]
+    print_results(results, previous)
+
+    output = args.output or RESULTS_FOLDER / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpuCount": os.cpu_count(),
+            "params": {"pdfs": args.pdfs, "pages": args.pages, "workerKb": args.worker_kb, "budgetKb": args.budget},
+            "results": results,
+        }, f, indent=2)
+    print(f"\n💾 Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
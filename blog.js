@@ -11,7 +11,10 @@ const BlogConfig = {
     articlesPerPage: 9,
     currentPage: 1,
     currentCategory: 'all',
-    articles: []
+    articles: [],
+    thumbnails: {},  // articleId -> atlas cell (blog/data/thumbnails.json)
+    thumbnailsLoaded: false,
+    searchIds: null  // articleIds classés par la recherche (null = pas de recherche)
 };
 
 // =============================================
@@ -21,6 +24,7 @@ const BlogConfig = {
 const blogArticles = [
     {
         id: 1,
+        articleId: 1,  // blog/data/articles.json
         title: "Qu'est-ce que l'Ikigai et pourquoi est-il essentiel pour votre carrière ?",
         slug: "quest-ce-que-ikigai",
         excerpt: "Découvrez le concept japonais de l'Ikigai et comment il peut transformer votre vision de la carrière professionnelle et du bonheur au travail.",
@@ -37,6 +41,7 @@ const blogArticles = [
     },
     {
         id: 2,
+        articleId: 3,  // blog/data/articles.json
         title: "5 Signes que vous n'êtes pas aligné avec votre Ikigai",
         slug: "5-signes-desalignement",
         excerpt: "Fatigue chronique, ennui au travail, manque de motivation... Identifiez les signaux d'alerte qui montrent que vous n'êtes pas sur la bonne voie.",
@@ -53,6 +58,7 @@ const blogArticles = [
     },
     {
         id: 3,
+        articleId: 5,  // blog/data/articles.json
         title: "Comment l'IA révolutionne l'orientation professionnelle",
         slug: "ia-orientation-professionnelle",
         excerpt: "L'intelligence artificielle transforme la manière dont nous découvrons nos talents et orientons notre carrière. Découvrez comment.",
@@ -69,6 +75,7 @@ const blogArticles = [
     },
     {
         id: 4,
+        articleId: 2,  // blog/data/articles.json
         title: "Reconversion professionnelle : Par où commencer ?",
         slug: "reconversion-guide",
         excerpt: "Vous envisagez une reconversion ? Ce guide complet vous accompagne étape par étape dans votre transition de carrière.",
@@ -85,6 +92,7 @@ const blogArticles = [
     },
     {
         id: 5,
+        articleId: 6,  // blog/data/articles.json
         title: "Les 4 piliers de l'Ikigai expliqués simplement",
         slug: "4-piliers-ikigai",
         excerpt: "Ce que vous aimez, ce en quoi vous êtes doué, ce pour quoi vous pouvez être payé, ce dont le monde a besoin. Décryptage des 4 dimensions.",
@@ -101,6 +109,7 @@ const blogArticles = [
     },
     {
         id: 6,
+        articleId: 25,  // blog/data/articles.json
         title: "Témoignage : Comment j'ai trouvé ma voie grâce à l'Ikigai",
         slug: "temoignage-marie",
         excerpt: "Marie, 35 ans, raconte comment la découverte de son Ikigai l'a amenée à quitter son emploi en banque pour devenir coach en développement personnel.",
@@ -117,6 +126,7 @@ const blogArticles = [
     },
     {
         id: 7,
+        articleId: 9,  // blog/data/articles.json
         title: "10 exercices pratiques pour découvrir votre passion",
         slug: "10-exercices-passion",
         excerpt: "Des exercices concrets et efficaces pour identifier ce qui vous anime vraiment et transformer votre relation au travail.",
@@ -133,6 +143,7 @@ const blogArticles = [
     },
     {
         id: 8,
+        articleId: 11,  // blog/data/articles.json
         title: "Le rôle du coach dans votre quête d'Ikigai",
         slug: "role-coach-ikigai",
         excerpt: "Pourquoi un coach peut accélérer votre découverte de l'Ikigai et comment choisir le bon accompagnateur pour votre parcours.",
@@ -149,6 +160,7 @@ const blogArticles = [
     },
     {
         id: 9,
+        articleId: 13,  // blog/data/articles.json
         title: "Ikigai et entrepreneuriat : Créer une entreprise alignée",
         slug: "ikigai-entrepreneuriat",
         excerpt: "Comment utiliser votre Ikigai comme boussole pour créer une entreprise qui a du sens et génère de l'impact.",
@@ -172,17 +184,69 @@ const blogArticles = [
 document.addEventListener('DOMContentLoaded', () => {
     console.log('🎯 Blog initialization...');
 
-    // Charger les articles
+    // Charger les articles tout de suite ; les images suivent la carte des vignettes
     BlogConfig.articles = blogArticles;
     renderArticles();
+    loadThumbnails().then(() => renderArticles(BlogConfig.currentCategory));
 
     // Initialiser les filtres
     initCategoryFilters();
+    initSearch();
 
     // Initialiser les animations
     initScrollAnimations();
 });
 
+// =============================================
+// Vignettes (sprite sheet généré par extract-pdf-images.py)
+// =============================================
+
+function loadThumbnails() {
+    return fetch('/blog/data/thumbnails.json')
+        .then(res => res.ok ? res.json() : { thumbnails: {} })
+        .then(atlas => {
+            // L'atlas est indexé par l'id de blog/data/articles.json
+            const ids = new Set(blogArticles.map(article => String(article.articleId)));
+            Object.entries(atlas.thumbnails).forEach(([id, thumb]) => {
+                if (ids.has(id)) {
+                    BlogConfig.thumbnails[id] = { id, ...thumb };
+                }
+            });
+
+            // Feuille de style des vignettes, seulement si une carte l'utilise
+            if (atlas.css && Object.keys(BlogConfig.thumbnails).length) {
+                const link = document.createElement('link');
+                link.rel = 'stylesheet';
+                link.href = atlas.css;
+                document.head.appendChild(link);
+            }
+        })
+        .catch(() => {
+            // Pas d'atlas : chaque carte charge sa propre image
+        })
+        .finally(() => {
+            BlogConfig.thumbnailsLoaded = true;
+        });
+}
+
+function renderArticleImage(article) {
+    const thumb = BlogConfig.thumbnails[article.articleId];
+    if (thumb) {
+        return `<div class="thumb thumb-${thumb.id}" role="img" aria-label="${article.title}"></div>`;
+    }
+    if (!BlogConfig.thumbnailsLoaded) {
+        // Cellule vide en attendant l'atlas, sans lancer le téléchargement de l'image seule
+        return `<div class="thumb" role="img" aria-label="${article.title}"></div>`;
+    }
+
+    return `
+                <img 
+                    src="${article.image}" 
+                    alt="${article.title}"
+                    onerror="this.src='data:image/svg+xml,%3Csvg xmlns=\\'http://www.w3.org/2000/svg\\' width=\\'400\\' height=\\'300\\'%3E%3Crect width=\\'400\\' height=\\'300\\' fill=\\'%2312121a\\'/%3E%3Ctext x=\\'50%25\\' y=\\'50%25\\' dominant-baseline=\\'middle\\' text-anchor=\\'middle\\' font-family=\\'Outfit, sans-serif\\' font-size=\\'16\\' fill=\\'%2394a3b8\\'%3EImage à venir%3C/text%3E%3C/svg%3E'"
+                >`;
+}
+
 // =============================================
 // Rendu des articles
 // =============================================
@@ -197,13 +261,21 @@ function renderArticles(category = 'all') {
         filteredArticles = BlogConfig.articles.filter(article => article.category === category);
     }
 
+    // Résultats de recherche, dans l'ordre de pertinence
+    const searchIds = BlogConfig.searchIds;
+    if (searchIds) {
+        filteredArticles = filteredArticles
+            .filter(article => searchIds.includes(article.articleId))
+            .sort((a, b) => searchIds.indexOf(a.articleId) - searchIds.indexOf(b.articleId));
+    }
+
     // Afficher un message si aucun article
     if (filteredArticles.length === 0) {
         grid.innerHTML = `
             <div style="grid-column: 1 / -1; text-align: center; padding: 4rem 2rem;">
                 <div style="font-size: 4rem; margin-bottom: 1rem;">📭</div>
                 <h3 style="font-family: 'Sora', sans-serif; font-size: 1.5rem; margin-bottom: 0.5rem;">
-                    Aucun article dans cette catégorie
+                    ${searchIds ? 'Aucun article ne correspond à votre recherche' : 'Aucun article dans cette catégorie'}
                 </h3>
                 <p style="color: var(--gray);">
                     Revenez bientôt, de nouveaux articles arrivent !
@@ -216,12 +288,8 @@ function renderArticles(category = 'all') {
     // Générer le HTML des articles
     grid.innerHTML = filteredArticles.map(article => `
         <article class="article-card" onclick="goToArticle('${article.slug}')">
-            <div class="article-image">
-                <img 
-                    src="${article.image}" 
-                    alt="${article.title}"
-                    onerror="this.src='data:image/svg+xml,%3Csvg xmlns=\\'http://www.w3.org/2000/svg\\' width=\\'400\\' height=\\'300\\'%3E%3Crect width=\\'400\\' height=\\'300\\' fill=\\'%2312121a\\'/%3E%3Ctext x=\\'50%25\\' y=\\'50%25\\' dominant-baseline=\\'middle\\' text-anchor=\\'middle\\' font-family=\\'Outfit, sans-serif\\' font-size=\\'16\\' fill=\\'%2394a3b8\\'%3EImage à venir%3C/text%3E%3C/svg%3E'"
-                >
+            <div class="article-image${BlogConfig.thumbnails[article.articleId] ? ' has-thumb' : ''}">
+                ${renderArticleImage(article)}
                 <span class="article-category">${article.categoryLabel}</span>
             </div>
             <div class="article-content">
@@ -281,6 +349,37 @@ function initCategoryFilters() {
     });
 }
 
+// =============================================
+// Recherche (index statique de build-search-index.py)
+// =============================================
+
+function initSearch() {
+    const input = document.getElementById('blogSearch');
+    if (!input || typeof BlogSearch === 'undefined') return;
+
+    let timer = null;
+    let latest = 0;
+    input.addEventListener('input', () => {
+        clearTimeout(timer);
+        timer = setTimeout(() => {
+            const query = input.value.trim();
+            const request = ++latest;
+            if (!query) {
+                BlogConfig.searchIds = null;
+                renderArticles(BlogConfig.currentCategory);
+                return;
+            }
+            BlogSearch.search(query, 30)
+                .then(results => {
+                    if (request !== latest) return;  // une frappe plus récente a pris le relais
+                    BlogConfig.searchIds = results.map(result => result.id);
+                    renderArticles(BlogConfig.currentCategory);
+                })
+                .catch(err => console.error('Erreur de recherche:', err));
+        }, 200);
+    });
+}
+
 // =============================================
 // Navigation vers un article
 // =============================================
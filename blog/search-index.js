@@ -0,0 +1,76 @@
+/**
+ * AI-IKIGAI Blog - Recherche plein texte
+ * Client de l'index statique généré par build-search-index.py
+ *
+ * Usage:
+ *   const results = await BlogSearch.search('reconversion à 40 ans');
+ *   // [{ id, slug, title, hub, status, score }, ...]
+ */
+
+const BlogSearch = (() => {
+    const BASE_URL = '/blog/data/search/';
+
+    let metaPromise = null;
+    const shardPromises = {};
+
+    function loadMeta() {
+        if (!metaPromise) {
+            metaPromise = fetch(`${BASE_URL}meta.json`).then(res => res.json());
+        }
+        return metaPromise;
+    }
+
+    function loadShard(key) {
+        if (!shardPromises[key]) {
+            shardPromises[key] = fetch(`${BASE_URL}shard-${key}.json`).then(res => res.json());
+        }
+        return shardPromises[key];
+    }
+
+    // Same folding / stop words / stemming rules as the Python indexer (from meta.json)
+    function tokenize(text, tokenizer) {
+        const stopWords = tokenizer._stopSet || (tokenizer._stopSet = new Set(tokenizer.stopWords));
+        const folded = text.toLowerCase().normalize('NFKD').replace(/[\u0300-\u036f]/g, '');
+        const tokens = folded.match(/[a-z0-9]+/g) || [];
+
+        return tokens
+            .filter(token => token.length >= tokenizer.minTokenLength && !stopWords.has(token))
+            .map(token => stem(token, tokenizer));
+    }
+
+    function stem(word, tokenizer) {
+        for (const step of tokenizer.stemSteps) {
+            for (const [suffix, replacement] of step) {
+                if (word.endsWith(suffix) && word.length - suffix.length + replacement.length >= tokenizer.minStem) {
+                    word = word.slice(0, word.length - suffix.length) + replacement;
+                    break;
+                }
+            }
+        }
+        return word;
+    }
+
+    async function search(query, limit = 10) {
+        const meta = await loadMeta();
+        const terms = [...new Set(tokenize(query, meta.tokenizer))];
+        const shardKeys = [...new Set(terms.map(term => term[0]))].filter(key => meta.shards.includes(key));
+        const shards = Object.fromEntries(
+            await Promise.all(shardKeys.map(async key => [key, await loadShard(key)]))
+        );
+
+        const scores = new Map();
+        terms.forEach(term => {
+            const postings = (shards[term[0]] || {})[term] || [];
+            postings.forEach(([doc, weight]) => {
+                scores.set(doc, (scores.get(doc) || 0) + weight);
+            });
+        });
+
+        return [...scores.entries()]
+            .sort((a, b) => b[1] - a[1])
+            .slice(0, limit)
+            .map(([doc, score]) => ({ ...meta.docs[doc], score: score / meta.weightScale }));
+    }
+
+    return { search, loadMeta };
+})();
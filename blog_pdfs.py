@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+PDF sources des articles du blog
+
+Folder and naming rules of the article PDFs, shared by extract-pdf-images.py,
+refresh-articles.py and build-search-index.py. Importing this module has no
+side effects: no PyMuPDF, no dependency install.
+"""
+
+import re
+from pathlib import Path
+
+PDF_FOLDER = Path("AI-IKIGAI Article de Blog")
+
+# Article slug mapping
+ARTICLE_SLUGS = {
+    3: "ikigai-equilibre-4-cercles",
+    4: "trouver-ikigai-exercices-pratiques",
+    5: "ikigai-age-jamais-trop-tard",
+    6: "ikigai-entreprise-engagement",
+    7: "chat-gpt-ikigai-ia-orientation",
+    8: "ikigai-okinawa-longevite",
+    9: "test-ikigai-gratuit-guide",
+    10: "ikigai-vs-purpose-flow-difference",
+    11: "erreurs-eviter-ikigai",
+    12: "ikigai-japonais-succes",
+    13: "entrepreneuriat-aligne-ikigai",
+    14: "micro-entreprise-ikigai-guide",
+    15: "business-model-ikigai",
+    16: "monetiser-passion-ikigai",
+    17: "reconversion-40-ans-guide",
+    18: "bilan-competences-reconversion",
+    19: "financer-formation-reconversion",
+    20: "temoignage-reconversion-reussie",
+    21: "linkedin-ikigai-optimisation",
+    22: "cv-ikigai-refonte",
+    23: "networking-ikigai-reseau",
+    24: "personal-branding-ikigai",
+    25: "marie-prof-coach",
+    26: "thomas-banquier-artisan",
+    27: "sophie-comptable-dev",
+    28: "pierre-manager-formateur",
+    29: "ikigai-burnout-prevention",
+    30: "ikigai-action-plan"
+}
+
+
+def extract_article_number(filename):
+    """Extract article number from filename like 'Article_03_Title.pdf'"""
+    # Try pattern: Article_XX_ or Article_X_
+    match = re.search(r'Article[_\s]+(\d+)', filename, re.IGNORECASE)
+    if match:
+        return int(match.group(1))
+
+    # Try pattern: XX_ or X_ at start
+    match = re.search(r'^(\d+)[_\s]', filename)
+    if match:
+        return int(match.group(1))
+
+    return None
@@ -0,0 +1,542 @@
+#!/usr/bin/env python3
+"""
+Build the Cloudflare Pages site into dist/ with minified, fingerprinted assets
+
+- HTML, CSS and JS are minified (comments and indentation removed; inline
+  <script> and <style> blocks included, <pre>/<textarea> left untouched)
+- CSS and JS get a content hash in their name (styles.3f9a1c2e.css) and the
+  src/href references in every HTML page are rewritten to the hashed names;
+  files already named by content (thumbnails-<hash>.css) keep their name, and
+  so do files named from JS, CSS or JSON (fetch, url(), manifests), whose
+  references are not rewritten: those are not marked immutable
+- gzip (and Brotli, when the brotli module is installed) variants are written
+  next to every compressible file
+- _headers is regenerated: HTML stays no-cache, fingerprinted files are
+  served with "immutable", everything else keeps the rules of the source file
+- The build is incremental: dist/.build-manifest.json records the source hash
+  of every output, so only changed files are reprocessed
+
+Usage:
+    python3 build-assets.py                 # incremental build into dist/
+    python3 build-assets.py --force         # rebuild everything
+    python3 build-assets.py --no-minify -o public
+    python3 build-assets.py --prune-css     # also per-page CSS pruning
+"""
+
+import io
+import os
+import re
+import gzip
+import json
+import hashlib
+import argparse
+import importlib
+import posixpath
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+SOURCE_FOLDER = Path(".")
+OUTPUT_FOLDER = Path("dist")
+MANIFEST_NAME = ".build-manifest.json"
+BUILD_VERSION = 1  # bump when the minifiers change to invalidate the cache
+
+HASH_LENGTH = 8
+FINGERPRINTED = {".css", ".js"}
+# Already named by content upstream (extract-pdf-images.py thumbnails-<sha12>.css)
+# and referenced by that name: minified and kept immutable, never renamed
+PREHASHED_RE = re.compile(r"[.-][0-9a-f]{8,}\.(?:css|js)$")
+MINIFIED = {".html", ".css", ".js"}
+COMPRESSIBLE = {".html", ".css", ".js", ".json", ".svg", ".txt", ".xml"}
+MIN_COMPRESS_SIZE = 1024  # bytes; smaller files are not worth a variant
+
+STATIC_EXTENSIONS = {
+    ".html", ".css", ".js", ".json", ".svg", ".png", ".jpg", ".jpeg", ".webp",
+    ".gif", ".ico", ".woff", ".woff2", ".ttf", ".txt", ".xml", ".pdf",
+}
+STATIC_FILES = {"_redirects", "CNAME", ".nojekyll"}
+
+# Folders and files that are not part of the Pages site
+EXCLUDED_DIRS = {
+    ".git", ".github", "node_modules", "__pycache__", "bench-results", "workers",
+    "admin dashboard", "coach dashboard-bon", OUTPUT_FOLDER.name,
+    "AI-IKIGAI Article de Blog",  # source PDFs of the blog articles (extract-*.py inputs)
+    "build",  # load-test.py worker copies, pointed at local mocks
+}
+EXCLUDED_FILES = {
+    "package.json", "package-lock.json", "requests.jsonl",
+    # Worker sources are deployed by wrangler, not served by Pages
+    "index-supabase.js", "index-standalone.js", "COMPLETE_MAPPING.js",
+}
+
+HEADERS_FILE = "_headers"
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+PAGES_MAX_HEADER_RULES = 100
+
+
+# ============================================
+# Minifiers (dependency-free, conservative)
+# ============================================
+
+CSS_TOKEN_RE = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|(/\*.*?\*/)|(\s+)|([^"'/\s]+|/)""", re.S)
+CSS_TIGHT_BEFORE = set("{};,>)")
+CSS_TIGHT_AFTER = set("{};,>(:")
+
+
+def minify_css(css):
+    """Strip comments and collapse whitespace, never touching strings"""
+    out = []
+    pending_space = False
+    for string, comment, space, other in CSS_TOKEN_RE.findall(css):
+        if comment:
+            # /*! ... */ comments are licences, keep them
+            if comment.startswith("/*!"):
+                out.append(comment)
+            continue
+        if space:
+            pending_space = True
+            continue
+        token = string or other
+        if pending_space and out and out[-1][-1] not in CSS_TIGHT_AFTER and token[0] not in CSS_TIGHT_BEFORE:
+            out.append(" ")
+        pending_space = False
+        out.append(token)
+    return "".join(out).replace(";}", "}").strip()
+
+
+JS_REGEX_PRECEDERS = set("(,=:[!&|?{};+-*%<>~^")
+JS_REGEX_KEYWORDS = ("return", "typeof", "case", "do", "else", "in", "of", "void", "yield", "await")
+
+
+def _regex_allowed(out):
+    """Whether a "/" at this point starts a regex literal rather than a division"""
+    text = "".join(out[-12:]).rstrip()
+    if not text:
+        return True
+    if text[-1] in JS_REGEX_PRECEDERS:
+        return True
+    return any(text.endswith(keyword) and not text[:-len(keyword)][-1:].isalnum() for keyword in JS_REGEX_KEYWORDS)
+
+
+def minify_js(js):
+    """Remove comments, indentation and blank lines
+
+    Newlines are kept so automatic semicolon insertion behaves exactly as in
+    the source; strings, template literals and regex literals are copied as is.
+    """
+    out = []
+    i, n = 0, len(js)
+    line_start = True
+    braces = []  # brace depth of each open template literal ${ ... }
+
+    def copy_quoted(i, quote):
+        j = i + 1
+        while j < n and js[j] != quote:
+            if js[j] == "\\":
+                j += 1
+            elif js[j] == "\n" and quote != "`":
+                break
+            elif quote == "`" and js.startswith("${", j):
+                return j + 2, True
+            j += 1
+        return j + 1, False
+
+    while i < n:
+        c = js[i]
+        if c in " \t\r":
+            j = i
+            while j < n and js[j] in " \t\r":
+                j += 1
+            if not line_start and j < n and js[j] != "\n":
+                out.append(" ")
+            i = j
+            continue
+        if c == "\n":
+            if not line_start:
+                out.append("\n")
+                line_start = True
+            i += 1
+            continue
+        if js.startswith("//", i) and not (js.startswith("//#", i) or js.startswith("//@", i)):
+            i = js.find("\n", i)
+            i = n if i < 0 else i
+            continue
+        if js.startswith("/*", i) and not js.startswith("/*!", i):
+            end = js.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+            continue
+
+        line_start = False
+        if c in "'\"`":
+            end, interpolation = copy_quoted(i, c)
+            out.append(js[i:end])
+            if interpolation:
+                braces.append(0)
+            i = end
+        elif c == "}" and braces and braces[-1] == 0:
+            # end of ${ ... }: resume the template literal
+            braces.pop()
+            end, interpolation = copy_quoted(i, "`")
+            out.append(js[i:end])
+            if interpolation:
+                braces.append(0)
+            i = end
+        elif c == "/" and _regex_allowed(out):
+            j, in_class = i + 1, False
+            while j < n and js[j] != "\n":
+                if js[j] == "\\":
+                    j += 1
+                elif js[j] == "[":
+                    in_class = True
+                elif js[j] == "]":
+                    in_class = False
+                elif js[j] == "/" and not in_class:
+                    break
+                j += 1
+            j += 1
+            while j < n and js[j].isalpha():
+                j += 1
+            out.append(js[i:j])
+            i = j
+        else:
+            if braces:
+                if c == "{":
+                    braces[-1] += 1
+                elif c == "}":
+                    braces[-1] -= 1
+            out.append(c)
+            i += 1
+
+    return "".join(out).rstrip() + "\n"
+
+
+HTML_RAW_RE = re.compile(r"""(<(script|style|pre|textarea)\b(?:[^>"']|"[^"]*"|'[^']*')*>)(.*?)(</\2\s*>)""", re.S | re.I)
+HTML_COMMENT_RE = re.compile(r"<!--(?!\[if|<!|>).*?-->", re.S)
+HTML_SPACE_RE = re.compile(r"\s+")
+
+
+def _collapse_space(match):
+    return "\n" if "\n" in match.group(0) else " "
+
+
+def minify_html(html, minify_inline=True):
+    """Drop comments and collapse whitespace outside raw-text elements"""
+    parts = []
+    pos = 0
+    for match in HTML_RAW_RE.finditer(html):
+        text = HTML_COMMENT_RE.sub("", html[pos:match.start()])
+        parts.append(HTML_SPACE_RE.sub(_collapse_space, text))
+        open_tag, tag, body, close_tag = match.groups()
+        tag = tag.lower()
+        if minify_inline and tag == "style":
+            body = minify_css(body)
+        elif minify_inline and tag == "script" and body.strip() and _is_javascript(open_tag):
+            body = "\n" + minify_js(body)
+        parts.append(HTML_SPACE_RE.sub(" ", open_tag) + body + close_tag)
+        pos = match.end()
+    text = HTML_COMMENT_RE.sub("", html[pos:])
+    parts.append(HTML_SPACE_RE.sub(_collapse_space, text))
+    return "".join(parts).strip() + "\n"
+
+
+def _is_javascript(open_tag):
+    match = re.search(r"""type\s*=\s*["']?([^"'\s>]+)""", open_tag, re.I)
+    return not match or match.group(1).lower() in ("text/javascript", "module", "application/javascript")
+
+
+# ============================================
+# Build helpers
+# ============================================
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def hashed_name(rel_path, digest):
+    """styles.css + digest -> styles.<hash>.css"""
+    stem, ext = posixpath.splitext(rel_path)
+    return f"{stem}.{digest[:HASH_LENGTH]}{ext}"
+
+
+def iter_site_files(source):
+    """Relative POSIX paths of every file published by Pages"""
+    for root, dirs, files in os.walk(source):
+        dirs[:] = sorted(d for d in dirs if d not in EXCLUDED_DIRS and not d.startswith("."))
+        for name in sorted(files):
+            if name in EXCLUDED_FILES:
+                continue
+            if name in STATIC_FILES or Path(name).suffix.lower() in STATIC_EXTENSIONS:
+                yield Path(root, name).relative_to(source).as_posix()
+
+
+def load_build_manifest(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"version": BUILD_VERSION, "files": {}}
+    if manifest.get("version") != BUILD_VERSION:
+        return {"version": BUILD_VERSION, "files": {}}
+    return manifest
+
+
+def write_output(output, rel_path, data):
+    """Write data plus its precompressed variants; return the written paths"""
+    target = output / rel_path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(data)
+    written = [rel_path]
+
+    if Path(rel_path).suffix.lower() in COMPRESSIBLE and len(data) >= MIN_COMPRESS_SIZE:
+        buf = io.BytesIO()
+        # mtime=0 keeps the .gz byte-identical between builds
+        with gzip.GzipFile(fileobj=buf, mode="wb", compresslevel=9, mtime=0) as gz:
+            gz.write(data)
+        variants = [(".gz", buf.getvalue())]
+        if brotli is not None:
+            variants.append((".br", brotli.compress(data, quality=11)))
+        for suffix, compressed in variants:
+            if len(compressed) < len(data):
+                Path(f"{target}{suffix}").write_bytes(compressed)
+                written.append(rel_path + suffix)
+    return written
+
+
+REFERENCE_RE = re.compile(r"""(\b(?:src|href)\s*=\s*)(["'])([^"']+)\2""", re.I)
+
+
+def rewrite_references(html, page_path, asset_names):
+    """Point src/href attributes at the fingerprinted asset names"""
+    page_dir = posixpath.dirname(page_path)
+
+    def replace(match):
+        prefix, quote, url = match.groups()
+        if re.match(r"^(?:[a-z][a-z0-9+.-]*:|//|#)", url, re.I):
+            return match.group(0)
+        path, sep, suffix = (re.split(r"([?#])", url, maxsplit=1) + ["", ""])[:3]
+        if path.startswith("/"):
+            target = path.lstrip("/")
+        else:
+            target = posixpath.normpath(posixpath.join(page_dir, path))
+        if target not in asset_names:
+            return match.group(0)
+        new_path = posixpath.join(posixpath.dirname(path), posixpath.basename(asset_names[target]))
+        return f"{prefix}{quote}{new_path}{sep}{suffix}{quote}"
+
+    return REFERENCE_RE.sub(replace, html)
+
+
+ASSET_NAME_RE = re.compile(r"[\w.-]+\.(?:css|js)\b")
+
+
+def pinned_assets(sources, candidates):
+    """CSS/JS files named anywhere rewrite_references() does not reach
+
+    JS strings (fetch, dynamic <script>), CSS url()/@import, JSON manifests
+    and inline code keep the original name, so those files are not
+    fingerprinted (a conservative basename match, comments stripped first).
+    """
+    by_name = {}
+    for rel_path in candidates:
+        by_name.setdefault(posixpath.basename(rel_path), set()).add(rel_path)
+    pinned = set()
+    for rel_path, data in sources.items():
+        ext = Path(rel_path).suffix.lower()
+        if ext not in COMPRESSIBLE:
+            continue
+        text = data.decode("utf-8", "replace")
+        if ext == ".html":
+            text = minify_html(REFERENCE_RE.sub("", text))
+        elif ext in (".css", ".js"):
+            text = minify_css(text) if ext == ".css" else minify_js(text)
+        for name in set(ASSET_NAME_RE.findall(text)):
+            pinned |= by_name.get(name, set()) - {rel_path}
+    return pinned
+
+
+def build_headers(source_headers, fingerprinted_files):
+    """Source _headers without the blanket css/js rules, plus immutable rules per fingerprinted file"""
+    blocks = re.split(r"\n\s*\n", source_headers.strip())
+    kept = [
+        block for block in blocks
+        if not re.match(r"^(?:#.*\n)*/\*\.(?:css|js)\s*(?:\n|$)", block)
+    ]
+    rules = [f"/{path}\n  Cache-Control: {IMMUTABLE_CACHE}" for path in sorted(fingerprinted_files)]
+    header = "# Fingerprinted assets (generated by build-assets.py)"
+    return "\n\n".join(kept + [header + "\n" + "\n\n".join(rules)]) + "\n"
+
+
+# ============================================
+# Build
+# ============================================
+
+def build(source, output, force=False, minify=True, prune_css=False):
+    manifest_path = output / MANIFEST_NAME
+    previous = {} if force else load_build_manifest(manifest_path)["files"]
+    files = {}
+    stats = {"built": 0, "skipped": 0, "bytes_in": 0, "bytes_out": 0}
+
+    def unchanged(rel_path, key):
+        entry = previous.get(rel_path)
+        return entry and entry["key"] == key and all((output / p).exists() for p in entry["outputs"])
+
+    def emit(rel_path, key, produce):
+        """Reuse the previous output if key matches, else write produce() -> (name, bytes)"""
+        if unchanged(rel_path, key):
+            files[rel_path] = previous[rel_path]
+            stats["skipped"] += 1
+            return files[rel_path]["output"]
+        out_name, data = produce()
+        files[rel_path] = {"key": key, "output": out_name, "outputs": write_output(output, out_name, data)}
+        stats["built"] += 1
+        print(f"   ✅ {rel_path} → {out_name}")
+        return out_name
+
+    site_files = list(iter_site_files(source))
+    sources = {rel_path: (source / rel_path).read_bytes() for rel_path in site_files}
+    mode = f"v{BUILD_VERSION}-{'min' if minify else 'raw'}"
+    pruner = importlib.import_module("prune-css") if prune_css else None
+    prune_cache = pruner.PruneCache(output / pruner.CACHE_FILE) if pruner else None
+
+    # 1. CSS / JS: minify, then fingerprint the minified bytes, except files
+    # referenced from places whose references are not rewritten
+    asset_names = {}
+    prehashed = []
+    pinned = pinned_assets(sources, [p for p in site_files if Path(p).suffix.lower() in FINGERPRINTED])
+    for rel_path in site_files:
+        ext = Path(rel_path).suffix.lower()
+        if ext not in FINGERPRINTED:
+            continue
+        named_by_content = bool(PREHASHED_RE.search(rel_path))
+        keep_name = named_by_content or rel_path in pinned
+
+        def produce(rel_path=rel_path, ext=ext, keep_name=keep_name):
+            data = sources[rel_path]
+            if minify:
+                text = data.decode("utf-8")
+                data = (minify_css(text) if ext == ".css" else minify_js(text)).encode("utf-8")
+            return (rel_path if keep_name else hashed_name(rel_path, sha256(data))), data
+
+        out_name = emit(rel_path, f"{mode}:{keep_name}:{sha256(sources[rel_path])}", produce)
+        if named_by_content:
+            prehashed.append(out_name)
+        elif keep_name:
+            print(f"   📌 {rel_path} keeps its name (referenced outside src/href)")
+        else:
+            asset_names[rel_path] = out_name
+
+    def read_source(rel_path):
+        return sources[rel_path].decode("utf-8") if rel_path in sources else None
+
+    def emit_pruned_sheet(page_path, sheet_path, css, sheets):
+        """Write a page's pruned copy of a stylesheet under a fingerprinted name"""
+        data = (minify_css(css) if minify else css).encode("utf-8")
+        name = hashed_name(pruner.pruned_sheet_path(sheet_path, page_path), sha256(data))
+        sheets.append((name, write_output(output, name, data)))
+        return name
+
+    # 2. HTML: prune CSS (entry pages, --prune-css), rewrite references, then
+    # minify. The asset map is part of the cache key so pages are rebuilt
+    # when an asset they may link to changes.
+    assets_key = sha256(json.dumps(asset_names, sort_keys=True).encode("utf-8"))
+    page_mode = mode + ("-prune" if pruner else "")
+    for rel_path in site_files:
+        if Path(rel_path).suffix.lower() != ".html":
+            continue
+        sheets = []
+
+        def produce(rel_path=rel_path, sheets=sheets):
+            html = sources[rel_path].decode("utf-8")
+            if pruner and rel_path in pruner.ENTRY_PAGES:
+                html, _ = pruner.prune_page(
+                    html, rel_path, read_source,
+                    lambda sheet_path, css: emit_pruned_sheet(rel_path, sheet_path, css, sheets),
+                    prune_cache)
+            html = rewrite_references(html, rel_path, asset_names)
+            return rel_path, (minify_html(html) if minify else html).encode("utf-8")
+
+        emit(rel_path, f"{page_mode}:{sha256(sources[rel_path])}:{assets_key}", produce)
+        if sheets:
+            files[rel_path]["outputs"] += [path for _, outputs in sheets for path in outputs]
+            files[rel_path]["sheets"] = [name for name, _ in sheets]
+
+    if prune_cache is not None:
+        prune_cache.save()
+
+    # 3. Everything else is copied as is
+    for rel_path in site_files:
+        ext = Path(rel_path).suffix.lower()
+        if ext in FINGERPRINTED or ext == ".html":
+            continue
+        emit(rel_path, f"{mode}:{sha256(sources[rel_path])}", lambda rel_path=rel_path: (rel_path, sources[rel_path]))
+
+    # 4. _headers
+    headers_path = source / HEADERS_FILE
+    if headers_path.exists():
+        fingerprinted = (list(asset_names.values()) + prehashed
+                         + [name for entry in files.values() for name in entry.get("sheets", [])])
+        headers = build_headers(headers_path.read_text(encoding="utf-8"), fingerprinted)
+        emit(HEADERS_FILE, sha256(headers.encode("utf-8")), lambda: (HEADERS_FILE, headers.encode("utf-8")))
+        if len(re.findall(r"^/", headers, re.M)) > PAGES_MAX_HEADER_RULES:
+            print(f"⚠️  {HEADERS_FILE} has more than {PAGES_MAX_HEADER_RULES} rules, Pages will ignore the rest")
+
+    # 5. Remove outputs that are no longer produced (old fingerprints, deleted pages)
+    current = {p for entry in files.values() for p in entry["outputs"]}
+    removed = 0
+    for entry in previous.values():
+        for stale in entry["outputs"]:
+            if stale not in current and (output / stale).exists():
+                (output / stale).unlink()
+                removed += 1
+
+    # Size report covers the minified types only; images are copied as is
+    for rel_path, entry in files.items():
+        if rel_path in sources and Path(rel_path).suffix.lower() in MINIFIED:
+            stats["bytes_in"] += len(sources[rel_path])
+            stats["bytes_out"] += (output / entry["output"]).stat().st_size
+
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = manifest_path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": BUILD_VERSION, "assets": asset_names, "files": files}, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp, manifest_path)
+
+    stats["removed"] = removed
+    return stats
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build the Pages site with minified, fingerprinted, precompressed assets")
+    parser.add_argument("--output", "-o", type=Path, default=OUTPUT_FOLDER, help=f"Output folder (default: {OUTPUT_FOLDER})")
+    parser.add_argument("--force", action="store_true", help="Ignore the build manifest and rebuild everything")
+    parser.add_argument("--no-minify", action="store_true", help="Fingerprint and compress without minifying")
+    parser.add_argument("--prune-css", action="store_true",
+                        help="Prune unused CSS on the entry pages and inline critical CSS (see prune-css.py)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    print("📦 Static Asset Build")
+    print("=" * 60)
+    if brotli is None:
+        print("ℹ️  brotli module not installed, writing gzip variants only (pip install brotli)")
+
+    stats = build(SOURCE_FOLDER, args.output, force=args.force, minify=not args.no_minify, prune_css=args.prune_css)
+
+    print()
+    print("=" * 60)
+    saved = 1 - stats["bytes_out"] / stats["bytes_in"] if stats["bytes_in"] else 0
+    print(f"✅ Built {stats['built']} file(s), {stats['skipped']} unchanged, {stats['removed']} stale output(s) removed")
+    print(f"📉 HTML/CSS/JS: {stats['bytes_in'] / 1024:.1f} KB → {stats['bytes_out'] / 1024:.1f} KB "
+          f"before compression ({saved:.0%} smaller)")
+    print(f"📁 Output: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Build a static full-text search index for the blog
+
+Indexes the article PDFs ("AI-IKIGAI Article de Blog") and the HTML pages in
+blog/articles/, using French-aware tokenisation (accent folding, stop words,
+light stemming) and precomputed BM25 weights. The index is written as a small
+meta.json plus one shard per leading character, so blog/search-index.js only
+fetches the shards needed by a query. The search boxes of blog/index.html and
+blog.html use that client.
+"""
+
+import re
+import sys
+import json
+import math
+import argparse
+import importlib
+import unicodedata
+from collections import Counter, defaultdict
+from html.parser import HTMLParser
+from pathlib import Path
+
+from blog_pdfs import PDF_FOLDER, extract_article_number
+
+HTML_FOLDER = Path("blog/articles")
+ARTICLES_JSON = Path("blog/data/articles.json")
+OUTPUT_FOLDER = Path("blog/data/search")
+INDEX_VERSION = 1
+
+# BM25 parameters; weights are stored as integers (x WEIGHT_SCALE) to keep shards small
+BM25_K1 = 1.2
+BM25_B = 0.75
+WEIGHT_SCALE = 100
+
+# Field boosts: a title word counts as TITLE_BOOST body words
+TITLE_BOOST = 3
+KEYWORD_BOOST = 2
+
+MIN_TOKEN_LENGTH = 2
+
+STOP_WORDS = sorted({
+    "a", "afin", "ai", "aie", "ainsi", "alors", "au", "aucun", "aussi", "autre", "aux", "avec",
+    "avoir", "bien", "c", "ce", "ceci", "cela", "celle", "celles", "celui", "ces", "cet", "cette",
+    "ceux", "chaque", "chez", "comme", "comment", "d", "dans", "de", "des", "donc", "dont", "du",
+    "elle", "elles", "en", "encore", "entre", "est", "et", "etc", "ete", "etre", "eu", "fait",
+    "faire", "il", "ils", "j", "je", "l", "la", "le", "les", "leur", "leurs", "lui", "m", "ma",
+    "mais", "me", "meme", "mes", "moi", "mon", "n", "ne", "ni", "nos", "notre", "nous", "on",
+    "ont", "ou", "par", "pas", "peu", "peut", "plus", "pour", "pourquoi", "qu", "quand", "que",
+    "quel", "quelle", "quelles", "quels", "qui", "s", "sa", "sans", "se", "ses", "si", "son",
+    "sont", "sous", "sur", "t", "ta", "te", "tes", "toi", "ton", "tous", "tout", "toute",
+    "toutes", "tres", "tu", "un", "une", "vos", "votre", "vous", "y",
+})
+
+# Light French stemmer expressed as data so the browser client applies the very
+# same rules: each step replaces the first matching suffix, provided the
+# remaining stem keeps at least MIN_STEM characters.
+MIN_STEM = 3
+STEM_STEPS = [
+    # plurals
+    [["aux", "al"], ["s", ""], ["x", ""]],
+    # derivational / inflectional suffixes (longest first)
+    [
+        ["issements", ""], ["issement", ""], ["atrices", ""], ["atrice", ""], ["ateurs", ""],
+        ["ateur", ""], ["ations", ""], ["ation", ""], ["ements", ""], ["ement", ""],
+        ["ments", ""], ["ment", ""], ["ances", ""], ["ance", ""], ["ences", ""], ["ence", ""],
+        ["ismes", ""], ["isme", ""], ["istes", ""], ["iste", ""], ["iques", ""], ["ique", ""],
+        ["ables", ""], ["able", ""], ["euses", ""], ["euse", ""], ["eux", ""], ["ites", ""],
+        ["ite", ""], ["ives", ""], ["ive", ""], ["if", ""], ["eurs", ""], ["eur", ""],
+        ["elle", "el"], ["ee", ""], ["er", ""], ["ez", ""], ["e", ""],
+    ],
+]
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def fold(text):
+    """Lowercase and strip accents ("Été" -> "ete")"""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def stem(word):
+    """Apply STEM_STEPS to a folded word"""
+    for step in STEM_STEPS:
+        for suffix, replacement in step:
+            if word.endswith(suffix) and len(word) - len(suffix) + len(replacement) >= MIN_STEM:
+                word = word[: len(word) - len(suffix)] + replacement
+                break
+    return word
+
+
+_STOP_WORDS = frozenset(STOP_WORDS)
+
+
+def tokenize(text):
+    """Yield stemmed index terms from free text"""
+    for token in TOKEN_RE.findall(fold(text)):
+        if len(token) < MIN_TOKEN_LENGTH or token in _STOP_WORDS:
+            continue
+        yield stem(token)
+
+
+class ArticleTextParser(HTMLParser):
+    """Collect visible text from the <article> element (or <body> as fallback)"""
+
+    SKIP_TAGS = {"script", "style", "nav", "header", "footer", "noscript", "svg"}
+
+    def __init__(self):
+        super().__init__()
+        self.body_parts = []
+        self.article_parts = []
+        self.in_body = 0
+        self.in_article = 0
+        self.skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self.skip += 1
+        elif tag == "body":
+            self.in_body += 1
+        elif tag == "article":
+            self.in_article += 1
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self.skip = max(0, self.skip - 1)
+        elif tag == "body":
+            self.in_body = max(0, self.in_body - 1)
+        elif tag == "article":
+            self.in_article = max(0, self.in_article - 1)
+
+    def handle_data(self, data):
+        if self.skip:
+            return
+        if self.in_article:
+            self.article_parts.append(data)
+        elif self.in_body:
+            self.body_parts.append(data)
+
+    def text(self):
+        return " ".join(self.article_parts or self.body_parts)
+
+
+def html_text(path):
+    parser = ArticleTextParser()
+    parser.feed(path.read_text(encoding="utf-8"))
+    return parser.text()
+
+
+def pdf_texts(folder):
+    """Map article number -> full text of its PDF (empty if PyMuPDF is missing)"""
+    if folder is None or not folder.exists():
+        return {}
+    try:
+        extract_text = importlib.import_module("extract-text")
+    except ImportError as e:
+        print(f"⚠️  PDF text skipped ({e})")
+        return {}
+
+    texts = {}
+    for pdf_path in sorted(folder.glob("*.pdf")):
+        article_num = extract_article_number(pdf_path.stem)
+        if article_num is None:
+            continue
+        records = extract_text.iter_records(pdf_path, max_pages=sys.maxsize, max_chars=sys.maxsize)
+        texts[article_num] = " ".join(record["text"] for record in records)
+    return texts
+
+
+def article_terms(article, body):
+    """Term frequencies for one article, with title and keyword boosts"""
+    tf = Counter(tokenize(body))
+    tf.update(tokenize(article.get("excerpt", "")))
+    for term in tokenize(article.get("title", "")):
+        tf[term] += TITLE_BOOST
+    for keyword in article.get("seo", {}).get("keywords", []):
+        for term in tokenize(keyword):
+            tf[term] += KEYWORD_BOOST
+    return tf
+
+
+def bm25_postings(doc_terms):
+    """term -> [[doc index, scaled BM25 weight], ...] sorted by descending weight"""
+    n_docs = len(doc_terms)
+    lengths = [sum(tf.values()) for tf in doc_terms]
+    avg_length = (sum(lengths) / n_docs) if n_docs else 0
+
+    doc_freq = Counter()
+    for tf in doc_terms:
+        doc_freq.update(tf.keys())
+
+    postings = defaultdict(list)
+    for doc, tf in enumerate(doc_terms):
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[doc] / avg_length) if avg_length else BM25_K1
+        for term, freq in tf.items():
+            idf = math.log(1 + (n_docs - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+            weight = idf * freq * (BM25_K1 + 1) / (freq + norm)
+            postings[term].append([doc, max(1, round(weight * WEIGHT_SCALE))])
+
+    for entries in postings.values():
+        entries.sort(key=lambda entry: -entry[1])
+    return postings
+
+
+def shard_key(term):
+    """Shard name for a term: its first character"""
+    return term[0]
+
+
+def write_json(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+
+
+def build_index(articles, html_folder=HTML_FOLDER, pdf_folder=PDF_FOLDER):
+    """Return (docs, postings) for the given articles.json entries"""
+    pdf_by_number = pdf_texts(pdf_folder)
+    docs = []
+    doc_terms = []
+
+    for article in articles:
+        parts = []
+        html_path = html_folder / f"{article['slug']}.html"
+        if html_path.exists():
+            parts.append(html_text(html_path))
+        if article["id"] in pdf_by_number:
+            parts.append(pdf_by_number[article["id"]])
+
+        docs.append({
+            "id": article["id"],
+            "slug": article["slug"],
+            "title": article["title"],
+            "hub": article.get("hub"),
+            "status": article.get("status"),
+        })
+        doc_terms.append(article_terms(article, " ".join(parts)))
+        sources = "HTML+PDF" if len(parts) == 2 else ("HTML" if html_path.exists() else ("PDF" if parts else "metadata"))
+        print(f"   📄 {article['slug']} ({sources}, {len(doc_terms[-1])} terms)")
+
+    return docs, bm25_postings(doc_terms)
+
+
+def write_index(docs, postings, output_folder=OUTPUT_FOLDER):
+    """Write meta.json and one shard-<c>.json per leading character"""
+    output_folder.mkdir(parents=True, exist_ok=True)
+    for stale in output_folder.glob("shard-*.json"):
+        stale.unlink()
+
+    shards = defaultdict(dict)
+    for term, entries in postings.items():
+        shards[shard_key(term)][term] = entries
+
+    sizes = {}
+    for key, terms in sorted(shards.items()):
+        path = output_folder / f"shard-{key}.json"
+        write_json(path, terms)
+        sizes[key] = path.stat().st_size
+
+    write_json(output_folder / "meta.json", {
+        "version": INDEX_VERSION,
+        "docs": docs,
+        "shards": sorted(shards),
+        "weightScale": WEIGHT_SCALE,
+        "tokenizer": {
+            "minTokenLength": MIN_TOKEN_LENGTH,
+            "stopWords": STOP_WORDS,
+            "minStem": MIN_STEM,
+            "stemSteps": STEM_STEPS,
+        },
+    })
+    return sizes
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build the static blog search index")
+    parser.add_argument("--output", "-o", type=Path, default=OUTPUT_FOLDER,
+                        help=f"Output folder (default: {OUTPUT_FOLDER})")
+    parser.add_argument("--no-pdf", action="store_true", help="Index HTML pages and metadata only")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    print("🔎 Blog Search Index Builder")
+    print("=" * 60)
+
+    with open(ARTICLES_JSON, "r", encoding="utf-8") as f:
+        articles = json.load(f)["articles"]
+    print(f"✅ Found {len(articles)} articles in {ARTICLES_JSON}\n")
+
+    pdf_folder = None if args.no_pdf else PDF_FOLDER
+    docs, postings = build_index(articles, HTML_FOLDER, pdf_folder)
+    sizes = write_index(docs, postings, args.output)
+
+    print()
+    print("=" * 60)
+    print(f"✅ Indexed {len(postings)} terms across {len(docs)} articles")
+    print(f"📁 {len(sizes)} shards in {args.output} "
+          f"(largest {max(sizes.values(), default=0) / 1024:.1f} KB, "
+          f"total {sum(sizes.values()) / 1024:.1f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,122 +1,1298 @@
 #!/usr/bin/env python3
 """
 Extract first image from each blog article PDF using PyMuPDF (no poppler needed)
+
+With --watch, keeps running and re-renders only the covers whose PDF changed
+(inotify on Linux, stat() polling elsewhere), printing the imageMap entries
+as soon as they are published.
+
+Every run also packs the blog index thumbnails into sprite sheets
+(blog/data/thumbnails.json + blog/assets/thumbnails-<hash>.css), so the listing
+loads all of its card images in one or two requests. Cells are keyed by the
+articles.json id (blog.js cards carry it as articleId); --check-atlas fails
+when a published article has no cell.
+
+With --dedupe, covers that render the same (e.g. the shared branded first
+page) are found with a perceptual hash and confirmed pixel by pixel: new
+duplicates are not encoded and point at the first cover in the manifests.
+Published files are never deleted.
 """
 
+import io
 import os
 import sys
 import re
+import csv
+import json
+import math
+import base64
+import time
+import ctypes
+import select
+import struct
+import hashlib
+import argparse
+import threading
+import cProfile
+import tracemalloc
+import ctypes.util
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
 try:
     import fitz  # PyMuPDF
-    from PIL import Image
-    import io
+    from PIL import Image, ImageChops, ImageFilter, ImageOps, ImageStat
 except ImportError:
     print("❌ Missing dependencies. Installing...")
     os.system("pip3 install PyMuPDF pillow")
     import fitz
-    from PIL import Image
-    import io
+    from PIL import Image, ImageChops, ImageFilter, ImageOps, ImageStat
+
+from blog_pdfs import PDF_FOLDER, ARTICLE_SLUGS, extract_article_number
 
 # Configuration
-PDF_FOLDER = Path("AI-IKIGAI Article de Blog")
 OUTPUT_FOLDER = Path("blog/assets/images")
 MAX_IMAGE_WIDTH = 1200
 QUALITY = 85
+RENDER_DPI = 150
+RENDERER_VERSION = 3  # bump when the rendering pipeline changes its output
+
+# Responsive derivatives (one render pass, resized per width)
+RESPONSIVE_WIDTHS = (320, 640, 1200)
+RESPONSIVE_FORMAT = "WEBP"
+IMAGE_URL_PREFIX = "/blog/assets/images/"
+COVER_MANIFEST_PATH = Path("blog/data/cover-images.json")
+ARTICLES_JSON = Path("blog/data/articles.json")
+
+# Low-quality placeholder inlined in articles.json (painted before the cover loads)
+PLACEHOLDER_WIDTH = 16
+PLACEHOLDER_QUALITY = 40
+PLACEHOLDER_BLUR = 1
+DOMINANT_COLOR_SAMPLE = 64  # width of the thumbnail the dominant colour is taken from
+DOMINANT_COLOR_BUCKETS = 8
+
+# Byte-budget mode (--budget KB): lossless PNG first, then the largest palette
+# that fits; WebP quality is bisected down to BUDGET_MIN_QUALITY
+BUDGET_TIME_CAP = 3.0  # seconds of encoding search per cover, split evenly between its files
+BUDGET_PNG_SEARCH_LEVEL = 1  # zlib level while bisecting; only the chosen palette is saved at 9
+BUDGET_MIN_COLORS = 8
+BUDGET_MIN_QUALITY = 30
+
+# Blog index thumbnails packed into sprite sheets (cropped like the 2:1 cards)
+THUMBNAIL_SIZE = (640, 320)
+THUMBNAIL_QUALITY = 75
+ATLAS_COLUMNS = 6
+ATLAS_MAX_ROWS = 8  # per sheet; more covers spill into another sheet
+ATLAS_VERSION = 1
+ATLAS_JSON = Path("blog/data/thumbnails.json")
+ATLAS_CSS_FOLDER = Path("blog/assets")  # thumbnails-<hash>.css, named in ATLAS_JSON
+ATLAS_CSS_URL_PREFIX = "/blog/assets/"
+BLOG_LISTING_SCRIPT = Path("blog.js")  # blog.html cards, linked to articles.json by articleId
+BLOG_ARTICLE_ID_RE = re.compile(r"\barticleId:\s*(\d+)")
+# Listing covers that are not rendered from a PDF (as in the imageMap of blog/index.html)
+LISTING_COVERS = {1: "article-1-ikigai.png", 2: "article-2-reconversion.jpg"}
+
+# Duplicate covers (--dedupe): the difference hash of a DEDUPE_HASH_SIZE² grid
+# only preselects candidates within DEDUPE_THRESHOLD bits (covers sharing a
+# template can hash alike); a candidate is merged when the full-size pixels
+# also match to DEDUPE_MIN_PSNR, which a different title line never reaches
+DEDUPE_HASH_SIZE = 16
+DEDUPE_THRESHOLD = 8
+DEDUPE_MIN_PSNR = 45.0  # dB
+
+# Incremental cache: PDF content hash + render parameters per output image
+MANIFEST_PATH = OUTPUT_FOLDER.parent / "images-manifest.json"
+MANIFEST_VERSION = 1
+
+# Watch mode: quiet period before a burst of events is processed, and the
+# stat() interval of the polling fallback (seconds)
+WATCH_DEBOUNCE = 0.25
+WATCH_POLL_INTERVAL = 0.5
+WATCH_ATLAS_DEBOUNCE = 2.0  # the atlas is rebuilt in the background once edits settle
+
+def render_zoom(page_width):
+    """Zoom factor that renders a page at most MAX_IMAGE_WIDTH wide and RENDER_DPI dense"""
+    zoom = RENDER_DPI / 72  # 72 is default DPI
+    if page_width * zoom > MAX_IMAGE_WIDTH:
+        zoom = MAX_IMAGE_WIDTH / page_width
+    return zoom
+
+def pixmap_to_image(pix):
+    """Expose a fitz pixmap as a PIL image sharing its sample buffer (no copy)"""
+    mode = "RGBA" if pix.alpha else "RGB"
+    samples = getattr(pix, "samples_mv", None) or pix.samples
+    return Image.frombuffer(mode, (pix.width, pix.height), samples, "raw", mode, pix.stride, 1)
+
+class PhaseProfile:
+    """Wall time, CPU time and peak memory per phase of one PDF (--profile)
+
+    Memory is reported twice: the Python-level allocation peak during the
+    phase (tracemalloc) and the process RSS high-water mark once it ends.
+    """
+
+    def __init__(self):
+        self.phases = {}
+
+    @contextmanager
+    def phase(self, name):
+        tracemalloc.reset_peak()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            stats = self.phases.setdefault(name, {"wall": 0.0, "cpu": 0.0, "pyPeakKb": 0, "rssPeakKb": None})
+            stats["wall"] += time.perf_counter() - wall
+            stats["cpu"] += time.process_time() - cpu
+            stats["pyPeakKb"] = max(stats["pyPeakKb"], tracemalloc.get_traced_memory()[1] // 1024)
+            stats["rssPeakKb"] = rss_peak_kb()
+
+    def total_wall(self):
+        return sum(stats["wall"] for stats in self.phases.values())
+
+def rss_peak_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # bytes on macOS, KB on Linux
+
+def phase(profile, name):
+    """profile.phase(name), or a no-op when profiling is off"""
+    return profile.phase(name) if profile else nullcontext()
+
+def describe_output(path, img, fmt, encoding=None):
+    """Manifest record for one generated file (encoding: budget search result, if any)"""
+    record = {
+        "file": path.name,
+        "format": fmt,
+        "width": img.width,
+        "height": img.height,
+        "bytes": path.stat().st_size,
+    }
+    if encoding:
+        record["encoding"] = encoding
+    return record
+
+def psnr(reference, candidate):
+    """Peak signal-to-noise ratio in dB between two same-size images (None when identical)"""
+    diff = ImageChops.difference(reference.convert("RGB"), candidate.convert("RGB"))
+    mse = sum(ImageStat.Stat(diff).sum2) / (3 * reference.width * reference.height)
+    return None if mse == 0 else round(10 * math.log10(255 ** 2 / mse), 2)
+
+def largest_fitting(encode, low, high, limit, deadline):
+    """Bisect the largest setting in [low, high] whose encoding is at most limit bytes
 
-# Article slug mapping
-ARTICLE_SLUGS = {
-    3: "ikigai-equilibre-4-cercles",
-    4: "trouver-ikigai-exercices-pratiques",
-    5: "ikigai-age-jamais-trop-tard",
-    6: "ikigai-entreprise-engagement",
-    7: "chat-gpt-ikigai-ia-orientation",
-    8: "ikigai-okinawa-longevite",
-    9: "test-ikigai-gratuit-guide",
-    10: "ikigai-vs-purpose-flow-difference",
-    11: "erreurs-eviter-ikigai",
-    12: "ikigai-japonais-succes",
-    13: "entrepreneuriat-aligne-ikigai",
-    14: "micro-entreprise-ikigai-guide",
-    15: "business-model-ikigai",
-    16: "monetiser-passion-ikigai",
-    17: "reconversion-40-ans-guide",
-    18: "bilan-competences-reconversion",
-    19: "financer-formation-reconversion",
-    20: "temoignage-reconversion-reussie",
-    21: "linkedin-ikigai-optimisation",
-    22: "cv-ikigai-refonte",
-    23: "networking-ikigai-reseau",
-    24: "personal-branding-ikigai",
-    25: "marie-prof-coach",
-    26: "thomas-banquier-artisan",
-    27: "sophie-comptable-dev",
-    28: "pierre-manager-formateur",
-    29: "ikigai-burnout-prevention",
-    30: "ikigai-action-plan"
-}
-
-def extract_article_number(filename):
-    """Extract article number from filename like 'Article_03_Title.pdf'"""
-    # Try pattern: Article_XX_ or Article_X_
-    match = re.search(r'Article[_\s]+(\d+)', filename, re.IGNORECASE)
-    if match:
-        return int(match.group(1))
-    
-    # Try pattern: XX_ or X_ at start
-    match = re.search(r'^(\d+)[_\s]', filename)
-    if match:
-        return int(match.group(1))
+    encode(setting) -> bytes; sizes are assumed to grow with the setting.
+    Returns (setting, data, fits, capped); when nothing fits (or time runs
+    out first) the smallest encoding tried is returned with fits=False.
+    capped tells whether the search stopped at the deadline.
+    """
+    best = smallest = None
+    capped = False
+    while low <= high:
+        setting = (low + high) // 2
+        data = encode(setting)
+        if smallest is None or len(data) < len(smallest[1]):
+            smallest = (setting, data)
+        if len(data) <= limit:
+            best = (setting, data)
+            low = setting + 1
+        else:
+            high = setting - 1
+        if low <= high and time.perf_counter() >= deadline:
+            capped = True
+            break
+    return (*best, True, capped) if best else (*smallest, False, capped)
+
+def encode_png_within_budget(img, budget, seconds):
+    """PNG bytes of img within budget["bytes"] -> (data, encoding record)
+
+    Lossless is kept when it fits; otherwise the palette with the most
+    colours that fits is used (no dithering, which defeats PNG compression).
+    The search encodes at BUDGET_PNG_SEARCH_LEVEL, which is never smaller
+    than level 9, so the final level-9 file fits whenever the search did.
+    """
+    def encode(image, level=BUDGET_PNG_SEARCH_LEVEL):
+        buffer = io.BytesIO()
+        image.save(buffer, "PNG", compress_level=level)
+        return buffer.getvalue()
     
-    return None
+    deadline = time.perf_counter() + seconds
+    if len(encode(img)) <= budget["bytes"]:
+        return encode(img, 9), {"mode": "lossless", "fits": True, "psnr": None}
+    
+    palettes = {}
+    def encode_palette(colors):
+        palettes[colors] = img.quantize(colors=colors, method=Image.Quantize.FASTOCTREE, dither=Image.Dither.NONE)
+        return encode(palettes[colors])
+    
+    colors, _, fits, capped = largest_fitting(encode_palette, BUDGET_MIN_COLORS, 256, budget["bytes"], deadline)
+    return encode(palettes[colors], 9), {"mode": "palette", "colors": colors, "fits": fits, "capped": capped,
+                                         "psnr": psnr(img, palettes[colors])}
+
+def encode_webp_within_budget(img, budget, seconds):
+    """WebP bytes of img within budget["bytes"], bisecting quality below QUALITY"""
+    def encode(quality):
+        buffer = io.BytesIO()
+        img.save(buffer, RESPONSIVE_FORMAT, quality=quality, method=4)
+        return buffer.getvalue()
+    
+    deadline = time.perf_counter() + seconds
+    quality, data, fits, capped = largest_fitting(encode, BUDGET_MIN_QUALITY, QUALITY, budget["bytes"], deadline)
+    return data, {"mode": "lossy", "quality": quality, "fits": fits, "capped": capped,
+                  "psnr": psnr(img, Image.open(io.BytesIO(data)))}
+
+def describe_encoding(encoding):
+    """Short log text for a budget encoding record"""
+    if not encoding:
+        return ""
+    setting = {"palette": f"{encoding.get('colors')} colours", "lossy": f"q{encoding.get('quality')}"}
+    parts = [setting.get(encoding["mode"], encoding["mode"])]
+    if encoding.get("psnr"):
+        parts.append(f"PSNR {encoding['psnr']:.1f} dB")
+    if not encoding["fits"]:
+        parts.append("⚠️ over budget")
+    if encoding.get("capped"):
+        parts.append("⏱️ time cap")
+    return ", " + ", ".join(parts)
+
+def image_placeholder(img):
+    """Blurred tiny WebP data URI and dominant colour of an already-rendered cover"""
+    height = max(1, round(img.height * PLACEHOLDER_WIDTH / img.width))
+    tiny = img.convert("RGB").resize((PLACEHOLDER_WIDTH, height), Image.Resampling.BOX)
+    tiny = tiny.filter(ImageFilter.GaussianBlur(PLACEHOLDER_BLUR))
+    buffer = io.BytesIO()
+    tiny.save(buffer, "WEBP", quality=PLACEHOLDER_QUALITY, method=6)
+    
+    # Most populated colour bucket of a small sample, not the mean (which
+    # turns a white page with a coloured title into grey)
+    sample_height = max(1, round(img.height * DOMINANT_COLOR_SAMPLE / img.width))
+    sample = img.convert("RGB").resize((DOMINANT_COLOR_SAMPLE, sample_height), Image.Resampling.BOX)
+    quantized = sample.quantize(colors=DOMINANT_COLOR_BUCKETS, method=Image.Quantize.MEDIANCUT)
+    _, index = max(quantized.getcolors())
+    r, g, b = quantized.getpalette()[index * 3:index * 3 + 3]
+    
+    return {
+        "placeholder": "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii"),
+        "dominantColor": f"#{r:02x}{g:02x}{b:02x}",
+    }
+
+def derivative_widths(img):
+    """RESPONSIVE_WIDTHS below the render's width, plus the render's own width"""
+    return sorted({w for w in RESPONSIVE_WIDTHS if w < img.width} | {img.width})
 
-def extract_first_page_as_image(pdf_path, output_filename):
-    """Extract first page of PDF as PNG image"""
+def save_derivatives(img, stem, profile=None, budget=None, deadline=None):
+    """Save RESPONSIVE_WIDTHS copies of an already-rendered cover as WebP
+
+    Widths larger than the render are skipped and the render's own width is
+    always included, so the largest derivative is never upscaled. With a
+    budget, each file's quality is bisected to fit budget["bytes"] within
+    an equal share of the time left until deadline (smallest first, so time
+    the small files do not use goes to the large ones).
+    """
+    widths = derivative_widths(img)
+    ext = RESPONSIVE_FORMAT.lower()
+    outputs = []
+    
+    for index, width in enumerate(widths):
+        with phase(profile, "derivative_resize"):
+            if width == img.width:
+                resized = img
+            else:
+                height = max(1, round(img.height * width / img.width))
+                resized = img.resize((width, height), Image.Resampling.LANCZOS)
+        
+        path = OUTPUT_FOLDER / f"{stem}-{width}w.{ext}"
+        encoding = None
+        with phase(profile, "derivative_encode"):
+            if budget:
+                seconds = max(0.0, deadline - time.perf_counter()) / (len(widths) - index)
+                data, encoding = encode_webp_within_budget(resized, budget, seconds)
+                path.write_bytes(data)
+            else:
+                resized.save(path, RESPONSIVE_FORMAT, quality=QUALITY, method=6)
+        outputs.append(describe_output(path, resized, ext, encoding))
+    
+    return outputs
+
+def extract_first_page_as_image(pdf_path, output_filename, log=print, profile=None, budget=None, dedupe=None):
+    """Extract first page of PDF as PNG image plus responsive WebP derivatives
+
+    Returns the list of generated file records, or None on failure. When a
+    PhaseProfile is given, each phase is timed into it.
+    """
     try:
-        print(f"🔄 Processing: {pdf_path.name}")
+        log(f"🔄 Processing: {pdf_path.name}")
         
         # Open PDF
-        doc = fitz.open(str(pdf_path))
+        with phase(profile, "open"):
+            doc = fitz.open(str(pdf_path))
         
-        if len(doc) == 0:
-            print(f"   ⚠️  PDF has no pages")
-            return False
-        
-        # Get first page
-        page = doc[0]
+        outputs = render_cover(doc, output_filename, log, profile, budget, dedupe)
+        doc.close()
+        return outputs
         
-        # Render page to pixmap (image) at 150 DPI
-        zoom = 150 / 72  # 72 is default DPI
+    except Exception as e:
+        log(f"   ❌ Error: {e}")
+        return None
+
+def render_cover(doc, output_filename, log=print, profile=None, budget=None, dedupe=None):
+    """Render the first page of an already-open document into the cover set
+
+    Returns the list of generated file records, or None if the PDF is empty.
+    Exceptions propagate to the caller, which owns the document. budget is
+    {"bytes": max size per file, "seconds": search time cap per cover}.
+    dedupe is {"threshold": bits, "canonical": {file: {"phash", "sha256"}}}:
+    a render that matches one of those published covers is not encoded, and
+    a single record with "duplicateOf" is returned instead.
+    """
+    if len(doc) == 0:
+        log(f"   ⚠️  PDF has no pages")
+        return None
+    
+    # Get first page
+    page = doc[0]
+    
+    # Render straight at the target width (capped at RENDER_DPI) instead of
+    # rendering at full DPI and downscaling afterwards
+    with phase(profile, "render"):
+        zoom = render_zoom(page.rect.width)
         mat = fitz.Matrix(zoom, zoom)
-        pix = page.get_pixmap(matrix=mat)
-        
-        # Convert to PIL Image
-        img_data = pix.tobytes("png")
-        img = Image.open(io.BytesIO(img_data))
+        pix = page.get_pixmap(matrix=mat, alpha=False)
+    
+    with phase(profile, "resize"):
+        # Wrap the pixmap samples as a PIL image without a PNG round trip
+        img = pixmap_to_image(pix)
         
-        # Resize if too large
+        # Rounding in the page transform can overshoot by a pixel
         if img.width > MAX_IMAGE_WIDTH:
             ratio = MAX_IMAGE_WIDTH / img.width
             new_height = int(img.height * ratio)
             img = img.resize((MAX_IMAGE_WIDTH, new_height), Image.Resampling.LANCZOS)
+    
+    phash = None
+    if dedupe:
+        with phase(profile, "phash"):
+            phash = perceptual_hash(img)
+        candidates = {name: known["phash"] for name, known in dedupe["canonical"].items()}
+        match = matching_cover(phash, candidates, dedupe["threshold"],
+                               lambda name: same_pixels(img, OUTPUT_FOLDER / name))
+        if match:
+            canonical, distance = match
+            log(f"   ♻️  Same cover as {canonical} ({distance} bit(s) apart, pixels match), not encoded")
+            return [{
+                "file": output_filename,
+                "phash": phash,
+                "duplicateOf": canonical,
+                "canonicalSha256": dedupe["canonical"][canonical]["sha256"],
+            }]
+    
+    # Save optimized PNG (full-width fallback), or the best PNG within the budget
+    output_path = OUTPUT_FOLDER / output_filename
+    encoding = None
+    # Every file gets its own share of the search time, so a slow PNG search
+    # cannot starve the WebP derivatives
+    deadline = time.perf_counter() + budget["seconds"] if budget else None
+    with phase(profile, "encode_png"):
+        if budget:
+            seconds = budget["seconds"] / (1 + len(derivative_widths(img)))
+            data, encoding = encode_png_within_budget(img, budget, seconds)
+            output_path.write_bytes(data)
+        else:
+            img.save(output_path, "PNG", optimize=True)
+    
+    file_size_kb = output_path.stat().st_size / 1024
+    log(f"   ✅ Saved: {output_filename} ({file_size_kb:.1f} KB{describe_encoding(encoding)})")
+    
+    # Derive every responsive size from the same render
+    derivatives = save_derivatives(img, output_path.stem, profile, budget, deadline)
+    summary = ", ".join(f"{d['width']}w {d['bytes'] / 1024:.1f} KB{describe_encoding(d.get('encoding'))}"
+                        for d in derivatives)
+    log(f"   ✅ {RESPONSIVE_FORMAT}: {summary}")
+    if budget and any((record or {}).get("capped") for record in [encoding] + [d.get("encoding") for d in derivatives]):
+        log(f"   ⏱️  Budget search stopped at a file's share of the {budget['seconds']:g} s time cap")
+    
+    fallback = describe_output(output_path, img, "png", encoding)
+    if phash:
+        fallback["phash"] = phash
+    with phase(profile, "placeholder"):
+        fallback.update(image_placeholder(img))
+    log(f"   ✅ Placeholder: {len(fallback['placeholder'])} chars, {fallback['dominantColor']}")
+    
+    return [fallback] + derivatives
+
+def render_params(budget=None):
+    """Settings that affect the rendered output; any change invalidates the cache"""
+    params = {
+        "renderer": RENDERER_VERSION,
+        "dpi": RENDER_DPI,
+        "maxWidth": MAX_IMAGE_WIDTH,
+        "quality": QUALITY,
+        "widths": list(RESPONSIVE_WIDTHS),
+        "format": RESPONSIVE_FORMAT,
+        "placeholder": [PLACEHOLDER_WIDTH, PLACEHOLDER_QUALITY, PLACEHOLDER_BLUR],
+    }
+    if budget:
+        params["budget"] = {**budget, "pngSearchLevel": BUDGET_PNG_SEARCH_LEVEL}
+    return params
+
+def perceptual_hash(img, size=DEDUPE_HASH_SIZE):
+    """Difference hash (hex): one bit per horizontally adjacent pair of a size x size grayscale grid"""
+    gray = img.convert("L").resize((size + 1, size), Image.Resampling.LANCZOS)
+    pixels = gray.tobytes()
+    bits = 0
+    for row in range(size):
+        for col in range(size):
+            offset = row * (size + 1) + col
+            bits = bits << 1 | (pixels[offset] > pixels[offset + 1])
+    return f"{bits:0{size * size // 4}x}"
+
+def hash_distance(a, b):
+    """Number of differing bits between two hex hashes"""
+    return bin(int(a, 16) ^ int(b, 16)).count("1")
+
+def matching_cover(phash, candidates, threshold, confirm):
+    """(file, distance) of the closest candidate within threshold bits that confirm(file) accepts, or None"""
+    matches = sorted((hash_distance(phash, other), name) for name, other in candidates.items())
+    for distance, name in matches:
+        if distance > threshold:
+            break
+        if confirm(name):
+            return name, distance
+    return None
+
+def same_pixels(img, path):
+    """True when the published cover at path has img's size and matches it to DEDUPE_MIN_PSNR"""
+    if not path.exists():
+        return False
+    with Image.open(path) as other:
+        if other.size != img.size:
+            return False
+        score = psnr(img, other)
+    return score is None or score >= DEDUPE_MIN_PSNR
+
+def file_sha256(path, chunk_size=1 << 20):
+    """Stream a file through SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_manifest(path=MANIFEST_PATH):
+    """Load the render manifest, returning an empty one if missing or outdated"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {"version": MANIFEST_VERSION, "images": {}}
+    
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {"version": MANIFEST_VERSION, "images": {}}
+    manifest.setdefault("images", {})
+    return manifest
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    """Write the manifest atomically so an interrupted run never corrupts it"""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+def source_fingerprint(pdf_path, previous=None):
+    """Return (size, mtime_ns, sha256) for a PDF
+
+    The hash is reused from the previous manifest entry when size and mtime are
+    unchanged, so an up-to-date archive is checked without reading any PDF.
+    """
+    stat = pdf_path.stat()
+    if previous and previous.get("size") == stat.st_size and previous.get("mtimeNs") == stat.st_mtime_ns:
+        return stat.st_size, stat.st_mtime_ns, previous["sha256"]
+    return stat.st_size, stat.st_mtime_ns, file_sha256(pdf_path)
+
+def is_up_to_date(entry, sha256, params, output_filename):
+    """True when the stored entry matches the source hash, params and output files"""
+    return (
+        entry is not None
+        and entry.get("sha256") == sha256
+        and entry.get("params") == params
+        and (OUTPUT_FOLDER / entry.get("duplicateOf", output_filename)).exists()
+        and all((OUTPUT_FOLDER / out["file"]).exists() for out in entry.get("outputs", []))
+    )
+
+def manifest_entry(article_num, pdf_file, fingerprint, params, outputs):
+    """Render-cache record for one successfully rendered PDF"""
+    size, mtime_ns, sha256 = fingerprint
+    entry = {
+        "article": article_num,
+        "pdf": pdf_file.name,
+        "sha256": sha256,
+        "size": size,
+        "mtimeNs": mtime_ns,
+        "params": params,
+        "phash": outputs[0].get("phash"),
+        "outputs": outputs,
+    }
+    if outputs[0].get("duplicateOf"):
+        entry["duplicateOf"] = outputs[0]["duplicateOf"]
+        entry["canonicalSha256"] = outputs[0]["canonicalSha256"]
+    return entry
+
+def dedupe_candidates(images, article_num):
+    """{file: {"phash", "sha256"}} of the canonical covers a render of article_num may reuse
+
+    Only lower article numbers qualify, so the first article of a cluster is
+    always the canonical one.
+    """
+    return {
+        name: {"phash": entry["phash"], "sha256": entry["sha256"]} for name, entry in images.items()
+        if entry.get("phash") and not entry.get("duplicateOf") and entry.get("outputs")
+        and (entry.get("article") or 0) < article_num
+    }
+
+def job_options(options, images, article_num, rendering=()):
+    """Per-job render options: adds the canonical covers when dedupe is on
+
+    Covers in rendering are re-rendered by the same batch, possibly by
+    another worker while this job compares pixels: they are not offered
+    here and dedupe_covers() matches against them once the batch is written.
+    """
+    if options.get("dedupe") is None:
+        return options
+    candidates = dedupe_candidates(images, article_num)
+    return {**options, "canonical": {name: known for name, known in candidates.items() if name not in rendering}}
+
+def with_job_options(jobs, options, images):
+    """(article_num, pdf, output) triples -> render jobs, with the batch's own covers excluded from dedupe"""
+    rendering = {output_filename for _, _, output_filename in jobs}
+    return [(article_num, pdf_file, output_filename, job_options(options, images, article_num, rendering))
+            for article_num, pdf_file, output_filename in jobs]
+
+def dedupe_covers(images, threshold):
+    """Cluster duplicate covers; every duplicate points at its cluster's canonical file
+
+    Walks the covers by article number: a cover within threshold bits of an
+    earlier canonical whose pixels match becomes a duplicate (its outputs
+    are the canonical's; its own files, if any, stay on disk), otherwise it
+    is a canonical itself. A duplicate stays one while its canonical is
+    unchanged (same source sha256) and still within threshold.
+    Returns (clusters {canonical: [duplicates]}, released) where released are
+    former duplicates that no longer match and need their own render.
+    """
+    canonical = {}
+    clusters = {}
+    released = []
+    
+    for name, entry in sorted(images.items(), key=lambda item: (item[1].get("article") or 0, item[0])):
+        if not entry.get("outputs"):
+            continue
+        if not entry.get("phash") and not entry.get("duplicateOf") and (OUTPUT_FOLDER / name).exists():
+            # Rendered without --dedupe (no hash recorded): hash the published file once
+            with Image.open(OUTPUT_FOLDER / name) as img:
+                entry["phash"] = perceptual_hash(img)
+        if not entry.get("phash"):
+            continue
         
-        # Save optimized PNG
-        output_path = OUTPUT_FOLDER / output_filename
-        img.save(output_path, "PNG", optimize=True)
+        target = entry.get("duplicateOf")
+        if target:
+            if (target in canonical and images[target].get("sha256") == entry.get("canonicalSha256")
+                    and hash_distance(entry["phash"], canonical[target]) <= threshold):
+                entry["outputs"] = images[target]["outputs"]
+                clusters.setdefault(target, []).append(name)
+            else:
+                released.append(name)
+            continue
+        if not (OUTPUT_FOLDER / name).exists():
+            continue
         
-        file_size_kb = output_path.stat().st_size / 1024
-        print(f"   ✅ Saved: {output_filename} ({file_size_kb:.1f} KB)")
+        with Image.open(OUTPUT_FOLDER / name) as img:
+            match = matching_cover(entry["phash"], canonical, threshold,
+                                   lambda other: same_pixels(img, OUTPUT_FOLDER / other))
+        if match:
+            target = match[0]
+            entry["duplicateOf"] = target
+            entry["canonicalSha256"] = images[target]["sha256"]
+            entry["outputs"] = images[target]["outputs"]
+            clusters.setdefault(target, []).append(name)
+        else:
+            canonical[name] = entry["phash"]
+    
+    return clusters, released
+
+def resolve_duplicates(images, options, params):
+    """Run dedupe_covers, re-rendering released covers in-process until stable
+
+    A released cover is rendered against the current canonicals, so it may
+    join another cluster instead of keeping its own files. Returns the
+    clusters. When dedupe is off, every duplicate left by an earlier
+    --dedupe run is released so it gets its own files back.
+    """
+    if options.get("dedupe") is None:
+        clusters = {}
+        released = sorted(name for name, entry in images.items() if entry.get("duplicateOf"))
+    else:
+        clusters, released = dedupe_covers(images, options["dedupe"])
+    while released:
+        for name in released:
+            entry = images.pop(name)
+            pdf_file = PDF_FOLDER / entry["pdf"]
+            print(f"♻️  {name} no longer shares {entry['duplicateOf']}, rendering it")
+            job = (entry["article"], pdf_file, name, job_options(options, images, entry["article"]))
+            _, outputs, lines, _ = render_job(job)
+            for line in lines:
+                print(line)
+            if outputs:
+                images[name] = manifest_entry(
+                    entry["article"], pdf_file, (entry["size"], entry["mtimeNs"], entry["sha256"]), params, outputs)
+        if options.get("dedupe") is None:
+            break
+        clusters, released = dedupe_covers(images, options["dedupe"])
+    return clusters
+
+def published_file(images, article_num):
+    """Cover file to reference for an article: its own, or its cluster's canonical file"""
+    output_filename = f"article-{article_num}.png"
+    return images.get(output_filename, {}).get("duplicateOf", output_filename)
+
+def describe_clusters(clusters):
+    """Log lines for the duplicate clusters"""
+    return [f"   {canonical} ← {', '.join(duplicates)}" for canonical, duplicates in sorted(clusters.items())]
+
+def build_cover_manifest(images):
+    """Public srcset manifest for the blog templates, keyed by article slug"""
+    covers = {}
+    
+    for name, entry in sorted(images.items()):
+        article_num = entry.get("article")
+        outputs = entry.get("outputs", [])
+        if article_num not in ARTICLE_SLUGS or not outputs:
+            continue
         
-        doc.close()
-        return True
+        fallback = next(out for out in outputs if out["file"] == entry.get("duplicateOf", name))
+        sources = {}
+        for out in outputs:
+            if out is not fallback:
+                sources.setdefault(out["format"], []).append(out)
         
+        covers[ARTICLE_SLUGS[article_num]] = {
+            "id": article_num,
+            "width": fallback["width"],
+            "height": fallback["height"],
+            "placeholder": fallback.get("placeholder"),
+            "dominantColor": fallback.get("dominantColor"),
+            "fallback": IMAGE_URL_PREFIX + fallback["file"],
+            "sources": [
+                {
+                    "type": f"image/{fmt}",
+                    "srcset": ", ".join(f"{IMAGE_URL_PREFIX}{out['file']} {out['width']}w" for out in outs),
+                }
+                for fmt, outs in sources.items()
+            ],
+            "files": outputs,
+        }
+    
+    return {"images": covers}
+
+def cover_image_fields(outputs):
+    """articles.json image fields taken from a cover's fallback record"""
+    fallback = outputs[0]
+    fields = {
+        "url": IMAGE_URL_PREFIX + fallback["file"],
+        "width": fallback["width"],
+        "height": fallback["height"],
+    }
+    for key in ("placeholder", "dominantColor"):
+        if fallback.get(key):
+            fields[key] = fallback[key]
+    return fields
+
+def apply_cover_fields(article, outputs):
+    """Copy url, size, placeholder and dominant colour into an article's image object
+
+    Returns the names of the fields that changed.
+    """
+    image = article.setdefault("image", {"alt": article.get("title", "")})
+    changed = []
+    for key, value in cover_image_fields(outputs).items():
+        if image.get(key) != value:
+            image[key] = value
+            changed.append(key)
+    return changed
+
+def update_articles_json(images, path=ARTICLES_JSON):
+    """Write every rendered cover's image fields into articles.json (by article id)
+
+    Returns the number of articles changed; the file is only rewritten when
+    something changed.
+    """
+    if not path.exists():
+        return 0
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    
+    covers = {entry["article"]: entry["outputs"] for name, entry in images.items()
+              if entry.get("outputs") and entry["outputs"][0]["file"] == entry.get("duplicateOf", name)}
+    changed = 0
+    for article in data.get("articles", []):
+        if article.get("id") in covers and apply_cover_fields(article, covers[article["id"]]):
+            changed += 1
+    
+    if changed:
+        write_articles_json(data, path)
+    return changed
+
+def write_articles_json(data, path=ARTICLES_JSON):
+    """Write articles.json atomically, in its hand-edited layout (indent 4, UTF-8)"""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+    os.replace(tmp_path, path)
+
+def listing_covers(path=ARTICLES_JSON):
+    """(article id, slug, cover path) for every article of the blog index that has a cover"""
+    if not path.exists():
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    
+    rendered = load_manifest()["images"]
+    covers = []
+    for article in data.get("articles", []):
+        article_id = article.get("id")
+        name = LISTING_COVERS.get(article_id, f"article-{article_id}.png")
+        cover = OUTPUT_FOLDER / rendered.get(name, {}).get("duplicateOf", name)
+        if cover.exists():
+            covers.append((article_id, article.get("slug"), cover))
+    return covers
+
+def atlas_key(covers):
+    """Fingerprint of the atlas inputs (cover files and layout settings)"""
+    digest = hashlib.sha256(json.dumps(
+        [ATLAS_VERSION, THUMBNAIL_SIZE, THUMBNAIL_QUALITY, ATLAS_COLUMNS, ATLAS_MAX_ROWS]).encode())
+    for article_id, slug, cover in covers:
+        stat = cover.stat()
+        digest.update(f"{article_id}:{slug}:{cover.name}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+def listing_thumbnail(cover):
+    """Cover cropped to THUMBNAIL_SIZE around its centre, like background-size: cover"""
+    with Image.open(cover) as img:
+        img = img.convert("RGBA")
+    flattened = Image.alpha_composite(Image.new("RGBA", img.size, "white"), img).convert("RGB")
+    return ImageOps.fit(flattened, THUMBNAIL_SIZE, Image.LANCZOS)
+
+def background_percent(index, count):
+    """background-position of cell index in a row/column of count equal cells"""
+    return "0%" if count == 1 else f"{index * 100 / (count - 1):g}%"
+
+def atlas_css(atlas):
+    """One class per article: .thumb-<id> paints its cell of the sprite sheet
+
+    Sizes and positions are percentages, so a cell fills any element with the
+    thumbnail's aspect ratio.
+    """
+    width, height = atlas["thumbWidth"], atlas["thumbHeight"]
+    lines = [
+        "/* Generated by extract-pdf-images.py from blog/data/thumbnails.json - do not edit */",
+        f".thumb {{ background-repeat: no-repeat; aspect-ratio: {width} / {height}; }}",
+    ]
+    for article_id, thumb in sorted(atlas["thumbnails"].items(), key=lambda item: int(item[0])):
+        sheet = atlas["sheets"][thumb["sheet"]]
+        lines.append(
+            f".thumb-{article_id} {{ background-image: url('{sheet['url']}'); "
+            f"background-size: {thumb['backgroundSize']}; background-position: {thumb['backgroundPosition']}; }}"
+        )
+    return "\n".join(lines) + "\n"
+
+def build_thumbnail_atlas(covers=None, force=False):
+    """Pack the blog index thumbnails into sprite sheets, with the JSON map and CSS
+
+    Sheets and CSS are named by content hash (safe to cache forever; the JSON
+    names the current CSS) and replaced ones are deleted once the new JSON is
+    written. Returns the atlas, or None when the inputs are unchanged.
+    """
+    covers = listing_covers() if covers is None else covers
+    key = atlas_key(covers)
+    try:
+        with open(ATLAS_JSON, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        previous = {}
+    if (not force and previous.get("key") == key and previous.get("css")
+            and (ATLAS_CSS_FOLDER / Path(previous["css"]).name).exists()
+            and all((OUTPUT_FOLDER / Path(sheet["url"]).name).exists() for sheet in previous.get("sheets", []))):
+        return None
+    
+    width, height = THUMBNAIL_SIZE
+    per_sheet = ATLAS_COLUMNS * ATLAS_MAX_ROWS
+    ext = RESPONSIVE_FORMAT.lower()
+    sheets = []
+    thumbnails = {}
+    
+    # Articles sharing a cover file (deduplicated covers) share one cell
+    cells = {}
+    for article_id, slug, cover in covers:
+        cells.setdefault(cover, []).append((article_id, slug))
+    cells = list(cells.items())
+    
+    for start in range(0, len(cells), per_sheet):
+        chunk = cells[start:start + per_sheet]
+        columns = min(ATLAS_COLUMNS, len(chunk))
+        rows = math.ceil(len(chunk) / columns)
+        sheet = Image.new("RGB", (columns * width, rows * height), "white")
+        
+        for index, (cover, articles) in enumerate(chunk):
+            column, row = index % columns, index // columns
+            sheet.paste(listing_thumbnail(cover), (column * width, row * height))
+            for article_id, slug in articles:
+                thumbnails[str(article_id)] = {
+                    "slug": slug,
+                    "source": cover.name,
+                    "sheet": len(sheets),
+                    "x": column * width,
+                    "y": row * height,
+                    "width": width,
+                    "height": height,
+                    "backgroundSize": f"{columns * 100}% {rows * 100}%",
+                    "backgroundPosition": f"{background_percent(column, columns)} {background_percent(row, rows)}",
+                }
+        
+        buffer = io.BytesIO()
+        sheet.save(buffer, RESPONSIVE_FORMAT, quality=THUMBNAIL_QUALITY, method=6)
+        data = buffer.getvalue()
+        name = f"thumbnails-{hashlib.sha256(data).hexdigest()[:12]}.{ext}"
+        (OUTPUT_FOLDER / name).write_bytes(data)
+        sheets.append({
+            "url": IMAGE_URL_PREFIX + name,
+            "width": sheet.width,
+            "height": sheet.height,
+            "bytes": len(data),
+        })
+    
+    atlas = {
+        "version": ATLAS_VERSION,
+        "key": key,
+        "thumbWidth": width,
+        "thumbHeight": height,
+        "sheets": sheets,
+        "thumbnails": thumbnails,
+    }
+    css = atlas_css(atlas).encode("utf-8")
+    css_name = f"thumbnails-{hashlib.sha256(css).hexdigest()[:12]}.css"
+    ATLAS_CSS_FOLDER.mkdir(parents=True, exist_ok=True)
+    (ATLAS_CSS_FOLDER / css_name).write_bytes(css)
+    atlas["css"] = ATLAS_CSS_URL_PREFIX + css_name
+    ATLAS_JSON.parent.mkdir(parents=True, exist_ok=True)
+    save_manifest(atlas, ATLAS_JSON)
+    
+    # Only now that the JSON names the new files
+    current = {Path(sheet["url"]).name for sheet in sheets}
+    for stale in OUTPUT_FOLDER.glob(f"thumbnails-*.{ext}"):
+        if stale.name not in current:
+            stale.unlink()
+    for stale in ATLAS_CSS_FOLDER.glob("thumbnails-*.css"):
+        if stale.name != css_name:
+            stale.unlink()
+    return atlas
+
+def published_article_ids(path=ARTICLES_JSON, script=BLOG_LISTING_SCRIPT):
+    """Ids of the articles listed on a blog index: articles.json and the blog.js cards"""
+    ids = set()
+    if path.exists():
+        with open(path, "r", encoding="utf-8") as f:
+            ids.update(article["id"] for article in json.load(f).get("articles", []))
+    if script.exists():
+        ids.update(int(article_id) for article_id in BLOG_ARTICLE_ID_RE.findall(script.read_text(encoding="utf-8")))
+    return ids
+
+def missing_thumbnails(atlas=None):
+    """Published article ids without an atlas cell (their card falls back to its own image)"""
+    if atlas is None:
+        try:
+            with open(ATLAS_JSON, "r", encoding="utf-8") as f:
+                atlas = json.load(f)
+        except (OSError, ValueError):
+            atlas = {}
+    thumbnails = atlas.get("thumbnails", {})
+    return sorted(article_id for article_id in published_article_ids() if str(article_id) not in thumbnails)
+
+def check_atlas():
+    """--check-atlas: fail when a published article has no thumbnail in the atlas"""
+    missing = missing_thumbnails()
+    if missing:
+        print(f"❌ {len(missing)} published article(s) without an atlas thumbnail in {ATLAS_JSON}: "
+              f"{', '.join(map(str, missing))}")
+        sys.exit(1)
+    print(f"✅ Every published article has an atlas thumbnail ({ATLAS_JSON})")
+
+def describe_atlas(atlas):
+    """One-line summary of a freshly built atlas"""
+    if atlas is None:
+        return "unchanged"
+    total_kb = sum(sheet["bytes"] for sheet in atlas["sheets"]) / 1024
+    return f"{len(atlas['thumbnails'])} thumbnail(s) in {len(atlas['sheets'])} sheet(s), {total_kb:.1f} KB"
+
+def render_job(job):
+    """Worker entry point: render one PDF and return (article_num, outputs, log lines, profile)
+
+    Runs in a separate process when --jobs > 1, so each worker opens its own
+    fitz document and the log is buffered to keep per-file output together.
+    """
+    article_num, pdf_path, output_filename, options = job
+    lines = []
+    profile = None
+    
+    if options.get("profile"):
+        profile = PhaseProfile()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+    
+    dedupe = None
+    if options.get("dedupe") is not None:
+        dedupe = {"threshold": options["dedupe"], "canonical": options.get("canonical", {})}
+    outputs = extract_first_page_as_image(pdf_path, output_filename, log=lines.append, profile=profile,
+                                          budget=options.get("budget"), dedupe=dedupe)
+    return article_num, outputs, lines, profile.phases if profile else None
+
+def run_jobs(jobs, workers):
+    """Yield render_job results in input order, in-process or via a process pool"""
+    if workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            yield render_job(job)
+        return
+    
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        yield from pool.map(render_job, jobs)
+
+class InotifyWatcher:
+    """PDF folder events through Linux inotify (ctypes, no extra dependency)"""
+    
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_DELETE = 0x200
+    EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, name length
+    
+    def __init__(self, folder):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = self.IN_CLOSE_WRITE | self.IN_MOVED_FROM | self.IN_MOVED_TO | self.IN_DELETE
+        if libc.inotify_add_watch(self.fd, os.fsencode(folder), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed on {folder}")
+        self.folder = Path(folder)
+    
+    def wait(self, timeout=None):
+        """Names of the PDFs touched within timeout seconds (None = block until one is)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not select.select([self.fd], [], [], remaining)[0]:
+                return set()
+            changed = set()
+            data = os.read(self.fd, 64 * 1024)
+            offset = 0
+            while offset < len(data):
+                _, _, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+                offset += self.EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                if name.lower().endswith(".pdf"):
+                    changed.add(name)
+            if changed:
+                return changed
+    
+    def close(self):
+        os.close(self.fd)
+
+class PollingWatcher:
+    """Fallback for platforms without inotify: compare stat() snapshots"""
+    
+    def __init__(self, folder, interval=WATCH_POLL_INTERVAL):
+        self.folder = Path(folder)
+        self.interval = interval
+        self.snapshot = self.scan()
+    
+    def scan(self):
+        snapshot = {}
+        for path in self.folder.glob("*.pdf"):
+            try:
+                stat = path.stat()
+            except OSError:  # removed between glob and stat
+                continue
+            snapshot[path.name] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+    
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            pause = self.interval if deadline is None else min(self.interval, max(0.0, deadline - time.monotonic()))
+            time.sleep(pause)
+            snapshot = self.scan()
+            changed = {name for name in snapshot.keys() | self.snapshot.keys()
+                       if snapshot.get(name) != self.snapshot.get(name)}
+            self.snapshot = snapshot
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+    
+    def close(self):
+        pass
+
+def make_watcher(folder, poll=False, interval=WATCH_POLL_INTERVAL):
+    """inotify when available, stat() polling otherwise"""
+    if not poll and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(folder)
+        except (OSError, AttributeError) as e:
+            print(f"⚠️  inotify unavailable ({e}), falling back to polling")
+    return PollingWatcher(folder, interval)
+
+def warm_up(_):
+    """Pool warm-up task: fitz and PIL are imported with the module, so a worker is ready once it answers"""
+    return os.getpid()
+
+def refresh_changed(pdf_names, manifest, pool, options):
+    """Re-render the covers of the given PDF names; returns the updated article numbers
+
+    Unknown, unchanged and removed PDFs are skipped. Both manifests are
+    rewritten once per batch, articles.json when a cover changed. The
+    thumbnail atlas is left to the caller (watch rebuilds it in the background).
+    """
+    params = render_params(options.get("budget"))
+    images = manifest["images"]
+    jobs = []
+    fingerprints = {}
+    
+    for name in sorted(pdf_names):
+        pdf_file = PDF_FOLDER / name
+        article_num = extract_article_number(pdf_file.stem)
+        if not article_num or article_num not in ARTICLE_SLUGS:
+            print(f"⚠️  Skipping {name} - article number: {article_num}")
+            continue
+        
+        output_filename = f"article-{article_num}.png"
+        if not pdf_file.exists():
+            # Same policy as a full run: report the orphan, never delete published files
+            print(f"🗑️  Source removed: {name} (kept {OUTPUT_FOLDER / output_filename})")
+            continue
+        
+        fingerprint = source_fingerprint(pdf_file, images.get(output_filename))
+        if is_up_to_date(images.get(output_filename), fingerprint[2], params, output_filename):
+            print(f"⏭️  Unchanged: {name} → {output_filename}")
+            continue
+        fingerprints[output_filename] = (pdf_file, fingerprint)
+        jobs.append((article_num, pdf_file, output_filename))
+    jobs = with_job_options(jobs, options, images)
+    
+    if pool is None:
+        results = map(render_job, jobs)
+    else:
+        results = pool.map(render_job, jobs)
+    
+    updated = []
+    for (article_num, pdf_file, output_filename, _), (_, outputs, lines, _) in zip(jobs, results):
+        for line in lines:
+            print(line)
+        if outputs:
+            updated.append(article_num)
+            images[output_filename] = manifest_entry(
+                article_num, pdf_file, fingerprints[output_filename][1], params, outputs)
+    
+    if updated:
+        resolve_duplicates(images, options, params)
+    save_manifest(manifest)
+    COVER_MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+    save_manifest(build_cover_manifest(images), COVER_MANIFEST_PATH)
+    if updated:
+        update_articles_json(images)
+    return updated
+
+def rebuild_atlas():
+    """Watch mode atlas rebuild (timer thread); a failure is retried after the next change"""
+    try:
+        print(f"🧩 Thumbnail atlas: {describe_atlas(build_thumbnail_atlas())}")
     except Exception as e:
-        print(f"   ❌ Error: {e}")
-        return False
+        print(f"⚠️  Thumbnail atlas not rebuilt: {e}")
+
+def watch(args):
+    """Long-running mode: re-render covers as PDFs are added, edited or removed"""
+    workers = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    
+    print("👀 PDF Image Extraction - watch mode")
+    print("=" * 60)
+    
+    if not PDF_FOLDER.exists():
+        print(f"❌ Folder not found: {PDF_FOLDER}")
+        sys.exit(1)
+    OUTPUT_FOLDER.mkdir(parents=True, exist_ok=True)
+    
+    watcher = make_watcher(PDF_FOLDER, args.poll, args.poll_interval)
+    pool = None
+    if workers > 1:
+        # Start every worker now so the first edit does not pay for process start-up
+        pool = ProcessPoolExecutor(max_workers=workers)
+        list(pool.map(warm_up, range(workers)))
+    
+    manifest = load_manifest()
+    print(f"📂 Watching {PDF_FOLDER} ({type(watcher).__name__}, {workers} worker(s), "
+          f"debounce {args.debounce * 1000:.0f} ms)")
+    
+    # The atlas re-encodes a whole sheet: rebuild it off the publish path, once edits settle
+    atlas_timer = None
+    def schedule_atlas():
+        nonlocal atlas_timer
+        if atlas_timer:
+            atlas_timer.cancel()
+        atlas_timer = threading.Timer(WATCH_ATLAS_DEBOUNCE, rebuild_atlas)
+        atlas_timer.daemon = True
+        atlas_timer.start()
+    
+    # Catch up with edits made while the watcher was not running
+    options = {"profile": False, "budget": budget_option(args), "dedupe": dedupe_option(args)}
+    updated = refresh_changed({path.name for path in PDF_FOLDER.glob("*.pdf")}, manifest, pool, options)
+    schedule_atlas()
+    print(f"✅ Up to date ({len(updated)} re-rendered). Waiting for changes, Ctrl+C to stop\n")
+    
+    try:
+        while True:
+            pending = watcher.wait()
+            first_event = time.perf_counter()
+            # Debounce: wait until the folder stays quiet for args.debounce seconds
+            while True:
+                more = watcher.wait(args.debounce)
+                if not more:
+                    break
+                pending |= more
+            
+            updated = refresh_changed(pending, manifest, pool, options)
+            elapsed = time.perf_counter() - first_event
+            for num in sorted(updated):
+                print(f"   '{ARTICLE_SLUGS[num]}': '{published_file(manifest['images'], num)}',")
+            if updated:
+                print(f"⚡ Published {len(updated)} cover(s) in {elapsed:.2f} s\n")
+                schedule_atlas()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+    finally:
+        watcher.close()
+        if atlas_timer:
+            # Do not leave a pending rebuild behind (no-op when the atlas is current)
+            atlas_timer.cancel()
+            atlas_timer.join()
+            rebuild_atlas()
+        if pool:
+            pool.shutdown(cancel_futures=True)
+
+def budget_option(args):
+    """--budget/--budget-time as the budget dict passed to the renderers, or None"""
+    if not args.budget:
+        return None
+    return {"bytes": int(args.budget * 1024), "seconds": args.budget_time}
+
+def dedupe_option(args):
+    """Duplicate threshold in bits with --dedupe, else None"""
+    return args.dedupe_threshold if args.dedupe else None
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Extract blog cover images from article PDFs")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Number of worker processes (0 = one per CPU core, default: 1)")
+    parser.add_argument("--force", action="store_true",
+                        help=f"Ignore {MANIFEST_PATH.name} and re-render every PDF")
+    parser.add_argument("--profile", nargs="?", const="extract-profile.json", metavar="REPORT",
+                        help="Time every phase per PDF and write a .json or .csv report "
+                             "(default: extract-profile.json)")
+    parser.add_argument("--profile-top", type=int, default=5, metavar="N",
+                        help="Slowest files listed in the profile summary (default: 5)")
+    parser.add_argument("--cprofile", metavar="FILE",
+                        help="Also run under cProfile and dump stats to FILE (forces --jobs 1)")
+    parser.add_argument("--budget", type=float, metavar="KB",
+                        help="Byte budget per image: search palette size / WebP quality for the best "
+                             "encoding under KB kilobytes and report its PSNR")
+    parser.add_argument("--budget-time", type=float, default=BUDGET_TIME_CAP, metavar="SECONDS",
+                        help=f"Encoding search time cap per cover in budget mode, shared evenly by its files "
+                             f"(default: {BUDGET_TIME_CAP})")
+    parser.add_argument("--dedupe", action="store_true",
+                        help="Point covers that render the same at one canonical file and skip encoding "
+                             "new duplicates (existing files are kept)")
+    parser.add_argument("--dedupe-threshold", type=int, default=DEDUPE_THRESHOLD, metavar="BITS",
+                        help="Perceptual hash distance that makes two covers candidates for --dedupe "
+                             f"(of {DEDUPE_HASH_SIZE ** 2}, default: {DEDUPE_THRESHOLD}); pixels are then compared")
+    parser.add_argument("--check-atlas", action="store_true",
+                        help=f"Only check that every published article has a thumbnail in {ATLAS_JSON}")
+    parser.add_argument("--watch", action="store_true",
+                        help=f"Keep running and re-render covers as PDFs change in {PDF_FOLDER}")
+    parser.add_argument("--poll", action="store_true",
+                        help="Watch by polling file stats instead of inotify")
+    parser.add_argument("--debounce", type=float, default=WATCH_DEBOUNCE, metavar="SECONDS",
+                        help=f"Quiet period before a burst of changes is rendered (default: {WATCH_DEBOUNCE})")
+    parser.add_argument("--poll-interval", type=float, default=WATCH_POLL_INTERVAL, metavar="SECONDS",
+                        help=f"Polling interval when inotify is not used (default: {WATCH_POLL_INTERVAL})")
+    return parser.parse_args(argv)
+
+def write_profile_report(path, records):
+    """Write per-PDF phase timings as JSON or (flattened, one row per phase) CSV"""
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["pdf", "output", "phase", "wall_s", "cpu_s", "py_peak_kb", "rss_peak_kb"])
+            for record in records:
+                for name, stats in record["phases"].items():
+                    writer.writerow([record["pdf"], record["output"], name, f"{stats['wall']:.6f}",
+                                     f"{stats['cpu']:.6f}", stats["pyPeakKb"], stats["rssPeakKb"]])
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"files": records}, f, indent=2)
+            f.write("\n")
 
-def main():
+def print_profile_summary(records, top):
+    totals = {}
+    for record in records:
+        for name, stats in record["phases"].items():
+            totals[name] = totals.get(name, 0.0) + stats["wall"]
+    
+    print("⏱️  Time per phase (all files):")
+    for name, wall in sorted(totals.items(), key=lambda item: -item[1]):
+        print(f"   {name:<18} {wall * 1000:9.1f} ms")
+    
+    print(f"🐢 Slowest {min(top, len(records))} files:")
+    for record in sorted(records, key=lambda r: -r["totalWall"])[:top]:
+        slowest = max(record["phases"].items(), key=lambda item: item[1]["wall"])[0]
+        print(f"   {record['pdf']:<40} {record['totalWall'] * 1000:8.1f} ms (mostly {slowest})")
+    print()
+
+def main(argv=None):
     """Main execution"""
+    args = parse_args(argv)
+    if args.check_atlas:
+        check_atlas()
+    elif args.watch:
+        watch(args)
+    elif args.cprofile:
+        args.jobs = 1
+        profiler = cProfile.Profile()
+        try:
+            profiler.runcall(run, args)
+        finally:
+            profiler.dump_stats(args.cprofile)
+            print(f"📈 cProfile stats written to {args.cprofile}")
+    else:
+        run(args)
+
+def run(args):
+    workers = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    options = {"profile": bool(args.profile), "budget": budget_option(args), "dedupe": dedupe_option(args)}
+    
     print("🚀 PDF Image Extraction Script (PyMuPDF)")
     print("=" * 60)
     
@@ -138,27 +1314,107 @@ def main():
         print("❌ No PDF files found!")
         sys.exit(1)
     
-    # Process each PDF
+    manifest = load_manifest()
+    previous_images = manifest["images"]
+    params = render_params(options["budget"])
+    
+    # Collect render jobs, skipping PDFs whose hash and params are unchanged
+    jobs = []
+    fingerprints = {}
     success_count = 0
+    unchanged_count = 0
     processed_articles = []
     
     for pdf_file in pdf_files:
         article_num = extract_article_number(pdf_file.stem)
         
         if article_num and article_num in ARTICLE_SLUGS:
-            slug = ARTICLE_SLUGS[article_num]
             output_filename = f"article-{article_num}.png"
+            entry = previous_images.get(output_filename)
+            fingerprint = source_fingerprint(pdf_file, entry)
+            fingerprints[output_filename] = (pdf_file, fingerprint)
             
-            if extract_first_page_as_image(pdf_file, output_filename):
+            if not args.force and is_up_to_date(entry, fingerprint[2], params, output_filename):
+                print(f"⏭️  Unchanged: {pdf_file.name} → {output_filename}")
                 success_count += 1
+                unchanged_count += 1
                 processed_articles.append(article_num)
+                continue
+            
+            jobs.append((article_num, pdf_file, output_filename))
         else:
             print(f"⚠️  Skipping {pdf_file.name} - article number: {article_num}")
+    jobs = with_job_options(jobs, options, previous_images)
+    
+    if workers > 1 and len(jobs) > 1:
+        print(f"⚙️  Rendering with {workers} worker processes\n")
+    
+    # Process each PDF
+    images = dict(previous_images)
+    
+    profile_records = []
+    
+    for (article_num, pdf_file, output_filename, _), (_, outputs, lines, phases) in zip(jobs, run_jobs(jobs, workers)):
+        for line in lines:
+            print(line)
+        if phases:
+            profile_records.append({
+                "pdf": pdf_file.name,
+                "output": output_filename,
+                "totalWall": sum(stats["wall"] for stats in phases.values()),
+                "phases": phases,
+            })
+        if outputs:
+            success_count += 1
+            processed_articles.append(article_num)
+            images[output_filename] = manifest_entry(
+                article_num, pdf_file, fingerprints[output_filename][1], params, outputs)
+    
+    # Report outputs whose source PDF is gone; forget them once deleted
+    orphans = sorted(name for name in images if name not in fingerprints)
+    for name in orphans:
+        if not (OUTPUT_FOLDER / name).exists():
+            del images[name]
+    orphans = [name for name in orphans if name in images]
+    
+    clusters = resolve_duplicates(images, options, params)
+    
+    manifest["images"] = images
+    save_manifest(manifest)
+    
+    COVER_MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+    save_manifest(build_cover_manifest(images), COVER_MANIFEST_PATH)
+    articles_changed = update_articles_json(images)
+    atlas = build_thumbnail_atlas(force=args.force)
     
     print()
     print("=" * 60)
-    print(f"✅ Successfully extracted {success_count}/{len(pdf_files)} images")
-    print(f"📁 Images saved to: {OUTPUT_FOLDER.absolute()}\n")
+    print(f"✅ Successfully extracted {success_count}/{len(pdf_files)} images ({unchanged_count} unchanged)")
+    print(f"📁 Images saved to: {OUTPUT_FOLDER.absolute()}")
+    print(f"🖼️  srcset manifest: {COVER_MANIFEST_PATH}")
+    print(f"🎨 Placeholders: {articles_changed} article(s) updated in {ARTICLES_JSON}")
+    print(f"🧩 Thumbnail atlas: {describe_atlas(atlas)} ({ATLAS_JSON})")
+    missing = missing_thumbnails(atlas)
+    if missing:
+        print(f"⚠️  No atlas thumbnail for article(s) {', '.join(map(str, missing))} (see --check-atlas)")
+    print()
+    
+    if clusters:
+        print(f"♻️  Duplicate covers: {sum(map(len, clusters.values()))} share {len(clusters)} canonical file(s)")
+        for line in describe_clusters(clusters):
+            print(line)
+        print()
+    
+    if profile_records:
+        write_profile_report(args.profile, profile_records)
+        print(f"📊 Profile report: {args.profile}")
+        print_profile_summary(profile_records, args.profile_top)
+    
+    if orphans:
+        print("🗑️  Orphaned images (source PDF removed):")
+        for name in orphans:
+            print(f"   {OUTPUT_FOLDER / name} (was {images[name]['pdf']})")
+        print()
     
     if processed_articles:
         print("📋 Processed articles:", sorted(processed_articles))
@@ -167,7 +1423,7 @@ def main():
         print("   Add these entries:")
         for num in sorted(processed_articles):
             slug = ARTICLE_SLUGS[num]
-            print(f"   '{slug}': 'article-{num}.png',")
+            print(f"   '{slug}': '{published_file(images, num)}',")
 
 if __name__ == "__main__":
     main()
@@ -1,16 +1,126 @@
 #!/usr/bin/env python3
-import fitz  # PyMuPDF
-import sys
+"""
+Extract text from blog article PDFs using PyMuPDF
+
+Single file (legacy):  extract-text.py article.pdf            (plain text)
+Batch JSONL:           extract-text.py "AI-IKIGAI Article de Blog" -o texts.jsonl -j 0
+                       (folders, several files or --jsonl)
+"""
+
 import os
+import sys
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    import pymupdf as fitz  # PyMuPDF >= 1.24 (importing "fitz" prints a warning on stdout)
+except ImportError:
+    import fitz  # PyMuPDF
+
+MAX_PAGES = 10
+MAX_CHARS = 8000
+
+
+def iter_page_text(pdf, max_pages=MAX_PAGES, max_chars=MAX_CHARS):
+    """Yield (page_number, text) from an open document, stopping at the budget
+
+    Pages are extracted lazily, so once max_chars characters have been
+    produced no further page is parsed. The last page is truncated to fit.
+    """
+    remaining = max_chars
+    for page_num in range(min(max_pages, len(pdf))):
+        if remaining <= 0:
+            return
+        text = pdf[page_num].get_text()[:remaining]
+        remaining -= len(text)
+        yield page_num + 1, text
+
+
+def iter_records(pdf_path, max_pages=MAX_PAGES, max_chars=MAX_CHARS):
+    """Yield one {"file", "page", "text"} record per extracted page of a PDF"""
+    with fitz.open(str(pdf_path)) as pdf:
+        for page, text in iter_page_text(pdf, max_pages, max_chars):
+            yield {"file": str(pdf_path), "page": page, "text": text}
+
+
+def extract_records(job):
+    """Worker entry point: all records of one PDF, or an error record"""
+    pdf_path, max_pages, max_chars = job
+    try:
+        return list(iter_records(pdf_path, max_pages, max_chars))
+    except Exception as e:
+        return [{"file": str(pdf_path), "error": str(e)}]
+
+
+def collect_pdfs(paths):
+    """Expand files and folders into a sorted list of PDF paths"""
+    pdfs = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            pdfs.extend(sorted(path.glob("*.pdf")))
+        else:
+            pdfs.append(path)
+    return pdfs
+
+
+def run_batch(pdfs, max_pages, max_chars, workers):
+    """Yield per-file record lists in input order, in-process or via a process pool"""
+    jobs = [(pdf, max_pages, max_chars) for pdf in pdfs]
+    if workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            yield extract_records(job)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        yield from pool.map(extract_records, jobs)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Extract text from article PDFs")
+    parser.add_argument("paths", nargs="+", help="PDF files or folders containing PDFs")
+    parser.add_argument("--jsonl", action="store_true",
+                        help="Write one JSON record (file, page, text) per page")
+    parser.add_argument("--output", "-o", help="Write output to this file instead of stdout")
+    parser.add_argument("--max-pages", type=int, default=MAX_PAGES,
+                        help=f"Pages read per PDF (default: {MAX_PAGES})")
+    parser.add_argument("--max-chars", type=int, default=MAX_CHARS,
+                        help=f"Character budget per PDF (default: {MAX_CHARS})")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Number of worker processes (0 = one per CPU core, default: 1)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    workers = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    pdfs = collect_pdfs(args.paths)
+    # Plain text only for the legacy call with one PDF file: a folder always
+    # gets JSONL records, even when it holds a single PDF
+    jsonl = args.jsonl or len(args.paths) != 1 or Path(args.paths[0]).is_dir()
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        if not jsonl:
+            # Legacy mode: plain text of a single PDF
+            for record in iter_records(pdfs[0], args.max_pages, args.max_chars):
+                out.write(record["text"])
+            out.write("\n")
+            return
 
-pdf_file = sys.argv[1]
-pdf = fitz.open(pdf_file)
+        failures = 0
+        for records in run_batch(pdfs, args.max_pages, args.max_chars, workers):
+            for record in records:
+                if "error" in record:
+                    failures += 1
+                    print(f"❌ {record['file']}: {record['error']}", file=sys.stderr)
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        print(f"✅ Extracted {len(pdfs) - failures}/{len(pdfs)} PDFs", file=sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
 
-text = ""
-for page_num in range(min(10, len(pdf))):  # First 10 pages
-    page = pdf[page_num]
-    text += page.get_text()
 
-# Print first 8000 characters
-print(text[:8000])
-pdf.close()
+if __name__ == "__main__":
+    main()
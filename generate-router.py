@@ -0,0 +1,643 @@
+#!/usr/bin/env python3
+"""
+Génération d'un routeur par table pour index-supabase.js
+
+handleRequest() dispatches by walking a chain of
+    if (path === '/api/...' && method === '...') { ... }
+blocks, which the patch scripts keep extending. This codegen step reads the
+patched worker, turns every block into its own handler function and replaces
+the chain with a lookup:
+  - exact routes: one Map lookup on "METHOD /path"
+  - parameterised routes (path.match(/^...[^/]+...$/)) and prefix routes
+    (path.startsWith('/.../')): a segment tree walked once per request
+Handler bodies are copied unchanged; they receive request, env, url, path,
+method and the route params, so code such as path.split('/').pop() still works.
+
+Before anything is written, an equivalence check resolves a probe set of
+requests (every route, every method, plus near misses) through the original
+if-chain semantics and through the generated resolveRoute() run in node, and
+fails if any request would reach a different handler. It also fails if a
+route body can end without a return: the if-chain would go on to the next
+route, while the generated dispatch answers 404.
+
+index-supabase.js stays the source of truth (patch-worker.py keeps its
+anchors); the generated worker is deployed with
+    npx wrangler deploy build/index-supabase.js
+
+Usage:
+    python3 generate-router.py                   # write build/index-supabase.js
+    python3 generate-router.py --check-only      # only run the equivalence check
+"""
+
+import re
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+WORKER_FILE = "index-supabase.js"
+OUTPUT_FILE = Path("build") / "index-supabase.js"
+
+HANDLER_START = "async function handleRequest(request, env) {"
+TRY_LINE = "\ttry {\n"
+CATCH_LINE = "\t} catch (error) {\n"
+NOT_FOUND_LINE = "\t\treturn errorResponse('Route non trouvée: ' + path, 404);\n"
+BLOCK_INDENT = "\t\t"
+
+PROBE_METHODS = ("GET", "POST", "PUT", "DELETE", "PATCH")
+PROBE_PARAM = "sample-42"
+
+CONDITION_RES = [
+    # path === '/x' && method === 'GET'   /   path === '/x'
+    ("exact", re.compile(r"^path === '([^']+)'(?: && method === '([A-Z]+)')?$")),
+    # path.match(/^\/x\/[^/]+$/) && method === 'GET'
+    ("param", re.compile(r"^path\.match\(/(\^.*\$)/\)(?: && method === '([A-Z]+)')?$")),
+    # path.startsWith('/x/') && method === 'GET'
+    ("prefix", re.compile(r"^path\.startsWith\('([^']+/)'\)(?: && method === '([A-Z]+)')?$")),
+]
+PARAM_SEGMENT = r"[^/]+"
+
+
+class RouterError(Exception):
+    pass
+
+
+# ============================================
+# JavaScript scanning
+# ============================================
+
+JS_REGEX_PRECEDERS = set("(,=:[!&|?{};+-*%<>~^")
+
+
+def scan_code(text, start, literal_newlines=None):
+    """Yield (index, char) for code characters, skipping strings, templates,
+    regex literals and comments. Template ${...} expressions are code.
+    Newlines found inside template literals are added to literal_newlines.
+    """
+    if literal_newlines is None:
+        literal_newlines = set()
+    templates = []  # brace depth of each open ${ ... }
+    i, n = start, len(text)
+    last = ""  # last significant code character
+
+    def skip_template(i):
+        """i is just after ` or }; return the index after the closing ` or ${"""
+        while i < n:
+            c = text[i]
+            if c == "\\":
+                i += 2
+                continue
+            if c == "\n":
+                literal_newlines.add(i)
+            if c == "`":
+                return i + 1, False
+            if text.startswith("${", i):
+                return i + 2, True
+            i += 1
+        return n, False
+
+    while i < n:
+        c = text[i]
+        if text.startswith("//", i):
+            i = text.find("\n", i)
+            i = n if i < 0 else i
+            continue
+        if text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+            continue
+        if c in "'\"":
+            j = i + 1
+            while j < n and text[j] != c and text[j] != "\n":
+                j += 2 if text[j] == "\\" else 1
+            i, last = j + 1, c
+            continue
+        if c == "`" or (c == "}" and templates and templates[-1] == 0):
+            if c == "}":
+                templates.pop()
+            i, interpolation = skip_template(i + 1)
+            if interpolation:
+                templates.append(0)
+            last = "`"
+            continue
+        if c == "/" and (not last or last in JS_REGEX_PRECEDERS):
+            j, in_class = i + 1, False
+            while j < n and text[j] != "\n":
+                if text[j] == "\\":
+                    j += 1
+                elif text[j] == "[":
+                    in_class = True
+                elif text[j] == "]":
+                    in_class = False
+                elif text[j] == "/" and not in_class:
+                    break
+                j += 1
+            i, last = j + 1, "/"
+            continue
+        if templates and c in "{}":
+            templates[-1] += 1 if c == "{" else -1
+        if not c.isspace():
+            last = c
+        yield i, c
+        i += 1
+
+
+def matching_brace(text, open_pos):
+    depth = 0
+    for i, c in scan_code(text, open_pos):
+        if c == "{":
+            depth += 1
+        elif c == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+    raise RouterError(f"Unbalanced braces from offset {open_pos}")
+
+
+def dedent_code(text, prefix):
+    """Remove prefix from every line that does not start inside a literal"""
+    literal_newlines = set()
+    for _ in scan_code(text, 0, literal_newlines):
+        pass
+    lines = []
+    pos = 0
+    for line in text.split("\n"):
+        inside_literal = (pos - 1) in literal_newlines
+        lines.append(line[len(prefix):] if not inside_literal and line.startswith(prefix) else line)
+        pos += len(line) + 1
+    return "\n".join(lines)
+
+
+# ============================================
+# Route extraction
+# ============================================
+
+class Route:
+    def __init__(self, kind, pattern, method, comments, body):
+        self.kind = kind          # exact | param | prefix
+        self.pattern = pattern    # path, regex source or prefix
+        self.method = method      # None = any method
+        self.comments = comments  # comment lines preceding the block
+        self.body = body          # block body, original indentation
+        self.name = None
+
+    @property
+    def segments(self):
+        """Path segments, PARAM_SEGMENT for parameters"""
+        if self.kind == "param":
+            return param_segments(self.pattern)
+        return self.pattern.strip("/").split("/")
+
+    def sample_path(self):
+        if self.kind == "exact":
+            return self.pattern
+        if self.kind == "prefix":
+            return self.pattern + PROBE_PARAM
+        return "/" + "/".join(PROBE_PARAM if s == PARAM_SEGMENT else s for s in self.segments)
+
+    def matches(self, method, path):
+        """The original if-condition, evaluated in Python"""
+        if self.method and self.method != method:
+            return False
+        if self.kind == "exact":
+            return path == self.pattern
+        if self.kind == "prefix":
+            return path.startswith(self.pattern)
+        return re.search(self.pattern, path) is not None
+
+    def label(self):
+        return f"{self.method or '*'} {self.pattern}"
+
+
+def param_segments(regex):
+    """^\\/api\\/x\\/[^/]+$ -> ['api', 'x', '[^/]+']"""
+    parts = regex[1:-1].split("\\/")
+    if parts[0] != "":
+        raise RouterError(f"Unsupported route regex: /{regex}/")
+    return parts[1:]
+
+
+def parse_condition(condition):
+    for kind, regex in CONDITION_RES:
+        match = regex.match(condition)
+        if match:
+            pattern, method = match.groups()
+            if kind == "param" and not all(
+                    s == PARAM_SEGMENT or re.fullmatch(r"[\w-]+", s) for s in param_segments(pattern)):
+                raise RouterError(f"Unsupported route regex: /{pattern}/")
+            return kind, pattern, method
+    raise RouterError(f"Unsupported route condition: {condition}")
+
+
+def split_handler(source):
+    """Locate handleRequest and its try { ... } route chain"""
+    start = source.find(HANDLER_START)
+    if start < 0:
+        raise RouterError(f"Cannot find {HANDLER_START!r}")
+    end = matching_brace(source, start + len(HANDLER_START) - 1)
+    # Anchored on the preceding newline: nested blocks have their own try/catch
+    try_pos = source.index("\n" + TRY_LINE, start, end) + 1 + len(TRY_LINE)
+    catch_pos = source.index("\n" + CATCH_LINE, try_pos, end) + 1
+    return start, try_pos, catch_pos, end
+
+
+def extract_routes(source, try_pos, catch_pos):
+    """Parse the if-chain between try { and } catch into Route objects"""
+    routes = []
+    comments = []
+    pos = try_pos
+    while pos < catch_pos:
+        line_end = source.index("\n", pos) + 1
+        line = source[pos:line_end]
+        stripped = line.strip()
+
+        if not stripped:
+            pos = line_end
+        elif stripped.startswith("//") and line.startswith(BLOCK_INDENT):
+            comments.append(stripped)
+            pos = line_end
+        elif line == NOT_FOUND_LINE:
+            pos = line_end
+            if source[pos:catch_pos].strip():
+                raise RouterError("Unexpected code after the not-found response")
+        elif line.startswith(BLOCK_INDENT + "if (") and line.rstrip().endswith(") {"):
+            condition = line.strip()[len("if ("):-len(") {")]
+            kind, pattern, method = parse_condition(condition)
+            brace = pos + len(line.rstrip()) - 1
+            close = matching_brace(source, brace)
+            body = source[brace + 2:close].rstrip(" \t")
+            routes.append(Route(kind, pattern, method, comments, body))
+            comments = []
+            pos = source.index("\n", close) + 1
+        else:
+            raise RouterError(f"Unexpected statement in the route chain: {stripped[:80]}")
+    return routes
+
+
+def name_routes(routes):
+    used = set()
+    for route in routes:
+        words = [s for s in route.segments if s not in ("api", "")]
+        words = ["Param" if s == PARAM_SEGMENT else s for s in words] + (["Any"] if route.kind == "prefix" else [])
+        camel = "".join(part.capitalize() for word in words for part in re.split(r"[^a-zA-Z0-9]+", word) if part)
+        base = f"route{(route.method or 'All').capitalize()}{camel}"
+        name, n = base, 2
+        while name in used:
+            name, n = f"{base}{n}", n + 1
+        used.add(name)
+        route.name = name
+
+
+# ============================================
+# Code generation
+# ============================================
+
+def build_tree(routes):
+    """Segment tree for param and prefix routes: {s: {seg: node}, p: node, h: {M: fn}, w: {M: fn}}"""
+    tree = {}
+    for route in routes:
+        if route.kind == "exact":
+            continue
+        node = tree
+        for segment in route.segments:
+            if segment == PARAM_SEGMENT:
+                node = node.setdefault("p", {})
+            else:
+                node = node.setdefault("s", {}).setdefault(segment, {})
+        slot = node.setdefault("w" if route.kind == "prefix" else "h", {})
+        slot.setdefault(route.method or "*", route.name)
+    return tree
+
+
+def js_string(value):
+    return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def js_tree(node, indent=1):
+    pad = "\t" * indent
+    parts = []
+    if "s" in node:
+        children = ",\n".join(f"{pad}\t\t{js_string(seg)}: {js_tree(child, indent + 2)}" for seg, child in node["s"].items())
+        parts.append(f"{pad}\ts: {{\n{children}\n{pad}\t}}")
+    if "p" in node:
+        parts.append(f"{pad}\tp: {js_tree(node['p'], indent + 1)}")
+    for key in ("h", "w"):
+        if key in node:
+            handlers = ", ".join(f"{js_string(m)}: {fn}" for m, fn in node[key].items())
+            parts.append(f"{pad}\t{key}: {{ {handlers} }}")
+    return "{\n" + ",\n".join(parts) + f"\n{pad}}}"
+
+
+ROUTER_RUNTIME = """\
+function matchRouteTree(node, segments, i, method, params) {
+\tif (i === segments.length) {
+\t\tconst handler = node.h && (node.h[method] || node.h['*']);
+\t\treturn handler ? { handler, params } : null;
+\t}
+\tconst segment = segments[i];
+\tconst child = node.s && node.s[segment];
+\tif (child) {
+\t\tconst found = matchRouteTree(child, segments, i + 1, method, params);
+\t\tif (found) return found;
+\t}
+\tif (node.p && segment !== '') {
+\t\tconst found = matchRouteTree(node.p, segments, i + 1, method, [...params, segment]);
+\t\tif (found) return found;
+\t}
+\tconst prefixHandler = node.w && (node.w[method] || node.w['*']);
+\treturn prefixHandler ? { handler: prefixHandler, params } : null;
+}
+
+function resolveRoute(method, path) {
+\tconst handler = EXACT_ROUTES.get(method + ' ' + path) || EXACT_ROUTES.get('* ' + path);
+\tif (handler) return { handler, params: [] };
+\tif (!path.startsWith('/')) return null;
+\treturn matchRouteTree(ROUTE_TREE, path.slice(1).split('/'), 0, method, []);
+}
+"""
+
+
+def generate_router(routes):
+    exact = "\n".join(
+        f"\t[{js_string((r.method or '*') + ' ' + r.pattern)}, {r.name}],"
+        for r in routes if r.kind == "exact"
+    )
+    return (
+        "// ============================================\n"
+        "// ROUTER (généré par generate-router.py, ne pas modifier)\n"
+        "// ============================================\n\n"
+        f"const EXACT_ROUTES = new Map([\n{exact}\n]);\n\n"
+        f"const ROUTE_TREE = {js_tree(build_tree(routes), 0)};\n\n"
+        + ROUTER_RUNTIME
+    )
+
+
+def generate_handlers(routes):
+    chunks = []
+    for route in routes:
+        comments = "".join(f"{c}\n" for c in route.comments)
+        body = dedent_code(route.body, "\t\t")
+        chunks.append(
+            f"{comments}async function {route.name}(request, env, url, path, method, params) {{\n"
+            f"{body.rstrip()}\n}}\n"
+        )
+    return "\n".join(chunks)
+
+
+DISPATCH = """\
+\t\tconst route = resolveRoute(method, path);
+\t\tif (route) {
+\t\t\tconst response = await route.handler(request, env, url, path, method, route.params);
+\t\t\tif (response !== undefined) return response;
+\t\t}
+
+"""
+
+
+def generate_worker(source):
+    start, try_pos, catch_pos, end = split_handler(source)
+    routes = extract_routes(source, try_pos, catch_pos)
+    if not routes:
+        raise RouterError("No route found in handleRequest")
+    name_routes(routes)
+    worker = (
+        source[:start]
+        + "// ============================================\n"
+        + "// ROUTE HANDLERS (un par endpoint)\n"
+        + "// ============================================\n\n"
+        + generate_handlers(routes) + "\n"
+        + generate_router(routes) + "\n"
+        + source[start:try_pos]
+        + DISPATCH + NOT_FOUND_LINE + "\n"
+        + source[catch_pos:]
+    )
+    return worker, routes
+
+
+# ============================================
+# Equivalence check
+# ============================================
+
+def probe_requests(routes):
+    paths = {"/", "/api", "/api/", "/api/unknown"}
+    for route in routes:
+        sample = route.sample_path()
+        paths.update({sample, sample + "/", sample + "/extra", sample.rstrip("/") + "x"})
+        if route.kind != "exact":
+            base = "/" + "/".join(s for s in route.segments if s != PARAM_SEGMENT)
+            paths.update({base, base + "/", route.pattern if route.kind == "prefix" else base + "//"})
+    return [(method, path) for path in sorted(paths) for method in PROBE_METHODS]
+
+
+def original_resolution(routes, method, path):
+    for route in routes:
+        if route.matches(method, path):
+            return route.name
+    return None
+
+
+def generated_resolution_node(routes, router_code, probes):
+    """Run the generated resolveRoute() in node with stub handlers"""
+    stubs = "".join(f"const {r.name} = {json.dumps(r.name)};\n" for r in routes)
+    script = (
+        stubs + router_code
+        + f"const probes = {json.dumps(probes)};\n"
+        + "console.log(JSON.stringify(probes.map(([m, p]) => { const r = resolveRoute(m, p); return r ? r.handler : null; })));\n"
+    )
+    with tempfile.NamedTemporaryFile("w", suffix=".js", delete=False, encoding="utf-8") as f:
+        f.write(script)
+    try:
+        result = subprocess.run(["node", f.name], capture_output=True, text=True, check=True)
+    finally:
+        Path(f.name).unlink()
+    return json.loads(result.stdout)
+
+
+def check_equivalence(routes, router_code):
+    probes = probe_requests(routes)
+    expected = [original_resolution(routes, m, p) for m, p in probes]
+    if shutil.which("node") is None:
+        raise RouterError("node is required for the equivalence check")
+    actual = generated_resolution_node(routes, router_code, probes)
+
+    mismatches = [(m, p, e, a) for (m, p), e, a in zip(probes, expected, actual) if e != a]
+    for method, path, want, got in mismatches:
+        print(f"   ❌ {method} {path}: if-chain → {want}, table → {got}")
+    reached = {name for name in expected if name}
+    unreached = [r.label() for r in routes if r.name not in reached]
+    for label in unreached:
+        print(f"   ⚠️  {label} is shadowed by an earlier route and can never be reached")
+    return len(probes), mismatches
+
+
+# ============================================
+# Fall-through check
+# ============================================
+
+def code_start(text):
+    """Index of the first code character, past whitespace and comments"""
+    return next((i for i, c in scan_code(text, 0) if not c.isspace()), len(text))
+
+
+def statement_ends(text):
+    """End offsets of the top-level statements of a block body"""
+    depth = 0
+    for i, c in scan_code(text, 0):
+        if c in "({[":
+            depth += 1
+        elif c in ")]}":
+            depth -= 1
+        if depth == 0 and c in ";}":
+            yield i + 1
+    yield len(text)
+
+
+def split_statements(text):
+    """Top-level statements of a block body, else/catch/finally clauses
+    joined to the statement they continue"""
+    merged = []
+    start = 0
+    for end in statement_ends(text):
+        chunk = text[start:end]
+        statement = chunk[code_start(chunk):].strip()
+        start = end
+        if not statement or statement == ";":
+            continue
+        if merged and re.match(r"(else|catch|finally)\b", statement):
+            merged[-1] += " " + statement
+        else:
+            merged.append(statement)
+    return merged
+
+
+def clause_body(text):
+    """Body of 'if (...) {...}', 'catch (e) stmt', 'try {...}'... and the rest after it"""
+    depth = 0
+    for i, c in scan_code(text, 0):
+        if c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+            if depth == 0 and not text[i + 1:].lstrip().startswith("{"):
+                end = i + 1 + next(statement_ends(text[i + 1:]))
+                return text[i + 1:end], text[end:].strip()
+        elif c == "{" and depth == 0:
+            close = matching_brace(text, i)
+            return text[i + 1:close], text[close + 1:].strip()
+    raise RouterError(f"Cannot parse statement: {text[:80]}")
+
+
+def always_returns(statement):
+    """Whether a statement (or a block body, for lists) never completes normally"""
+    if isinstance(statement, list):
+        return bool(statement) and always_returns(statement[-1])
+    if re.match(r"(return|throw)\b", statement):
+        return True
+    if statement.startswith("{"):
+        return always_returns(split_statements(statement[1:matching_brace(statement, 0)]))
+    if re.match(r"if\b", statement):
+        then, rest = clause_body(statement)
+        if not rest.startswith("else"):
+            return False
+        otherwise = rest[len("else"):].strip()
+        if otherwise.startswith("{"):
+            otherwise = otherwise[1:matching_brace(otherwise, 0)]
+        return always_returns(split_statements(then)) and always_returns(split_statements(otherwise))
+    if re.match(r"try\b", statement):
+        body, rest = clause_body(statement)
+        clauses = [always_returns(split_statements(body))]
+        while rest:
+            keyword = re.match(r"(catch|finally)\b", rest)
+            if not keyword:
+                raise RouterError(f"Cannot parse statement: {rest[:80]}")
+            keyword = keyword.group(1)
+            clause, rest = clause_body(rest)
+            if keyword == "finally" and always_returns(split_statements(clause)):
+                return True
+            if keyword == "catch":
+                clauses.append(always_returns(split_statements(clause)))
+        return all(clauses)
+    return False
+
+
+def fall_through_routes(routes):
+    """Routes whose body can finish without a response. The if-chain went on to
+    the next route in that case; the generated dispatch returns the 404."""
+    return [route for route in routes if not always_returns(split_statements(route.body))]
+
+
+def node_check_syntax(code):
+    if shutil.which("node") is None:
+        return True
+    with tempfile.NamedTemporaryFile("w", suffix=".mjs", delete=False, encoding="utf-8") as f:
+        f.write(code)
+    try:
+        result = subprocess.run(["node", "--check", f.name], capture_output=True, text=True)
+    finally:
+        Path(f.name).unlink()
+    if result.returncode:
+        print(result.stderr.strip())
+    return result.returncode == 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a table-driven router for the worker")
+    parser.add_argument("--file", default=WORKER_FILE, help=f"Worker source (default: {WORKER_FILE})")
+    parser.add_argument("--output", "-o", type=Path, default=OUTPUT_FILE, help=f"Generated worker (default: {OUTPUT_FILE})")
+    parser.add_argument("--check-only", action="store_true", help="Run the equivalence check without writing")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    print(f"📖 Reading {args.file}...")
+    with open(args.file, "r", encoding="utf-8") as f:
+        source = f.read()
+
+    try:
+        worker, routes = generate_worker(source)
+        print(f"🧭 {len(routes)} route(s) extracted:")
+        for route in routes:
+            print(f"   {route.label():<48} → {route.name}")
+
+        print("🔍 Equivalence check...")
+        count, mismatches = check_equivalence(routes, generate_router(routes))
+    except RouterError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if mismatches:
+        print(f"❌ {len(mismatches)} of {count} probe requests resolve differently, nothing written")
+        sys.exit(1)
+    print(f"✅ {count} probe requests resolve to the same handler")
+
+    try:
+        fall_through = fall_through_routes(routes)
+    except RouterError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    for route in fall_through:
+        print(f"   ❌ {route.label()} ({route.name}) can end without a return")
+    if fall_through:
+        print(f"❌ {len(fall_through)} route(s) would fall through to the 404 instead of the next route, nothing written")
+        sys.exit(1)
+    print("✅ every route body ends in a return")
+
+    if not node_check_syntax(worker):
+        print("❌ Generated worker does not parse, nothing written")
+        sys.exit(1)
+
+    if args.check_only:
+        return
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(worker)
+    print(f"💾 Written {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Calcul batch des scores Ikigai (passion / profession / mission / vocation)
+
+Python port of the fallback scoring block that add-score-calc.py injects into
+index-supabase.js: every answer is lowercased and trimmed, looked up in the
+keyword table, and its weight is added to one dimension, capped at 100.
+Dimensions that received nothing default to 60. Results are identical to the
+worker formula.
+
+Usage:
+    python3 ikigai_scoring.py analyses.jsonl -o scores.jsonl
+    python3 ikigai_scoring.py analyses.csv --format csv
+    python3 ikigai_scoring.py --verify-js index-supabase.js
+"""
+
+import re
+import sys
+import csv
+import json
+import argparse
+
+DIMENSIONS = ('passion', 'profession', 'mission', 'vocation')
+MAX_SCORE = 100
+DEFAULT_SCORE = 60
+
+# keyword -> (dimension, weight), same table as the worker (const m = {...})
+SCORE_MAP = {
+    'create': ('passion', 25), 'analyze': ('profession', 20), 'teach': ('mission', 30),
+    'connect': ('passion', 20), 'build': ('profession', 25), 'explore': ('passion', 20),
+    'tech': ('profession', 20), 'art': ('passion', 25), 'business': ('vocation', 20),
+    'science': ('profession', 20), 'social': ('mission', 30), 'health': ('mission', 25),
+    'challenge': ('passion', 20), 'impact': ('mission', 30), 'learn': ('passion', 20),
+    'team': ('profession', 15), 'freedom': ('passion', 25), 'dev-perso': ('passion', 15),
+    'creative': ('passion', 25), 'culture': ('passion', 15), 'advice': ('profession', 20),
+    'organize': ('profession', 20), 'mediate': ('profession', 20), 'motivate': ('mission', 25),
+    'communication': ('profession', 20), 'analysis': ('profession', 25),
+    'creativity': ('passion', 25), 'leadership': ('profession', 25), 'empathy': ('mission', 25),
+    'execution': ('profession', 20), 'practice': ('profession', 20), 'read': ('profession', 15),
+    'watch': ('profession', 15), 'discuss': ('profession', 15), 'leader': ('profession', 25),
+    'analyst': ('profession', 20), 'harmonizer': ('mission', 25), 'executor': ('profession', 20),
+    'challenger': ('passion', 20), 'growth': ('passion', 20), 'respect': ('mission', 20),
+    'balance': ('vocation', 15), 'startup': ('vocation', 25), 'corporate': ('vocation', 15),
+    'remote': ('vocation', 15), 'freelance': ('vocation', 25), 'wealth': ('vocation', 25),
+    'recognition': ('vocation', 20), 'mastery': ('profession', 25), 'education': ('mission', 30),
+    'environment': ('mission', 30), 'equality': ('mission', 30), 'innovation': ('vocation', 25),
+    'community': ('mission', 25), 'sustainability': ('mission', 25), 'finance': ('vocation', 20),
+}
+
+# Precompiled lookup: keyword -> (dimension index, weight)
+_LOOKUP = {keyword: (DIMENSIONS.index(dim), weight) for keyword, (dim, weight) in SCORE_MAP.items()}
+
+JS_TABLE_RE = re.compile(r"const m\s*=\s*\{(.*?)\};", re.S)
+JS_ENTRY_RE = re.compile(r"'([^']+)'\s*:\s*\{\s*c\s*:\s*'(\w+)'\s*,\s*s\s*:\s*(\d+)\s*\}")
+
+
+def js_string(value):
+    """String(value) as JavaScript would render a JSON value"""
+    if value is None:
+        return 'null'
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if isinstance(value, float):
+        return str(int(value)) if value.is_integer() else repr(value)
+    if isinstance(value, list):
+        return ','.join('' if item is None else js_string(item) for item in value)
+    if isinstance(value, dict):
+        return '[object Object]'
+    return str(value)
+
+
+def iter_answer_values(answers):
+    """Flatten an answers object the way the worker builds allAnswers"""
+    for value in answers.values():
+        if isinstance(value, list):
+            yield from value
+        elif value not in (None, False, 0, ''):
+            yield js_string(value)
+
+
+def score_answers(answers):
+    """Scores for one answers object: {'passion': .., 'profession': .., ...}"""
+    totals = [0, 0, 0, 0]
+    lookup = _LOOKUP
+    for answer in iter_answer_values(answers or {}):
+        hit = lookup.get(js_string(answer).lower().strip())
+        if hit:
+            totals[hit[0]] += hit[1]
+    # Weights are all positive, so capping the total equals capping every step
+    return {
+        dim: min(MAX_SCORE, total) if total else DEFAULT_SCORE
+        for dim, total in zip(DIMENSIONS, totals)
+    }
+
+
+def score_batch(answers_iterable):
+    """Lazily score an iterable of answers objects, yielding one dict per input"""
+    for answers in answers_iterable:
+        yield score_answers(answers)
+
+
+def row_answers(row):
+    """Extract the answers object from an exported analyses row"""
+    for key in ('answers', 'questionnaire_data'):
+        if key in row:
+            answers = row[key]
+            break
+    else:
+        answers = row
+    if isinstance(answers, str):
+        answers = json.loads(answers) if answers.strip() else {}
+    return answers if isinstance(answers, dict) else {}
+
+
+def read_rows(path, fmt):
+    """Stream rows from a JSONL or CSV export ('-' for stdin)"""
+    f = sys.stdin if path == '-' else open(path, 'r', encoding='utf-8', newline='')
+    try:
+        if fmt == 'csv':
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def load_js_mapping(path):
+    """Parse the keyword table out of the worker source"""
+    with open(path, 'r', encoding='utf-8') as f:
+        match = JS_TABLE_RE.search(f.read())
+    if not match:
+        raise ValueError(f"Cannot find scoring table in {path}")
+    return {key: (dim, int(weight)) for key, dim, weight in JS_ENTRY_RE.findall(match.group(1))}
+
+
+def verify_js(path):
+    js_map = load_js_mapping(path)
+    if js_map == SCORE_MAP:
+        print(f"✅ SCORE_MAP matches the table in {path} ({len(js_map)} keywords)")
+        return True
+    for key in sorted(set(js_map) | set(SCORE_MAP)):
+        if js_map.get(key) != SCORE_MAP.get(key):
+            print(f"❌ {key}: js={js_map.get(key)} py={SCORE_MAP.get(key)}")
+    return False
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Batch-compute Ikigai dimension scores")
+    parser.add_argument('input', nargs='?', default='-', help="analyses export (JSONL or CSV, '-' = stdin)")
+    parser.add_argument('--format', choices=('jsonl', 'csv'), help="Input format (default: from extension)")
+    parser.add_argument('--output', '-o', help="Write JSONL results here instead of stdout")
+    parser.add_argument('--verify-js', metavar='WORKER', help="Check SCORE_MAP against the worker's table and exit")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.verify_js:
+        sys.exit(0 if verify_js(args.verify_js) else 1)
+
+    fmt = args.format or ('csv' if args.input.lower().endswith('.csv') else 'jsonl')
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    count = 0
+    try:
+        rows = read_rows(args.input, fmt)
+        for row in rows:
+            record = {key: row[key] for key in ('id', 'user_id') if key in row}
+            record.update(score_answers(row_answers(row)))
+            out.write(json.dumps(record, ensure_ascii=False) + '\n')
+            count += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print(f"✅ Scored {count} analyses", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
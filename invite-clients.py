@@ -0,0 +1,538 @@
+#!/usr/bin/env python3
+"""
+Envoi groupé d'invitations coach → clients
+
+Bulk counterpart of POST /api/send-invitation (update-invitation-endpoint.py)
+for onboarding a whole cohort at once:
+
+  - the generateInvitationEmailHTML template literal is read from the worker
+    and compiled once; every email is then a single join
+  - existing profiles and coach_clients relations are fetched in a handful of
+    queries, and all new relations are created with one coach_clients upsert
+  - emails go to Resend through a bounded thread pool sharing a rate limiter
+    (429 Retry-After pauses every sender), with retries and an idempotency key
+    per invitation so a retried request never sends twice
+
+Input is a CSV (columns to/email, clientName/name, personalMessage/message)
+or a JSON list of {to, clientName, personalMessage} objects.
+SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY, RESEND_API_KEY and EMAIL_FROM are
+read from the environment, SUPABASE_URL/EMAIL_FROM falling back to wrangler.toml.
+
+Usage:
+    python3 invite-clients.py cohorte.csv --coach-id <uuid>
+    python3 invite-clients.py cohorte.json --coach-id <uuid> --concurrency 4 --rate 2 --report resultats.csv
+    python3 invite-clients.py cohorte.csv --coach-id <uuid> --dry-run
+"""
+
+import os
+import re
+import csv
+import sys
+import json
+import time
+import html
+import random
+import argparse
+import threading
+import http.client
+from pathlib import Path
+from functools import lru_cache
+from urllib.parse import urlsplit, quote
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    import tomllib  # Python >= 3.11
+except ImportError:
+    tomllib = None
+
+WORKER_FILE = "index-supabase.js"
+RESEND_API_URL = "https://api.resend.com/emails"
+DEFAULT_INVITE_BASE_URL = "https://ai-ikigai.com/auth.html"
+DEFAULT_EMAIL_FROM = "onboarding@resend.dev"
+REPLY_TO = "contact@ai-ikigai.com"
+
+LOOKUP_CHUNK = 100  # emails per profiles lookup, keeps the query string short
+RETRYABLE_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+TEMPLATE_START_RE = re.compile(r"function generateInvitationEmailHTML\(([^)]*)\)\s*\{\s*return `")
+FIELD_RE = re.compile(r"^[A-Za-z_$][\w$]*$")
+CONDITIONAL_RE = re.compile(r"^([A-Za-z_$][\w$]*)\s*\?\s*`(\d+)`\s*:\s*(?:''|\"\")$")
+JS_ESCAPES = {"n": "\n", "t": "\t", "r": "\r"}
+
+COLUMN_ALIASES = {
+    "to": ("to", "email", "Email", "e-mail"),
+    "clientName": ("clientName", "client_name", "name", "nom", "Nom"),
+    "personalMessage": ("personalMessage", "personal_message", "message", "Message"),
+}
+
+
+class InvitationError(Exception):
+    pass
+
+
+# ============================================
+# Template (compiled once)
+# ============================================
+
+def parse_template(text, i):
+    """text[i] is just after an opening backtick -> (parts, index after the closing backtick)
+
+    parts are ("text", str), ("field", name) or ("if", name, parts).
+    """
+    parts, literal = [], []
+    while True:
+        if i >= len(text):
+            raise InvitationError("Unterminated template literal")
+        c = text[i]
+        if c == "\\":
+            literal.append(JS_ESCAPES.get(text[i + 1], text[i + 1]))
+            i += 2
+        elif c == "`":
+            if literal:
+                parts.append(("text", "".join(literal)))
+            return tuple(parts), i + 1
+        elif text.startswith("${", i):
+            if literal:
+                parts.append(("text", "".join(literal)))
+                literal = []
+            expression, i = parse_expression(text, i + 2)
+            parts.append(expression)
+        else:
+            literal.append(c)
+            i += 1
+
+
+def parse_expression(text, i):
+    """Parse the body of ${...}; only `name` and `name ? `...` : ''` are supported"""
+    code, nested, depth = [], [], 0
+    while True:
+        c = text[i]
+        if c == "`":
+            parts, i = parse_template(text, i + 1)
+            code.append(f"`{len(nested)}`")
+            nested.append(parts)
+            continue
+        if c == "{":
+            depth += 1
+        elif c == "}":
+            if depth == 0:
+                break
+            depth -= 1
+        code.append(c)
+        i += 1
+
+    expression = "".join(code).strip()
+    if FIELD_RE.match(expression):
+        return ("field", expression), i + 1
+    conditional = CONDITIONAL_RE.match(expression)
+    if conditional:
+        return ("if", conditional.group(1), nested[int(conditional.group(2))]), i + 1
+    raise InvitationError(f"Unsupported template expression: ${{{expression}}}")
+
+
+@lru_cache(maxsize=None)
+def compiled_template(worker_path=WORKER_FILE):
+    source = Path(worker_path).read_text(encoding="utf-8")
+    match = TEMPLATE_START_RE.search(source)
+    if not match:
+        raise InvitationError(f"Cannot find generateInvitationEmailHTML in {worker_path}")
+    fields = {name.strip() for name in match.group(1).split(",")}
+    parts, _ = parse_template(source, match.end())
+
+    def check(parts):
+        for part in parts:
+            if part[0] != "text" and part[1] not in fields:
+                raise InvitationError(f"Template uses unknown value '{part[1]}'")
+            if part[0] == "if":
+                check(part[2])
+
+    check(parts)
+    return parts
+
+
+def render(parts, values):
+    out = []
+    for part in parts:
+        if part[0] == "text":
+            out.append(part[1])
+        elif part[0] == "field":
+            # Escaped on purpose: the worker interpolates raw, which lets a name
+            # or message containing & < > or quotes break the email markup
+            out.append(html.escape(str(values.get(part[1]) or "")))
+        elif values.get(part[1]):
+            out.append(render(part[2], values))
+    return "".join(out)
+
+
+def invitation_email(template, recipient, coach_name, invite_link, email_from):
+    """Resend payload, same fields as the worker endpoint"""
+    return {
+        "from": f"{coach_name} via AI-Ikigai <{email_from}>",
+        "to": [recipient["to"]],
+        "reply_to": REPLY_TO,
+        "subject": f"{coach_name} vous invite à découvrir votre Ikigai ✨",
+        "html": render(template, {**recipient, "coachName": coach_name, "inviteLink": invite_link}),
+    }
+
+
+# ============================================
+# Recipients
+# ============================================
+
+def normalise_recipient(row):
+    recipient = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        value = next((row[alias] for alias in aliases if row.get(alias)), "")
+        recipient[field] = str(value).strip()
+    return recipient
+
+
+def load_recipients(path):
+    path = Path(path)
+    if path.suffix.lower() == ".json":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        rows = data.get("clients", []) if isinstance(data, dict) else data
+    else:
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            rows = list(csv.DictReader(f))
+    return [normalise_recipient(row) for row in rows]
+
+
+def validate_recipients(recipients):
+    """-> (recipients to process, results for rejected rows)"""
+    valid, rejected, seen = [], [], set()
+    for recipient in recipients:
+        email = recipient["to"].lower()
+        if not recipient["to"] or not recipient["clientName"]:
+            rejected.append(result(recipient, "skipped", error="Champs requis manquants: to, clientName"))
+        elif not EMAIL_RE.match(email):
+            rejected.append(result(recipient, "skipped", error="Email invalide"))
+        elif email in seen:
+            rejected.append(result(recipient, "skipped", error="Doublon dans la liste"))
+        else:
+            seen.add(email)
+            valid.append(recipient)
+    return valid, rejected
+
+
+def result(recipient, status, invitation_id=None, email_id=None, error=None, attempts=0):
+    return {
+        "to": recipient["to"], "clientName": recipient["clientName"], "status": status,
+        "invitationId": invitation_id, "emailId": email_id, "error": error, "attempts": attempts,
+    }
+
+
+# ============================================
+# HTTP (keep-alive per thread, shared rate limit)
+# ============================================
+
+class HttpClient:
+    """One keep-alive connection per (thread, host)"""
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self.local = threading.local()
+
+    def request(self, method, url, headers, payload=None):
+        parts = urlsplit(url)
+        connections = self.local.__dict__.setdefault("connections", {})
+        key = (parts.scheme, parts.netloc)
+        connection = connections.get(key)
+        if connection is None:
+            factory = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+            connection = connections[key] = factory(parts.netloc, timeout=self.timeout)
+
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        target = parts.path + (f"?{parts.query}" if parts.query else "")
+        try:
+            connection.request(method, target, body=body, headers={"Content-Type": "application/json", **headers})
+            response = connection.getresponse()
+            data = response.read()
+        except (http.client.HTTPException, OSError):
+            connection.close()
+            del connections[key]
+            raise
+        try:
+            decoded = json.loads(data) if data else None
+        except ValueError:
+            decoded = data.decode("utf-8", "replace")
+        return response.status, response.headers, decoded
+
+
+class RateLimiter:
+    """Evenly spaced request slots shared by every thread"""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate > 0 else 0
+        self.lock = threading.Lock()
+        self.next_slot = time.monotonic()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def pause(self, seconds):
+        """Push every pending slot back, e.g. after a 429"""
+        with self.lock:
+            self.next_slot = max(self.next_slot, time.monotonic() + seconds)
+
+
+def retry_delay(attempt, headers):
+    retry_after = headers.get("Retry-After") if headers else None
+    if retry_after and retry_after.replace(".", "", 1).isdigit():
+        return float(retry_after)
+    return min(30.0, 0.5 * 2 ** attempt) * random.uniform(0.8, 1.2)
+
+
+def send_email(client, limiter, url, api_key, payload, idempotency_key, retries):
+    """-> (status, email id, error, attempts)"""
+    headers = {"Authorization": f"Bearer {api_key}", "Idempotency-Key": idempotency_key}
+    error = None
+    for attempt in range(retries + 1):
+        limiter.wait()
+        response_headers = None
+        try:
+            status, response_headers, data = client.request("POST", url, headers, payload)
+        except (http.client.HTTPException, OSError) as e:
+            error = f"{type(e).__name__}: {e}"
+        else:
+            if 200 <= status < 300:
+                return "sent", (data or {}).get("id"), None, attempt + 1
+            message = (data.get("message") or data.get("error")) if isinstance(data, dict) else data
+            error = f"Erreur Resend {status}: {message or 'Échec envoi email'}"
+            if status not in RETRYABLE_STATUSES:
+                return "failed", None, error, attempt + 1
+        if attempt < retries:
+            delay = retry_delay(attempt, response_headers)
+            if response_headers is not None and status == 429:
+                limiter.pause(delay)
+            time.sleep(delay)
+    return "failed", None, error, retries + 1
+
+
+# ============================================
+# Supabase (PostgREST)
+# ============================================
+
+class Supabase:
+    def __init__(self, client, url, service_key):
+        self.client = client
+        self.base = url.rstrip("/") + "/rest/v1"
+        self.headers = {"apikey": service_key, "Authorization": f"Bearer {service_key}"}
+
+    def call(self, method, path, payload=None, prefer=None):
+        headers = dict(self.headers, **({"Prefer": prefer} if prefer else {}))
+        status, _, data = self.client.request(method, self.base + path, headers, payload)
+        if not 200 <= status < 300:
+            message = data.get("message") if isinstance(data, dict) else data
+            raise InvitationError(f"Supabase {method} {path.split('?')[0]} → {status}: {message}")
+        return data
+
+    def coach(self, coach_id):
+        rows = self.call("GET", f"/profiles?select=id,name,email&id=eq.{quote(coach_id)}")
+        return rows[0] if rows else None
+
+    def profiles_by_email(self, emails):
+        """lower-cased email -> profile id, one query per LOOKUP_CHUNK emails
+
+        Matched with ilike: email=in.(...) is case-sensitive, so a profile saved
+        as "Marie@Example.com" would be missed and invited again as pending.
+        """
+        wanted = {email.lower() for email in emails}
+        ordered = sorted(wanted)
+        found = {}
+        for i in range(0, len(ordered), LOOKUP_CHUNK):
+            terms = ",".join(f'email.ilike."{email}"' for email in ordered[i:i + LOOKUP_CHUNK])
+            for row in self.call("GET", f"/profiles?select=id,email&or=({quote(terms)})"):
+                email = (row.get("email") or "").lower()
+                if email in wanted:  # "_" is a wildcard for ilike, keep exact matches only
+                    found[email] = row["id"]
+        return found
+
+    def relations(self, coach_id):
+        return self.call("GET", f"/coach_clients?select=id,client_id,status,invitation_email"
+                                f"&coach_id=eq.{quote(coach_id)}")
+
+    def upsert_relations(self, rows):
+        """Single bulk upsert on the (coach_id, client_id) unique key"""
+        if not rows:
+            return []
+        return self.call("POST", "/coach_clients?on_conflict=coach_id,client_id", rows,
+                         prefer="resolution=merge-duplicates,return=representation")
+
+
+def plan_relations(recipients, coach_id, profiles, relations):
+    """Split recipients like the endpoint does
+
+    -> (rows to upsert, {email: existing pending invitation id}, results for skipped recipients)
+    """
+    related_clients = {row["client_id"] for row in relations if row.get("client_id")}
+    pending = {(row.get("invitation_email") or "").lower(): row["id"]
+               for row in relations if not row.get("client_id") and row.get("status") == "pending"}
+
+    rows, reused, skipped = [], {}, []
+    for recipient in recipients:
+        email = recipient["to"].lower()
+        client_id = profiles.get(email)
+        if client_id and client_id in related_clients:
+            skipped.append(result(recipient, "skipped", error="Ce client est déjà invité"))
+        elif not client_id and email in pending:
+            reused[email] = pending[email]  # re-send the pending invitation instead of duplicating it
+        else:
+            rows.append({
+                "coach_id": coach_id,
+                "client_id": client_id,
+                "status": "active" if client_id else "pending",
+                "invitation_email": email,
+            })
+    return rows, reused, skipped
+
+
+# ============================================
+# Main
+# ============================================
+
+def wrangler_vars(path="wrangler.toml"):
+    if tomllib is None or not os.path.exists(path):
+        return {}
+    with open(path, "rb") as f:
+        return tomllib.load(f).get("vars", {})
+
+
+def write_report(results, path):
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(results[0]) if results else ["to"])
+            writer.writeheader()
+            writer.writerows(results)
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+
+def print_result(entry):
+    icon = {"sent": "✅", "skipped": "⏭️ ", "failed": "❌"}[entry["status"]]
+    detail = entry["error"] or f"invitation {entry['invitationId']}"
+    retries = f" ({entry['attempts']} tentatives)" if entry["attempts"] > 1 else ""
+    print(f"   {icon} {entry['to']}: {detail}{retries}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Send coach invitations to a list of clients")
+    parser.add_argument("input", help="CSV or JSON list of {to, clientName, personalMessage}")
+    parser.add_argument("--coach-id", required=True, help="profiles.id of the inviting coach")
+    parser.add_argument("--invite-base-url", default=DEFAULT_INVITE_BASE_URL,
+                        help=f"Sign-up page of the invitation link (default: {DEFAULT_INVITE_BASE_URL})")
+    parser.add_argument("--concurrency", "-c", type=int, default=4, help="Parallel senders (default: 4)")
+    parser.add_argument("--rate", type=float, default=2.0,
+                        help="Max emails per second across all senders, 0 = unlimited (default: 2, Resend's limit)")
+    parser.add_argument("--retries", type=int, default=3, help="Retries per email on 429/5xx/network errors")
+    parser.add_argument("--timeout", type=float, default=20, help="HTTP timeout in seconds (default: 20)")
+    parser.add_argument("--worker", default=WORKER_FILE, help=f"Worker holding the email template (default: {WORKER_FILE})")
+    parser.add_argument("--supabase-url", help="Default: $SUPABASE_URL, then wrangler.toml")
+    parser.add_argument("--resend-url", default=RESEND_API_URL, help=argparse.SUPPRESS)
+    parser.add_argument("--report", help="Write per-recipient results to this .json or .csv file")
+    parser.add_argument("--dry-run", action="store_true", help="Render every email but write and send nothing")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = {**wrangler_vars(), **os.environ}
+    supabase_url = args.supabase_url or config.get("SUPABASE_URL")
+    email_from = config.get("EMAIL_FROM") or DEFAULT_EMAIL_FROM
+
+    print("📨 Bulk Coach Invitations")
+    print("=" * 60)
+
+    try:
+        template = compiled_template(args.worker)
+    except (OSError, InvitationError) as e:
+        sys.exit(f"❌ {e}")
+
+    recipients, results = validate_recipients(load_recipients(args.input))
+    print(f"📋 {len(recipients)} recipient(s), {len(results)} rejected")
+
+    if args.dry_run:
+        start = time.perf_counter()
+        total = sum(len(invitation_email(template, r, "Coach", args.invite_base_url, email_from)["html"])
+                    for r in recipients)
+        print(f"🧪 Dry run: rendered {len(recipients)} email(s), {total / 1024:.0f} KB, "
+              f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+        for entry in results:
+            print_result(entry)
+        return
+
+    missing = [name for name, value in (("SUPABASE_URL", supabase_url),
+                                        ("SUPABASE_SERVICE_ROLE_KEY", config.get("SUPABASE_SERVICE_ROLE_KEY")),
+                                        ("RESEND_API_KEY", config.get("RESEND_API_KEY"))) if not value]
+    if missing:
+        sys.exit(f"❌ Missing configuration: {', '.join(missing)}")
+
+    client = HttpClient(args.timeout)
+    supabase = Supabase(client, supabase_url, config["SUPABASE_SERVICE_ROLE_KEY"])
+    try:
+        coach = supabase.coach(args.coach_id)
+        if not coach:
+            sys.exit("❌ Coach non trouvé")
+        coach_name = coach.get("name") or coach["email"].split("@")[0]
+        profiles = supabase.profiles_by_email([r["to"] for r in recipients])
+        rows, reused, skipped = plan_relations(recipients, args.coach_id, profiles, supabase.relations(args.coach_id))
+        results.extend(skipped)
+
+        print(f"🔗 Upserting {len(rows)} coach_clients relation(s) in one request "
+              f"({len(reused)} pending invitation(s) reused)...")
+        invitation_ids = dict(reused)
+        for row in supabase.upsert_relations(rows):
+            invitation_ids[row["invitation_email"].lower()] = row["id"]
+    except (http.client.HTTPException, OSError, InvitationError) as e:
+        sys.exit(f"❌ {e}")
+
+    to_send = [r for r in recipients if r["to"].lower() in invitation_ids]
+    print(f"📧 Sending {len(to_send)} email(s) with {args.concurrency} sender(s)"
+          + (f" at ≤ {args.rate:g}/s" if args.rate > 0 else "") + "...")
+
+    limiter = RateLimiter(args.rate)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as pool:
+        futures = {}
+        for recipient in to_send:
+            invitation_id = invitation_ids[recipient["to"].lower()]
+            invite_link = f"{args.invite_base_url}?role=client&coach_id={args.coach_id}&invitation_id={invitation_id}"
+            payload = invitation_email(template, recipient, coach_name, invite_link, email_from)
+            future = pool.submit(send_email, client, limiter, args.resend_url, config["RESEND_API_KEY"],
+                                 payload, f"invitation-{invitation_id}", args.retries)
+            futures[future] = (recipient, invitation_id)
+        for future in as_completed(futures):
+            recipient, invitation_id = futures[future]
+            status, email_id, error, attempts = future.result()
+            entry = result(recipient, status, invitation_id, email_id, error, attempts)
+            results.append(entry)
+            print_result(entry)
+    elapsed = time.perf_counter() - start
+
+    for entry in results:
+        if entry["status"] == "skipped":
+            print_result(entry)
+
+    counts = {status: sum(1 for e in results if e["status"] == status) for status in ("sent", "skipped", "failed")}
+    print()
+    print("=" * 60)
+    print(f"✅ {counts['sent']} sent, {counts['skipped']} skipped, {counts['failed']} failed "
+          f"in {elapsed:.1f} s")
+    if args.report:
+        write_report(results, args.report)
+        print(f"💾 Report saved to {args.report}")
+    if counts["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
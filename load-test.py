@@ -0,0 +1,705 @@
+#!/usr/bin/env python3
+"""
+Test de charge local du worker (questionnaire → analyse IA → invitation)
+
+Replays realistic questionnaire answer sets against a locally running worker
+(wrangler dev) and measures the submit → AI analysis → score calculation →
+/api/send-invitation path without touching any real service:
+
+  - one asyncio HTTP server stands in for Supabase (auth + REST, in-memory
+    tables), the Anthropic and OpenAI APIs, Resend and Brevo, each with its
+    own injected latency (--latency ai=1500:400)
+  - a copy of the worker with the external API origins pointed at that server
+    is written to build/<worker>.loadtest.js
+  - N virtual users loop over the scenario through a keep-alive connection
+    pool; p50/p95/p99 latency and requests per second are reported per
+    endpoint and saved to bench-results/
+
+Typical session (the load starts as soon as the worker answers /api/health):
+    python3 load-test.py --users 20 --duration 60 --wait 120
+    npx wrangler dev build/index-supabase.loadtest.js --var ...   # printed by the first command
+
+Answer sets are drawn from the options of questionnaire.js, so the keyword
+scoring fallback runs on the same values as in production.
+"""
+
+import re
+import sys
+import json
+import math
+import time
+import uuid
+import random
+import asyncio
+import argparse
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qsl, unquote
+
+RESULTS_FOLDER = Path("bench-results")
+BUILD_FOLDER = Path("build")
+QUESTIONNAIRE_SOURCE = Path("questionnaire.js")
+
+# External origins called by the worker -> mock path prefix
+API_ORIGINS = {
+    "https://api.anthropic.com": "/anthropic",
+    "https://api.openai.com": "/openai",
+    "https://api.resend.com": "/resend",
+    "https://api.brevo.com": "/brevo",
+}
+
+# service -> (mean ms, jitter ms)
+DEFAULT_LATENCY = {
+    "supabase": (20, 5),
+    "ai": (1500, 400),
+    "resend": (120, 30),
+    "brevo": (120, 30),
+}
+
+SCENARIO_STEPS = ("submit", "fetch", "invite")
+PERCENTILES = (50, 95, 99)
+
+COACH_ID = "00000000-0000-4000-8000-00000000c0ac"
+COACH_EMAIL = "coach@loadtest.local"
+CLIENT_USER_ID = "00000000-0000-4000-8000-0000000c11e7"
+
+FREE_TEXT_ANSWERS = (
+    "Accompagner les startups tech dans leur stratégie de croissance",
+    "Créer une école de cuisine durable pour les jeunes en reconversion",
+    "Conseiller les PME sur leur transition numérique et écologique",
+    "Monter un studio de design indépendant orienté impact social",
+)
+
+QUESTION_RE = re.compile(r"\{\s*id:\s*(\d+),(.*?)\n    \}", re.S)
+TYPE_RE = re.compile(r"type:\s*\"([\w-]+)\"")
+MAX_SELECT_RE = re.compile(r"maxSelect:\s*(\d+)")
+OPTION_VALUE_RE = re.compile(r"value:\s*(?:\"([^\"]+)\"|(\d+))")
+
+
+# ============================================
+# HTTP/1.1 over asyncio streams
+# ============================================
+
+async def read_headers(reader):
+    """Read header lines up to the blank line -> dict with lowercased names"""
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            return headers
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+
+async def read_body(reader, headers):
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";")[0].strip() or b"0", 16)
+            if size == 0:
+                await read_headers(reader)  # trailers
+                return b"".join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+    length = int(headers.get("content-length") or 0)
+    return await reader.readexactly(length) if length else b""
+
+
+def encode_message(start_line, headers, body):
+    head = [start_line] + [f"{name}: {value}" for name, value in headers.items()]
+    return ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body
+
+
+# ============================================
+# Mock services
+# ============================================
+
+def parse_latency(specs):
+    """['ai=800:200', 'resend=0'] -> DEFAULT_LATENCY with those services overridden"""
+    latency = dict(DEFAULT_LATENCY)
+    for spec in specs or ():
+        service, _, value = spec.partition("=")
+        if service not in latency or not value:
+            raise ValueError(f"Invalid --latency '{spec}' (expected one of {', '.join(latency)}=MS[:JITTER])")
+        mean, _, jitter = value.partition(":")
+        latency[service] = (float(mean), float(jitter or 0))
+    return latency
+
+
+def mock_analysis_text():
+    """AI answer without a score, so the worker runs its keyword scoring fallback"""
+    return json.dumps({
+        "profileSummary": "Profil orienté création et transmission, à l'aise avec l'analyse.",
+        "ikigaiSummary": "Concevoir des outils qui aident les autres à apprendre.",
+        "passions": ["Créer", "Transmettre", "Explorer"],
+        "talents": ["Analyse", "Pédagogie", "Organisation"],
+        "mission": ["Éducation", "Impact social"],
+        "vocation": ["Formation", "Conseil"],
+        "careerRecommendations": [
+            {"title": f"Poste recommandé {i + 1}", "description": "Description personnalisée basée sur le profil réel " * 4,
+             "matchScore": 95 - i * 3}
+            for i in range(10)
+        ],
+        "businessIdeas": [
+            {"title": f"Idée business {i + 1}", "description": "Concept entrepreneurial aligné avec les forces et le marché " * 3,
+             "viabilityScore": 90 - i * 4}
+            for i in range(5)
+        ],
+        "trajectories": ["Designer pédagogique", "Consultant formation", "Fondateur edtech"],
+        "positioning": {"statement": "J'aide...", "linkedinHeadline": "Designer pédagogique", "pitch": "Pitch"},
+        "coachingPrep": {"keyQuestions": [], "topicsToClarify": []},
+    }, ensure_ascii=False)
+
+
+class MockBackend:
+    """Supabase + Anthropic + OpenAI + Resend + Brevo on a single local port
+
+    Supabase tables live in memory and understand the subset of PostgREST the
+    worker uses: eq filters, column lists, single-object Accept, HEAD counts
+    and insert/update/delete with return=representation.
+    """
+
+    def __init__(self, latency, seed=None):
+        self.latency = latency
+        self.random = random.Random(seed)
+        self.calls = {}
+        self.tables = {
+            "profiles": [
+                {"id": COACH_ID, "email": COACH_EMAIL, "name": "Coach Charge", "role": "coach", "plan": "elite_coach"},
+                {"id": CLIENT_USER_ID, "email": "client@loadtest.local", "name": "Client Charge", "role": "client",
+                 "plan": "decouverte"},
+            ],
+            "coach_clients": [],
+            "analyses": [],
+        }
+        self.analysis_text = mock_analysis_text()
+        self.server = None
+
+    async def start(self, host, port):
+        self.server = await asyncio.start_server(self.handle_connection, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def delay(self, service):
+        mean, jitter = self.latency[service]
+        wait = max(0.0, self.random.gauss(mean, jitter)) if jitter else mean
+        if wait:
+            await asyncio.sleep(wait / 1000)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = await read_headers(reader)
+                body = await read_body(reader, headers)
+
+                service, status, extra_headers, payload = await self.dispatch(method, target, headers, body)
+                self.calls[service] = self.calls.get(service, 0) + 1
+
+                data = b"" if payload is None else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                response_headers = {"Content-Type": "application/json; charset=utf-8", **extra_headers,
+                                    "Content-Length": str(len(data))}
+                writer.write(encode_message(f"HTTP/1.1 {status} Mock", response_headers,
+                                            b"" if method == "HEAD" else data))
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except asyncio.CancelledError:
+            pass  # idle keep-alive connection still open when the run ends
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, target, headers, body):
+        """-> (service, status, extra headers, JSON payload | None)"""
+        parts = urlsplit(target)
+        path = parts.path
+        payload = json.loads(body) if body else None
+
+        if path.startswith("/rest/v1/"):
+            await self.delay("supabase")
+            return ("supabase",) + self.rest(method, unquote(path[len("/rest/v1/"):]), parts.query, headers, payload)
+        if path.startswith("/auth/v1/user"):
+            await self.delay("supabase")
+            return "supabase", 200, {}, {"id": CLIENT_USER_ID, "aud": "authenticated", "role": "authenticated",
+                                         "email": "client@loadtest.local"}
+        if path.startswith("/anthropic/"):
+            await self.delay("ai")
+            return "anthropic", 200, {}, {
+                "id": "msg_" + uuid.uuid4().hex[:24], "type": "message", "role": "assistant",
+                "content": [{"type": "text", "text": self.analysis_text}],
+                "usage": {"input_tokens": 1800, "output_tokens": 2400},
+            }
+        if path.startswith("/openai/"):
+            await self.delay("ai")
+            return "openai", 200, {}, {"choices": [{"message": {"role": "assistant", "content": self.analysis_text}}]}
+        if path.startswith("/resend/"):
+            await self.delay("resend")
+            return "resend", 200, {}, {"id": str(uuid.uuid4())}
+        if path.startswith("/brevo/"):
+            await self.delay("brevo")
+            return "brevo", 201, {}, {"messageId": f"<{uuid.uuid4().hex}@smtp-relay.mailin.fr>"}
+        return "unknown", 404, {}, {"message": f"No mock for {method} {path}"}
+
+    def rest(self, method, table, query, headers, payload):
+        rows = self.tables.setdefault(table, [])
+        columns, filters = None, []
+        for name, value in parse_qsl(query, keep_blank_values=True):
+            if name == "select":
+                # embedded resources (table(col)) are not modelled: return whole rows
+                columns = None if value == "*" or "(" in value else [c.strip() for c in value.split(",")]
+            elif name.lower() not in ("order", "limit", "offset", "on_conflict", "columns"):
+                op, _, operand = value.partition(".")
+                filters.append((name, op, operand))
+
+        def matches(row):
+            for name, op, operand in filters:
+                value = row.get(name)
+                if op == "eq" and str(value if value is not None else "null").lower() != operand.lower():
+                    return False
+                if op == "is" and operand == "null" and value is not None:
+                    return False
+                if op == "in" and str(value) not in operand.strip("()").split(","):
+                    return False
+            return True
+
+        prefer = headers.get("prefer", "")
+        single = "vnd.pgrst.object" in headers.get("accept", "")
+
+        if method in ("GET", "HEAD"):
+            selected = [row for row in rows if matches(row)]
+        elif method == "POST":
+            selected = []
+            for row in payload if isinstance(payload, list) else [payload]:
+                row = {"id": str(uuid.uuid4()), "created_at": datetime.now().isoformat(), **row}
+                rows.append(row)
+                selected.append(row)
+        elif method == "PATCH":
+            selected = [row for row in rows if matches(row)]
+            for row in selected:
+                row.update(payload or {})
+        elif method == "DELETE":
+            selected = [row for row in rows if matches(row)]
+            self.tables[table] = [row for row in rows if not matches(row)]
+        else:
+            return 405, {}, {"message": f"Unsupported method {method}"}
+
+        extra = {}
+        if "count=" in prefer or method in ("GET", "HEAD"):
+            extra["Content-Range"] = f"0-{len(selected) - 1}/{len(selected)}" if selected else "*/0"
+        if columns:
+            selected = [{c: row.get(c) for c in columns} for row in selected]
+
+        status = 201 if method == "POST" else 200
+        if method not in ("GET", "HEAD") and "return=representation" not in prefer:
+            return (201 if method == "POST" else 204), extra, None
+        if single:
+            if len(selected) != 1:
+                return 406, extra, {"code": "PGRST116", "details": f"The result contains {len(selected)} rows",
+                                    "hint": None, "message": "JSON object requested, multiple (or no) rows returned"}
+            return status, extra, selected[0]
+        return status, extra, selected
+
+
+# ============================================
+# Worker rewrite
+# ============================================
+
+def rewrite_worker(source, mock_url):
+    """Point every external API origin of the worker at the mock server"""
+    missing = []
+    for origin, prefix in API_ORIGINS.items():
+        if origin not in source:
+            missing.append(origin)
+        source = source.replace(origin, mock_url + prefix)
+    return source, missing
+
+
+def write_loadtest_worker(worker_path, mock_url):
+    source, missing = rewrite_worker(Path(worker_path).read_text(encoding="utf-8"), mock_url)
+    output = BUILD_FOLDER / f"{Path(worker_path).stem}.loadtest.js"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(source, encoding="utf-8")
+    return output, missing
+
+
+def wrangler_command(worker, mock_url, port):
+    variables = {
+        "SUPABASE_URL": mock_url, "SUPABASE_KEY": "loadtest", "SUPABASE_SERVICE_ROLE_KEY": "loadtest",
+        "ANTHROPIC_API_KEY": "loadtest", "OPENAI_API_KEY": "loadtest",
+        "RESEND_API_KEY": "loadtest", "BREVO_API_KEY": "loadtest",
+    }
+    return f"npx wrangler dev {worker} --port {port} " + " ".join(f"--var {k}:{v}" for k, v in variables.items())
+
+
+# ============================================
+# Answer sets
+# ============================================
+
+def load_questions(path=QUESTIONNAIRE_SOURCE):
+    """questionnaire.js -> [(id, type, maxSelect, [option values])]"""
+    questions = []
+    for match in QUESTION_RE.finditer(Path(path).read_text(encoding="utf-8")):
+        block = match.group(2)
+        kind = TYPE_RE.search(block)
+        max_select = MAX_SELECT_RE.search(block)
+        values = [text if text else int(number) for text, number in OPTION_VALUE_RE.findall(block)]
+        questions.append((int(match.group(1)), kind.group(1) if kind else "single",
+                          int(max_select.group(1)) if max_select else 1, values))
+    if not questions:
+        raise ValueError(f"No questions found in {path}")
+    return questions
+
+
+def make_answers(questions, rng):
+    """One answer set, shaped like the `answers` object built by questionnaire.js"""
+    answers = {}
+    for question_id, kind, max_select, values in questions:
+        if kind == "multi-select" and values:
+            answers[str(question_id)] = rng.sample(values, rng.randint(1, min(max_select, len(values))))
+        elif kind == "text" or not values:
+            answers[str(question_id)] = rng.choice(FREE_TEXT_ANSWERS)
+        else:
+            answers[str(question_id)] = rng.choice(values)
+    return answers
+
+
+# ============================================
+# Load generator
+# ============================================
+
+class ConnectionPool:
+    """Keep-alive HTTP/1.1 connections to one host, at most `size` in flight"""
+
+    def __init__(self, base_url, size, timeout):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self.idle = []
+        self.slots = asyncio.Semaphore(size)
+        self.opened = 0
+
+    async def connect(self):
+        self.opened += 1
+        return await asyncio.open_connection(self.host, self.port)
+
+    async def exchange(self, connection, data):
+        reader, writer = connection
+        writer.write(data)
+        await writer.drain()
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed by peer")
+        headers = await read_headers(reader)
+        body = await read_body(reader, headers)
+        return int(status_line.split()[1]), headers, body
+
+    async def request(self, method, path, payload=None, headers=None):
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        data = encode_message(f"{method} {path} HTTP/1.1", {
+            "Host": f"{self.host}:{self.port}", "Content-Type": "application/json",
+            "Content-Length": str(len(body)), **(headers or {}),
+        }, body)
+
+        async with self.slots:
+            connection = self.idle.pop() if self.idle else None
+            reused = connection is not None
+            while True:
+                if connection is None:
+                    connection = await self.connect()
+                try:
+                    status, response_headers, response = await asyncio.wait_for(
+                        self.exchange(connection, data), self.timeout)
+                except (asyncio.IncompleteReadError, ConnectionError) as e:
+                    connection[1].close()
+                    connection = None
+                    if reused:  # the server dropped an idle keep-alive connection
+                        reused = False
+                        continue
+                    raise e
+                except BaseException:
+                    connection[1].close()
+                    raise
+                break
+
+            if response_headers.get("connection", "").lower() == "close":
+                connection[1].close()
+            else:
+                self.idle.append(connection)
+            return status, response
+
+    def close(self):
+        for _, writer in self.idle:
+            writer.close()
+        self.idle.clear()
+
+
+class LoadStats:
+    def __init__(self):
+        self.latencies = {}
+        self.statuses = {}
+        self.errors = {}
+
+    def record(self, endpoint, seconds, status=None, error=None):
+        self.latencies.setdefault(endpoint, []).append(seconds)
+        counts = self.statuses.setdefault(endpoint, {})
+        key = str(status) if status is not None else "error"
+        counts[key] = counts.get(key, 0) + 1
+        if error:
+            self.errors.setdefault(endpoint, {}).setdefault(error, 0)
+            self.errors[endpoint][error] += 1
+
+    def summary(self, elapsed):
+        summary = {}
+        for endpoint, values in self.latencies.items():
+            values = sorted(values)
+            failed = sum(n for code, n in self.statuses[endpoint].items() if code == "error" or code[0] in "45")
+            summary[endpoint] = {
+                "count": len(values),
+                "failed": failed,
+                "rps": len(values) / elapsed if elapsed else 0.0,
+                "meanMs": sum(values) / len(values) * 1000,
+                **{f"p{p}Ms": percentile(values, p) * 1000 for p in PERCENTILES},
+                "maxMs": values[-1] * 1000,
+                "statuses": self.statuses[endpoint],
+                "errors": self.errors.get(endpoint, {}),
+            }
+        return summary
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile"""
+    return sorted_values[max(0, math.ceil(p / 100 * len(sorted_values)) - 1)]
+
+
+class LoadRun:
+    def __init__(self, pool, questions, args, plans):
+        self.pool = pool
+        self.questions = questions
+        self.args = args
+        self.plans = plans
+        self.stats = LoadStats()
+        self.started = 0
+        self.deadline = None
+
+    async def timed(self, endpoint, method, path, payload=None, headers=None):
+        start = time.perf_counter()
+        try:
+            status, body = await self.pool.request(method, path, payload, headers)
+        except asyncio.TimeoutError:
+            self.stats.record(endpoint, time.perf_counter() - start, error="timeout")
+            return None, None
+        except (OSError, asyncio.IncompleteReadError) as e:
+            self.stats.record(endpoint, time.perf_counter() - start, error=type(e).__name__)
+            return None, None
+        self.stats.record(endpoint, time.perf_counter() - start, status)
+        try:
+            return status, json.loads(body) if body else None
+        except ValueError:
+            return status, None
+
+    def next_iteration(self):
+        if self.args.iterations and self.started >= self.args.iterations:
+            return None
+        if self.deadline and time.perf_counter() >= self.deadline:
+            return None
+        self.started += 1
+        return self.started
+
+    async def scenario(self, iteration, rng):
+        start = time.perf_counter()
+        questionnaire_id = None
+        ok = True
+
+        if "submit" in self.args.steps:
+            status, data = await self.timed("POST /api/questionnaire/submit", "POST", "/api/questionnaire/submit", {
+                "answers": make_answers(self.questions, rng),
+                "email": f"client-{iteration}@loadtest.local",
+                "user_plan": rng.choice(self.plans),
+            }, {"Authorization": f"Bearer loadtest-{iteration}"} if rng.random() < self.args.auth_ratio else None)
+            ok = status == 200
+            questionnaire_id = (data or {}).get("questionnaireId")
+
+        if "fetch" in self.args.steps and questionnaire_id:
+            status, _ = await self.timed("GET /api/questionnaire/:id", "GET", f"/api/questionnaire/{questionnaire_id}")
+            ok = ok and status == 200
+
+        if "invite" in self.args.steps:
+            status, _ = await self.timed("POST /api/send-invitation", "POST", "/api/send-invitation", {
+                "to": f"invite-{iteration}-{uuid.uuid4().hex[:8]}@loadtest.local",
+                "clientName": f"Client {iteration}",
+                "personalMessage": "Bonjour, je vous invite à découvrir votre Ikigai.",
+                "coachId": COACH_ID,
+                "inviteBaseUrl": "http://localhost/auth.html",
+            })
+            ok = ok and status == 200
+
+        self.stats.record("scenario", time.perf_counter() - start, 200 if ok else None, None if ok else "step failed")
+
+    async def user(self, index):
+        rng = random.Random(f"{self.args.seed}-{index}")
+        while (iteration := self.next_iteration()) is not None:
+            await self.scenario(iteration, rng)
+
+    async def run(self):
+        start = time.perf_counter()
+        if self.args.duration:
+            self.deadline = start + self.args.duration
+        await asyncio.gather(*(self.user(i) for i in range(self.args.users)))
+        return time.perf_counter() - start
+
+
+async def wait_for_target(pool, seconds):
+    deadline = time.perf_counter() + seconds
+    while True:
+        try:
+            status, _ = await pool.request("GET", "/api/health")
+            if status == 200:
+                return True
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+            pass
+        if time.perf_counter() >= deadline:
+            return False
+        await asyncio.sleep(0.5)
+
+
+# ============================================
+# Reporting
+# ============================================
+
+def print_report(summary, elapsed, mock_calls):
+    print(f"\n📊 {elapsed:.1f} s")
+    print(f"   {'endpoint':<34} {'count':>6} {'fail':>5} {'rps':>7} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for endpoint, stats in summary.items():
+        label = endpoint if endpoint != "scenario" else "↳ full scenario"
+        print(f"   {label:<34} {stats['count']:>6} {stats['failed']:>5} {stats['rps']:>7.1f}"
+              + "".join(f" {stats[f'p{p}Ms']:>6.0f}ms" for p in PERCENTILES))
+        for code, count in stats["statuses"].items():
+            if code[0] in "45":
+                print(f"      ⚠️  HTTP {code} × {count}")
+        for error, count in stats["errors"].items():
+            print(f"      ❌ {error} × {count}")
+    if mock_calls:
+        print("\n🧪 Mock calls: " + ", ".join(f"{service} {count}" for service, count in sorted(mock_calls.items())))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the worker against local Supabase/AI/Resend/Brevo mocks")
+    parser.add_argument("--target", default="http://127.0.0.1:8787", help="Worker URL (default: wrangler dev)")
+    parser.add_argument("--users", "-u", type=int, default=10, help="Concurrent virtual users (default: 10)")
+    parser.add_argument("--duration", "-d", type=float, default=30, help="Test duration in seconds (default: 30)")
+    parser.add_argument("--iterations", "-n", type=int, help="Stop after this many scenarios instead")
+    parser.add_argument("--steps", nargs="+", choices=SCENARIO_STEPS, default=["submit", "invite"],
+                        help="Scenario steps (default: submit invite; fetch needs a KV binding)")
+    parser.add_argument("--plans", default="decouverte,essentiel,premium",
+                        help="user_plan values to draw from (default: decouverte,essentiel,premium)")
+    parser.add_argument("--auth-ratio", type=float, default=0.5,
+                        help="Share of submits sent with a Bearer token (default: 0.5)")
+    parser.add_argument("--timeout", type=float, default=30, help="Per-request timeout in seconds (default: 30)")
+    parser.add_argument("--seed", default="ikigai", help="Random seed for answer sets and latency")
+    parser.add_argument("--latency", "-l", action="append", metavar="SERVICE=MS[:JITTER]",
+                        help="Mock latency, repeatable: supabase, ai, resend, brevo "
+                             f"(default: {', '.join(f'{k}={m:g}:{j:g}' for k, (m, j) in DEFAULT_LATENCY.items())})")
+    parser.add_argument("--mock-host", default="127.0.0.1", help="Mock server host (default: 127.0.0.1)")
+    parser.add_argument("--mock-port", type=int, default=8790, help="Mock server port (default: 8790)")
+    parser.add_argument("--no-mock", action="store_true", help="Do not start the mocks (already running elsewhere)")
+    parser.add_argument("--serve-mocks", action="store_true", help="Only run the mocks until interrupted")
+    parser.add_argument("--worker", default="index-supabase.js", help="Worker to rewrite (default: index-supabase.js)")
+    parser.add_argument("--wait", type=float, default=0,
+                        help="Seconds to wait for the worker to answer /api/health before starting")
+    parser.add_argument("--output", "-o", type=Path, help="Results file (default: bench-results/load-<timestamp>.json)")
+    return parser.parse_args(argv)
+
+
+async def run(args):
+    latency = parse_latency(args.latency)
+    backend = None
+    if not args.no_mock:
+        backend = MockBackend(latency, seed=args.seed)
+        port = await backend.start(args.mock_host, args.mock_port)
+        mock_url = f"http://{args.mock_host}:{port}"
+        worker, missing = write_loadtest_worker(args.worker, mock_url)
+        print(f"🧪 Mocks listening on {mock_url} "
+              f"({', '.join(f'{k} {m:g}±{j:g} ms' for k, (m, j) in latency.items())})")
+        for origin in missing:
+            print(f"   ⚠️  {origin} not found in {args.worker}")
+        print(f"📝 Worker for the test: {worker}")
+        print(f"   {wrangler_command(worker, mock_url, urlsplit(args.target).port or 8787)}")
+
+    if args.serve_mocks:
+        print("\n⏳ Serving mocks, Ctrl+C to stop")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await backend.close()
+
+    pool = ConnectionPool(args.target, args.users, args.timeout)
+    try:
+        if args.wait:
+            print(f"\n⏳ Waiting up to {args.wait:g} s for {args.target}/api/health...")
+            if not await wait_for_target(pool, args.wait):
+                print(f"❌ {args.target} did not answer")
+                return None
+
+        limit = f"{args.iterations} scenarios" if args.iterations else f"{args.duration:g} s"
+        print(f"\n🚀 {args.users} users × {limit} → {args.target}  [{' → '.join(args.steps)}]")
+        load = LoadRun(pool, load_questions(), args, [p for p in args.plans.split(",") if p])
+        if args.iterations:
+            args.duration = 0
+        elapsed = await load.run()
+    finally:
+        pool.close()
+        if backend:
+            await backend.close()
+
+    summary = load.stats.summary(elapsed)
+    print_report(summary, elapsed, backend.calls if backend else None)
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "target": args.target,
+        "params": {"users": args.users, "duration": args.duration, "iterations": args.iterations,
+                   "steps": args.steps, "authRatio": args.auth_ratio,
+                   "latency": {k: {"meanMs": m, "jitterMs": j} for k, (m, j) in latency.items()}},
+        "elapsed": elapsed,
+        "connectionsOpened": pool.opened,
+        "mockCalls": backend.calls if backend else None,
+        "results": summary,
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.serve_mocks and args.no_mock:
+        sys.exit("❌ --serve-mocks and --no-mock are mutually exclusive")
+
+    print("🔥 Worker Load Test")
+    print("=" * 60)
+
+    try:
+        report = asyncio.run(run(args))
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
+        return
+    except ValueError as e:
+        sys.exit(f"❌ {e}")
+    if report is None:
+        sys.exit(1)
+
+    output = args.output or RESULTS_FOLDER / f"load-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Moteur de patch unique pour index-supabase.js
+
+Remplace l'exécution successive de add-helpers.py, add-send-invitation.py,
+add-remaining-endpoints.py, add-score-calc.py et update-invitation-endpoint.py :
+le worker est lu une seule fois, tous les marqueurs sont indexés en un seul
+passage, les patches déclaratifs de PATCHES sont appliqués en mémoire dans
+l'ordre, puis le fichier est écrit une seule fois.
+
+Chaque patch appliqué laisse une empreinte "// @patch <nom> <hash>" dans le
+worker : relancer le script ne duplique rien, les patches déjà présents sont
+détectés pendant le même passage d'indexation et ignorés.
+
+Usage:
+    python3 patch-worker.py              # applique tous les patches
+    python3 patch-worker.py --dry-run    # affiche le diff sans écrire
+    python3 patch-worker.py --only helpers score-calc
+"""
+
+import re
+import sys
+import bisect
+import hashlib
+import difflib
+import argparse
+import importlib
+
+WORKER_FILE = 'index-supabase.js'
+
+ADMIN_STATS_MARKER = '\t\t// GET /api/dashboard/admin/stats'
+PDF_TEMPLATE_MARKER = '// ============================================\n// PDF TEMPLATE: Rapport Ikigai'
+
+# Declarative patch list, applied in order. Payloads come from the original
+# scripts so each one keeps working on its own.
+#   insert_before / insert_after: "anchor" (+ optional "after": search from this marker)
+#   replace_between: replace from "anchor" up to (not including) "end"
+#   present: marker proving the patch was already applied by the legacy scripts
+#            (for replace_between, only searched inside the replaced block)
+PATCHES = [
+    {
+        'name': 'helpers',
+        'op': 'insert_before',
+        'anchor': 'export default {',
+        'present': 'function generatePDFHTML(',
+        'payload': ('add-helpers', 'HELPER_FUNCTIONS'),
+    },
+    {
+        'name': 'send-invitation-endpoint',
+        'op': 'insert_before',
+        'anchor': ADMIN_STATS_MARKER,
+        'present': '// ============ INVITATION ENDPOINT ============',
+        'payload': ('add-send-invitation', 'ENDPOINT_CODE'),
+    },
+    {
+        'name': 'invitation-email-template',
+        'op': 'insert_before',
+        'anchor': PDF_TEMPLATE_MARKER,
+        'present': 'function generateInvitationEmailHTML(',
+        'payload': ('add-send-invitation', 'EMAIL_TEMPLATE'),
+    },
+    {
+        'name': 'remaining-endpoints',
+        'op': 'insert_before',
+        'anchor': ADMIN_STATS_MARKER,
+        'present': '// ============ PDF GENERATION ENDPOINT ============',
+        'payload': ('add-remaining-endpoints', 'ALL_ENDPOINTS'),
+    },
+    {
+        'name': 'score-calc',
+        'op': 'insert_before',
+        'anchor': '\t\t\treturn analysis;',
+        'after': "console.log('✅ Recommandations générées par Claude');",
+        'present': "console.log('📊 Calcul scores depuis questionnaire...');",
+        'payload': ('add-score-calc', 'SCORE_CALC_CODE'),
+    },
+    {
+        'name': 'invitation-coach-relation',
+        'op': 'replace_between',
+        'anchor': '// POST /api/send-invitation',
+        'end': '\t\t// ============ PDF GENERATION ENDPOINT ============',
+        'present': "from('coach_clients')",
+        'payload': ('update-invitation-endpoint', 'NEW_ENDPOINT'),
+    },
+]
+
+
+# Embedded ledger entry written in front of every applied payload
+FINGERPRINT_PREFIX = '// @patch '
+FINGERPRINT_RE = r'// @patch [\w-]+ [0-9a-f]{12}'
+LEDGER_LINE_RE = re.compile(r'[ \t]*' + FINGERPRINT_RE + r'\n')
+
+
+class PatchError(Exception):
+    pass
+
+
+def read_file(filepath):
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def write_file(filepath, content):
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+def load_payload(patch):
+    """Resolve a ('module-name', 'CONSTANT') payload reference to its text"""
+    if 'text' in patch:
+        return patch['text']
+    module_name, attribute = patch['payload']
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def patch_markers(patch):
+    return [patch[key] for key in ('anchor', 'after', 'end', 'present') if key in patch]
+
+
+def fingerprint(patch, payload):
+    """Short content hash identifying one version of a patch"""
+    digest = hashlib.sha256()
+    for part in (patch['op'], patch['anchor'], patch.get('end', ''), payload):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()[:12]
+
+
+def fingerprint_line(patch, fp):
+    return f"{FINGERPRINT_PREFIX}{patch['name']} {fp}"
+
+
+class WorkerDocument:
+    """Worker source held in memory with an incrementally maintained anchor index
+
+    All markers, plus every "// @patch" fingerprint, are located with a single
+    regex pass at load time. After each splice, positions past the edit are
+    shifted and only the edited window is rescanned, so later patches can
+    target text inserted by earlier ones.
+    """
+
+    def __init__(self, text, markers):
+        self.text = text
+        self.markers = sorted(set(markers), key=len, reverse=True)
+        self.max_length = max([len(m) for m in self.markers] + [80])
+        alternation = '|'.join([re.escape(m) for m in self.markers] + [FINGERPRINT_RE])
+        # Lookahead so overlapping markers are all reported
+        self.pattern = re.compile(f'(?=({alternation}))')
+        self.index = {marker: [] for marker in self.markers}
+        self._scan(0, len(text))
+
+    def _scan(self, start, end):
+        for match in self.pattern.finditer(self.text, start, end):
+            marker = match.group(1)
+            if match.start() + len(marker) > end:
+                continue
+            positions = self.index.setdefault(marker, [])
+            i = bisect.bisect_left(positions, match.start())
+            if i == len(positions) or positions[i] != match.start():
+                positions.insert(i, match.start())
+
+    def find(self, marker, start=0):
+        """Position of the first occurrence of marker at or after start"""
+        positions = self.index.get(marker)
+        if positions is None:
+            raise PatchError(f"Marker not indexed: {marker!r}")
+        i = bisect.bisect_left(positions, start)
+        if i == len(positions):
+            raise PatchError(f"Cannot find {marker.strip()!r}")
+        return positions[i]
+
+    def count(self, marker, start=0, end=None):
+        """Occurrences of marker starting in text[start:end]"""
+        positions = self.index.get(marker, [])
+        end = len(self.text) if end is None else end
+        return bisect.bisect_left(positions, end) - bisect.bisect_left(positions, start)
+
+    def applied_fingerprints(self, name):
+        """Fingerprints recorded in the worker for the patch called name"""
+        prefix = f"{FINGERPRINT_PREFIX}{name} "
+        return {m[len(prefix):] for m, positions in self.index.items() if positions and m.startswith(prefix)}
+
+    def splice(self, start, end, replacement):
+        """Replace text[start:end] and keep the anchor index consistent"""
+        self.text = self.text[:start] + replacement + self.text[end:]
+        delta = len(replacement) - (end - start)
+
+        for marker, positions in self.index.items():
+            kept = []
+            for pos in positions:
+                if pos + len(marker) <= start:
+                    kept.append(pos)
+                elif pos >= end:
+                    kept.append(pos + delta)
+                # markers overlapping the edited range are dropped and rescanned
+            self.index[marker] = kept
+
+        self._scan(max(0, start - self.max_length),
+                   min(len(self.text), start + len(replacement) + self.max_length))
+
+
+def stamp(doc, pos, payload, ledger_line):
+    """Prefix payload with its ledger line, matching the surrounding indentation"""
+    line_start = doc.text.rfind('\n', 0, pos) + 1
+    prefix = doc.text[line_start:pos]
+    if prefix and not prefix.strip():
+        # Inserting mid-line (after indentation): the payload continues that line
+        return f"{ledger_line}\n{prefix}{payload}"
+    first_line = next((line for line in payload.split('\n') if line.strip()), '')
+    indent = first_line[:len(first_line) - len(first_line.lstrip())]
+    return f"{indent}{ledger_line}\n{payload}"
+
+
+def apply_patch(doc, patch, payload, ledger_line):
+    """Apply one declarative patch to the document"""
+    start = doc.find(patch['after']) if 'after' in patch else 0
+    pos = doc.find(patch['anchor'], start)
+    op = patch['op']
+
+    if op == 'insert_before':
+        doc.splice(pos, pos, stamp(doc, pos, payload, ledger_line))
+    elif op == 'insert_after':
+        pos += len(patch['anchor'])
+        doc.splice(pos, pos, stamp(doc, pos, payload, ledger_line))
+    elif op == 'replace_between':
+        end = doc.find(patch['end'], pos)
+        # Keep the ledger line of a patch that starts right at the end marker
+        prev_start = doc.text.rfind('\n', 0, max(0, end - 1)) + 1
+        if prev_start > pos and LEDGER_LINE_RE.fullmatch(doc.text, prev_start, end):
+            end = prev_start
+        doc.splice(pos, end, stamp(doc, pos, payload, ledger_line))
+    else:
+        raise PatchError(f"Unknown patch op: {op}")
+
+
+def present_range(doc, patch):
+    """(start, end) where the patch's 'present' marker counts
+
+    A replace_between patch is only present if its marker is inside the block
+    it would replace: markers such as from('coach_clients') also appear in
+    unrelated worker code.
+    """
+    if patch['op'] != 'replace_between':
+        return 0, None
+    try:
+        start = doc.find(patch['after']) if 'after' in patch else 0
+        pos = doc.find(patch['anchor'], start)
+        return pos, doc.find(patch['end'], pos)
+    except PatchError:
+        return 0, 0
+
+
+def patch_status(doc, patch, fp):
+    """'applied', 'outdated', 'legacy' or None (pending), from the anchor index"""
+    recorded = doc.applied_fingerprints(patch['name'])
+    if fp in recorded:
+        return 'applied'
+    if recorded:
+        return 'outdated'
+    if 'present' in patch and doc.count(patch['present'], *present_range(doc, patch)):
+        return 'legacy'
+    return None
+
+
+def run_patches(content, patches):
+    """Apply pending patches in memory; return (new content, number applied)"""
+    markers = [m for patch in patches for m in patch_markers(patch)]
+    doc = WorkerDocument(content, markers)
+    applied = 0
+
+    for patch in patches:
+        payload = load_payload(patch)
+        fp = fingerprint(patch, payload)
+        status = patch_status(doc, patch, fp)
+
+        if status == 'applied':
+            print(f"   ⏭️  {patch['name']} (already applied, {fp})")
+        elif status == 'legacy':
+            print(f"   ⏭️  {patch['name']} (already present, applied by the legacy script)")
+        elif status == 'outdated':
+            recorded = ', '.join(sorted(doc.applied_fingerprints(patch['name'])))
+            print(f"   ⚠️  {patch['name']} applied with a different version ({recorded} ≠ {fp}), skipped")
+        else:
+            apply_patch(doc, patch, payload, fingerprint_line(patch, fp))
+            applied += 1
+            print(f"   ✅ {patch['name']} ({fp})")
+
+    return doc.text, applied
+
+
+def select_patches(names):
+    if not names:
+        return PATCHES
+    known = {patch['name'] for patch in PATCHES}
+    unknown = [name for name in names if name not in known]
+    if unknown:
+        raise PatchError(f"Unknown patch(es): {', '.join(unknown)}")
+    return [patch for patch in PATCHES if patch['name'] in names]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Apply the index-supabase.js patch set in one pass")
+    parser.add_argument('--file', default=WORKER_FILE, help=f"Worker file (default: {WORKER_FILE})")
+    parser.add_argument('--dry-run', action='store_true', help="Print a unified diff instead of writing")
+    parser.add_argument('--only', nargs='+', metavar='NAME', help="Apply only these patches (in PATCHES order)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    print(f"📖 Reading {args.file}...")
+    content = read_file(args.file)
+
+    try:
+        patches = select_patches(args.only)
+        print(f"✏️  Applying {len(patches)} patch(es):")
+        new_content, applied = run_patches(content, patches)
+    except PatchError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if not applied:
+        print(f"✅ Nothing to do, {args.file} is up to date")
+        return
+
+    if args.dry_run:
+        diff = difflib.unified_diff(
+            content.splitlines(keepends=True), new_content.splitlines(keepends=True),
+            fromfile=f'a/{args.file}', tofile=f'b/{args.file}',
+        )
+        sys.stdout.writelines(diff)
+        print(f"\n🔍 Dry run: {args.file} not modified")
+        return
+
+    print(f"💾 Writing {args.file}...")
+    write_file(args.file, new_content)
+    print("✅ Done!")
+
+
+if __name__ == '__main__':
+    main()
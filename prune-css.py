@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+Remove unused CSS per page and inline the critical subset
+
+For every HTML entry point, the selectors that can match are worked out from
+the page itself: class names, ids and tags in the markup, plus every word of
+its inline and linked local scripts (classes toggled from JavaScript are kept).
+Then:
+  - inline <style> blocks are pruned in place
+  - each linked local stylesheet is replaced by a pruned per-page copy, loaded
+    without blocking first paint, and the rules used by the top of the page
+    (first CRITICAL_HTML_BYTES of <body>) are inlined in a <style> block
+
+Pruning results are cached by (stylesheet hash, page vocabulary hash), so a
+rebuild only re-prunes what actually changed.
+
+build-assets.py applies the same pass with --prune-css.
+
+Usage:
+    python3 prune-css.py                        # report what would be removed
+    python3 prune-css.py -o css-pruned          # write pruned pages and sheets
+    python3 prune-css.py index.html coach.html
+"""
+
+import re
+import json
+import hashlib
+import argparse
+import posixpath
+from pathlib import Path
+
+ENTRY_PAGES = [
+    "index.html", "questionnaire.html", "dashboard-client.html", "coach.html",
+    "blog.html", "blog/index.html", "blog/article.html", "blog/article-template-new.html",
+    "blog-article-template.html",
+    # Pages linking styles.css
+    "buy-analyses.html", "cgv.html", "confidentialite.html", "contact.html", "mentions-legales.html",
+    "dashboard-coach-settings.html", "profile.html", "reset-password.html", "update-password.html",
+]
+CACHE_FILE = ".css-prune-cache.json"
+CACHE_VERSION = 1
+CACHE_MAX_ENTRIES = 500
+
+CRITICAL_HTML_BYTES = 8000  # markup after <body> treated as above the fold
+CRITICAL_CSS_BUDGET = 14 * 1024  # warn past this: it no longer fits the first round trip
+
+# Selectors that apply to every page whatever its content
+ALWAYS_USED_TAGS = {"html", "body", "*"}
+
+
+# ============================================
+# CSS parsing
+# ============================================
+
+CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+# Nested at-rules whose body is a list of rules (anything else keeps its body as is)
+GROUPING_AT_RULES = ("@media", "@supports", "@layer", "@container", "@document")
+
+
+def _matching_brace(css, start):
+    """Index of the "}" closing the "{" at start, skipping strings"""
+    depth = 0
+    i = start
+    while i < len(css):
+        c = css[i]
+        if c in "\"'":
+            end = css.find(c, i + 1)
+            while end > 0 and css[end - 1] == "\\":
+                end = css.find(c, end + 1)
+            i = len(css) if end < 0 else end
+        elif c == "{":
+            depth += 1
+        elif c == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    return len(css)
+
+
+def parse_css(css):
+    """Parse a stylesheet into nodes
+
+    ("rule", selectors, declarations), ("group", prelude, children),
+    ("block", prelude, body) for @font-face / @keyframes / @page...,
+    ("statement", text, None) for @import / @charset.
+    """
+    css = CSS_COMMENT_RE.sub("", css)
+    nodes = []
+    i = 0
+    while i < len(css):
+        brace = css.find("{", i)
+        semicolon = css.find(";", i)
+        prelude_end = brace if brace >= 0 else len(css)
+        prelude = css[i:prelude_end].strip()
+
+        if prelude.startswith("@") and 0 <= semicolon < prelude_end:
+            nodes.append(("statement", css[i:semicolon].strip(), None))
+            i = semicolon + 1
+            continue
+        if brace < 0:
+            break
+
+        end = _matching_brace(css, brace)
+        body = css[brace + 1:end]
+        if prelude.lower().startswith(GROUPING_AT_RULES):
+            nodes.append(("group", prelude, parse_css(body)))
+        elif prelude.startswith("@"):
+            nodes.append(("block", prelude, body.strip()))
+        elif prelude:
+            nodes.append(("rule", split_selectors(prelude), body.strip()))
+        i = end + 1
+    return nodes
+
+
+def split_selectors(prelude):
+    """Split a selector list on top-level commas (not inside :is(...) etc.)"""
+    selectors, depth, start = [], 0, 0
+    for i, c in enumerate(prelude):
+        if c in "([":
+            depth += 1
+        elif c in ")]":
+            depth -= 1
+        elif c == "," and depth == 0:
+            selectors.append(prelude[start:i].strip())
+            start = i + 1
+    selectors.append(prelude[start:].strip())
+    return [s for s in selectors if s]
+
+
+def count_selectors(nodes):
+    """Number of selectors in a parsed stylesheet, nested groups included"""
+    total = 0
+    for kind, head, body in nodes:
+        if kind == "rule":
+            total += len(head)
+        elif kind == "group":
+            total += count_selectors(body)
+    return total
+
+
+def serialize(nodes):
+    out = []
+    for kind, head, body in nodes:
+        if kind == "rule":
+            out.append(f"{','.join(head)}{{{body}}}")
+        elif kind == "group":
+            out.append(f"{head}{{{serialize(body)}}}")
+        elif kind == "block":
+            out.append(f"{head}{{{body}}}")
+        else:
+            out.append(f"{head};")
+    return "\n".join(out)
+
+
+# ============================================
+# Page vocabulary and selector matching
+# ============================================
+
+WORD_RE = re.compile(r"[A-Za-z_][\w-]*")
+TAG_RE = re.compile(r"<([a-zA-Z][\w-]*)")
+ATTR_VALUE_RE = re.compile(r"""\b(?:class|id)\s*=\s*(?:"([^"]*)"|'([^']*)')""", re.I)
+SCRIPT_RE = re.compile(r"<script\b.*?</script\s*>", re.S | re.I)
+BODY_RE = re.compile(r"<body\b[^>]*>", re.I)
+
+PSEUDO_RE = re.compile(r"::?[\w-]+(?:\((?:[^()]|\([^()]*\))*\))?")
+ATTRIBUTE_RE = re.compile(r"\[[^\]]*\]")
+CLASS_RE = re.compile(r"\.([\w-]+)")
+ID_RE = re.compile(r"#([\w-]+)")
+SELECTOR_TAG_RE = re.compile(r"(?:^|[\s>+~(])([a-zA-Z][\w-]*)")
+
+
+def page_vocabulary(html, scripts=()):
+    """Words and tags that selectors may refer to on this page
+
+    Every identifier-like word of the markup and of its scripts counts as a
+    possible class or id, which keeps classes added at runtime.
+    """
+    words = set(WORD_RE.findall(html))
+    tags = {tag.lower() for tag in TAG_RE.findall(html)}
+    for script in scripts:
+        words.update(WORD_RE.findall(script))
+        tags.update(tag.lower() for tag in TAG_RE.findall(script))
+    return words, tags | ALWAYS_USED_TAGS
+
+
+def critical_vocabulary(html):
+    """Classes, ids and tags present in the first CRITICAL_HTML_BYTES of <body>"""
+    body = BODY_RE.search(html)
+    top = html[body.start() if body else 0:]
+    top = SCRIPT_RE.sub("", top)[:CRITICAL_HTML_BYTES]
+    words = set()
+    for double, single in ATTR_VALUE_RE.findall(top):
+        words.update((double or single).split())
+    tags = {tag.lower() for tag in TAG_RE.findall(top)}
+    return words, tags | ALWAYS_USED_TAGS
+
+
+def selector_used(selector, words, tags):
+    """Whether every class, id and tag of selector exists in the vocabulary"""
+    if "\\" in selector:
+        return True  # escaped names: not worth guessing
+    simple = ATTRIBUTE_RE.sub("", PSEUDO_RE.sub("", selector))
+    if not all(name in words for name in CLASS_RE.findall(simple)):
+        return False
+    if not all(name in words for name in ID_RE.findall(simple)):
+        return False
+    simple = CLASS_RE.sub("", ID_RE.sub("", simple))
+    return all(tag.lower() in tags for tag in SELECTOR_TAG_RE.findall(simple))
+
+
+KEYFRAMES_RE = re.compile(r"@(?:-\w+-)?keyframes\s+([\w-]+)", re.I)
+
+
+def prune_nodes(nodes, words, tags):
+    kept = []
+    for kind, head, body in nodes:
+        if kind == "rule":
+            selectors = [s for s in head if selector_used(s, words, tags)]
+            if selectors:
+                kept.append((kind, selectors, body))
+        elif kind == "group":
+            children = prune_nodes(body, words, tags)
+            if children:
+                kept.append((kind, head, children))
+        else:
+            kept.append((kind, head, body))
+    return kept
+
+
+def drop_unused_keyframes(nodes, css_text):
+    """Remove @keyframes no remaining declaration refers to"""
+    kept = []
+    for kind, head, body in nodes:
+        match = KEYFRAMES_RE.match(head) if kind == "block" else None
+        if match and not re.search(rf"(?<![\w-]){re.escape(match.group(1))}(?![\w-])",
+                                   KEYFRAMES_RE.sub("", css_text)):
+            continue
+        if kind == "group":
+            body = drop_unused_keyframes(body, css_text)
+        kept.append((kind, head, body))
+    return kept
+
+
+def prune_css(css, vocabulary, cache=None):
+    """Return css restricted to the rules the vocabulary can match"""
+    words, tags = vocabulary
+    key = None
+    if cache is not None:
+        digest = hashlib.sha256()
+        digest.update(css.encode("utf-8"))
+        for name in sorted(words) + ["\0"] + sorted(tags):
+            digest.update(name.encode("utf-8") + b"\n")
+        key = digest.hexdigest()
+        if key in cache.entries:
+            cache.used.add(key)
+            return cache.entries[key]
+
+    nodes = prune_nodes(parse_css(css), words, tags)
+    pruned = serialize(drop_unused_keyframes(nodes, serialize(nodes)))
+
+    if cache is not None:
+        cache.entries[key] = pruned
+        cache.used.add(key)
+    return pruned
+
+
+class PruneCache:
+    """Pruning results keyed by (stylesheet, vocabulary) hash, stored as JSON"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.used = set()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.entries = data["entries"] if data.get("version") == CACHE_VERSION else {}
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            self.entries = {}
+
+    def save(self):
+        """Write the entries used by this run first, then older ones up to CACHE_MAX_ENTRIES"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        entries = {key: self.entries[key] for key in sorted(self.used)}
+        for key, value in self.entries.items():
+            if len(entries) >= CACHE_MAX_ENTRIES:
+                break
+            entries.setdefault(key, value)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "entries": entries}, f)
+
+
+# ============================================
+# Pages
+# ============================================
+
+# Both match HTML comments first, so commented-out markup is left alone
+INLINE_STYLE_RE = re.compile(r"<!--.*?-->|(<style\b[^>]*>)(.*?)(</style\s*>)", re.S | re.I)
+STYLESHEET_LINK_RE = re.compile(r"<!--.*?-->|<link\b[^>]*\brel\s*=\s*[\"']?stylesheet[^>]*>", re.S | re.I)
+HREF_RE = re.compile(r"""\bhref\s*=\s*(["'])([^"']+)\1""", re.I)
+SCRIPT_SRC_RE = re.compile(r"""<script\b[^>]*\bsrc\s*=\s*(["'])([^"']+)\1""", re.I)
+INLINE_SCRIPT_RE = re.compile(r"<script\b[^>]*>(.*?)</script\s*>", re.S | re.I)
+
+
+def resolve(page_path, url):
+    """Site-relative path of a local URL, or None for external ones"""
+    if re.match(r"^(?:[a-z][a-z0-9+.-]*:|//|#)", url, re.I):
+        return None
+    path = re.split(r"[?#]", url, maxsplit=1)[0]
+    if path.startswith("/"):
+        return path.lstrip("/")
+    return posixpath.normpath(posixpath.join(posixpath.dirname(page_path), path))
+
+
+def prune_page(html, page_path, read_file, emit_sheet, cache=None):
+    """Prune one page's CSS
+
+    read_file(site_path) returns a local file's text or None; emit_sheet(
+    site_path, css) stores a pruned sheet and returns its site path.
+    Returns (new html, stats) where stats lists (source, bytes before, bytes
+    after, critical bytes, selectors before, selectors after).
+    """
+    scripts = INLINE_SCRIPT_RE.findall(html)
+    for _, src in SCRIPT_SRC_RE.findall(html):
+        target = resolve(page_path, src)
+        text = read_file(target) if target else None
+        if text:
+            scripts.append(text)
+    vocabulary = page_vocabulary(html, scripts)
+    critical = critical_vocabulary(html)
+    stats = []
+
+    def replace_style(match):
+        open_tag, css, close_tag = match.groups()
+        if open_tag is None:
+            return match.group(0)
+        pruned = prune_css(css, vocabulary, cache)
+        stats.append(("<style>", len(css), len(pruned), len(pruned), count_selectors(parse_css(css)), count_selectors(parse_css(pruned))))
+        return f"{open_tag}\n{pruned}\n{close_tag}"
+
+    def replace_link(match):
+        link = match.group(0)
+        if link.startswith("<!--"):
+            return link
+        href = HREF_RE.search(link)
+        target = resolve(page_path, href.group(2)) if href else None
+        css = read_file(target) if target else None
+        if css is None:
+            return link
+        pruned = prune_css(css, vocabulary, cache)
+        above_fold = prune_css(pruned, critical, cache)
+        stats.append((target, len(css), len(pruned), len(above_fold),
+                      count_selectors(parse_css(css)), count_selectors(parse_css(pruned))))
+        if above_fold == pruned:
+            return f"<style>\n{pruned}\n</style>"  # everything is critical: no sheet left to load
+        sheet = emit_sheet(target, pruned)
+        url = posixpath.relpath(sheet, posixpath.dirname(page_path) or ".")
+        if href.group(2).startswith("/"):
+            url = "/" + sheet
+        # Critical rules inline, the rest of the pruned sheet without blocking render
+        return (
+            f"<style>\n{above_fold}\n</style>\n"
+            f"<link rel=\"stylesheet\" href=\"{url}\" media=\"print\" onload=\"this.media='all'\">"
+            f"<noscript><link rel=\"stylesheet\" href=\"{url}\"></noscript>"
+        )
+
+    html = INLINE_STYLE_RE.sub(replace_style, html)
+    html = STYLESHEET_LINK_RE.sub(replace_link, html)
+    return html, stats
+
+
+def pruned_sheet_path(sheet_path, page_path):
+    """styles.css used by blog/index.html -> styles.blog-index.css"""
+    stem, ext = posixpath.splitext(sheet_path)
+    page = re.sub(r"[^\w-]+", "-", posixpath.splitext(page_path)[0]).strip("-")
+    return f"{stem}.{page}{ext}"
+
+
+def print_stats(page_path, stats):
+    print(f"📄 {page_path}")
+    if not stats:
+        print("   (no stylesheet)")
+    for source, before, after, critical, selectors, kept in stats:
+        line = (f"   {source:<20} {kept:4d}/{selectors:<4d} selectors kept, "
+                f"{before / 1024:6.1f} KB → {after / 1024:6.1f} KB")
+        if source != "<style>":
+            line += f", {critical / 1024:.1f} KB inlined"
+            if critical > CRITICAL_CSS_BUDGET:
+                line += " ⚠️  over the critical budget"
+        print(line)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Prune unused CSS per page and inline critical CSS")
+    parser.add_argument("pages", nargs="*", default=ENTRY_PAGES, help="HTML entry points (default: main pages)")
+    parser.add_argument("--output", "-o", type=Path,
+                        help="Write pruned pages and stylesheets here (default: report only)")
+    parser.add_argument("--no-cache", action="store_true", help=f"Ignore {CACHE_FILE}")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    root = Path(".")
+    cache = PruneCache(args.output / CACHE_FILE) if args.output and not args.no_cache else None
+
+    print("✂️  CSS Pruning")
+    print("=" * 60)
+
+    def read_file(site_path):
+        path = root / site_path
+        return path.read_text(encoding="utf-8") if path.is_file() else None
+
+    total_before, total_after = 0, 0
+    for page_path in args.pages:
+        html = read_file(page_path)
+        if html is None:
+            print(f"⚠️  Skipping {page_path} - not found")
+            continue
+
+        def emit_sheet(sheet_path, css, page_path=page_path):
+            name = pruned_sheet_path(sheet_path, page_path)
+            if args.output:
+                (args.output / name).parent.mkdir(parents=True, exist_ok=True)
+                (args.output / name).write_text(css, encoding="utf-8")
+            return name
+
+        new_html, stats = prune_page(html, page_path, read_file, emit_sheet, cache)
+        print_stats(page_path, stats)
+        total_before += sum(s[1] for s in stats)
+        total_after += sum(s[2] for s in stats)
+
+        if args.output:
+            (args.output / page_path).parent.mkdir(parents=True, exist_ok=True)
+            (args.output / page_path).write_text(new_html, encoding="utf-8")
+
+    if cache is not None:
+        cache.save()
+
+    print()
+    print("=" * 60)
+    print(f"✅ CSS: {total_before / 1024:.1f} KB → {total_after / 1024:.1f} KB across {len(args.pages)} page(s)")
+    if not args.output:
+        print("🔍 Report only, rerun with -o DIR to write the pruned pages")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Refresh blog article assets and metadata in a single pass per PDF
+
+Opens every article PDF once and, from the same document handle, renders the
+cover set (as extract-pdf-images.py does), extracts the page text (as
+extract-text.py does) and computes page count, word count and readingTime.
+The results are merged into blog/data/articles.json (image url, size,
+placeholder and dominant colour, readingTime).
+
+Without --write nothing is written: covers are not rendered (image fields
+are compared against the cached render when it is up to date) and the
+manifests, articles.json and thumbnail atlas are left untouched.
+
+Usage:
+    python3 refresh-articles.py                 # show the articles.json changes
+    python3 refresh-articles.py --write -j 0    # apply them, one worker per core
+    python3 refresh-articles.py --text-output texts.jsonl
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import argparse
+import importlib
+from concurrent.futures import ProcessPoolExecutor
+
+images = importlib.import_module("extract-pdf-images")
+extract_text = importlib.import_module("extract-text")
+
+ARTICLES_JSON = images.ARTICLES_JSON
+WORDS_PER_MINUTE = 200
+WORD_RE = re.compile(r"\w+(?:['’-]\w+)*")
+
+
+def reading_time(word_count):
+    """Estimated reading time in whole minutes (at least 1)"""
+    return max(1, math.ceil(word_count / WORDS_PER_MINUTE))
+
+
+def process_pdf(job):
+    """Worker entry point: cover + text + metadata from one fitz.open()
+
+    Returns a record dict; "outputs" is None if the cover failed or was not
+    rendered (render=False, the read-only mode).
+    """
+    article_num, pdf_path, output_filename, render = job
+    lines = [f"🔄 Processing: {pdf_path.name}"]
+    record = {"id": article_num, "pdf": pdf_path.name, "outputs": None, "log": lines}
+
+    try:
+        with extract_text.fitz.open(str(pdf_path)) as doc:
+            if render:
+                record["outputs"] = images.render_cover(doc, output_filename, log=lines.append)
+            pages = [text for _, text in extract_text.iter_page_text(doc, len(doc), sys.maxsize)]
+    except Exception as e:
+        lines.append(f"   ❌ Error: {e}")
+        return record
+
+    word_count = sum(len(WORD_RE.findall(text)) for text in pages)
+    record.update({
+        "pageCount": len(pages),
+        "wordCount": word_count,
+        "readingTime": reading_time(word_count),
+        "pages": pages,
+    })
+    lines.append(f"   📝 {len(pages)} pages, {word_count} words, ~{record['readingTime']} min")
+    return record
+
+
+def run_jobs(jobs, workers):
+    if workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            yield process_pdf(job)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        yield from pool.map(process_pdf, jobs)
+
+
+def merge_article(article, record):
+    """Apply a record's fields to an articles.json entry; return the list of changes"""
+    changes = []
+    if "readingTime" in record and article.get("readingTime") != record["readingTime"]:
+        changes.append(f"readingTime {article.get('readingTime')} → {record['readingTime']}")
+        article["readingTime"] = record["readingTime"]
+
+    if record["outputs"]:
+        url = images.IMAGE_URL_PREFIX + record["outputs"][0]["file"]
+        image = article.setdefault("image", {"alt": article.get("title", "")})
+        if image.get("url") != url:
+            changes.append(f"image.url {image.get('url')} → {url}")
+            image["url"] = url
+        changes.extend(f"image.{key} updated" for key in images.apply_cover_fields(article, record["outputs"]))
+    return changes
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Render covers and refresh articles.json in one pass per PDF")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Number of worker processes (0 = one per CPU core, default: 1)")
+    parser.add_argument("--write", action="store_true", help=f"Save the changes to {ARTICLES_JSON}")
+    parser.add_argument("--text-output", metavar="FILE",
+                        help="Also write extracted page text as JSONL (file, page, text)")
+    parser.add_argument("--dedupe", action="store_true",
+                        help="Point covers that render the same at one canonical file (as extract-pdf-images.py --dedupe)")
+    parser.add_argument("--dedupe-threshold", type=int, default=images.DEDUPE_THRESHOLD, metavar="BITS",
+                        help=f"Perceptual hash distance for --dedupe candidates (default: {images.DEDUPE_THRESHOLD})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    workers = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
+    print("🚀 Article Refresh (cover + text + metadata, one parse per PDF)")
+    print("=" * 60)
+
+    if not images.PDF_FOLDER.exists():
+        print(f"❌ Folder not found: {images.PDF_FOLDER}")
+        sys.exit(1)
+
+    with open(ARTICLES_JSON, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    articles_by_id = {article["id"]: article for article in data["articles"]}
+
+    jobs = []
+    for pdf_file in sorted(images.PDF_FOLDER.glob("*.pdf")):
+        article_num = images.extract_article_number(pdf_file.stem)
+        if article_num in images.ARTICLE_SLUGS and article_num in articles_by_id:
+            jobs.append((article_num, pdf_file, f"article-{article_num}.png", args.write))
+        else:
+            print(f"⚠️  Skipping {pdf_file.name} - article number: {article_num}")
+
+    if args.write:
+        images.OUTPUT_FOLDER.mkdir(parents=True, exist_ok=True)
+    manifest = images.load_manifest()
+    params = images.render_params()
+    text_out = open(args.text_output, "w", encoding="utf-8") if args.text_output else None
+    records = []
+    total_changes = 0
+
+    try:
+        for (article_num, pdf_file, output_filename, render), record in zip(jobs, run_jobs(jobs, workers)):
+            for line in record["log"]:
+                print(line)
+
+            entry = manifest["images"].get(output_filename)
+            fingerprint = images.source_fingerprint(pdf_file, entry)
+            if record["outputs"]:
+                manifest["images"][output_filename] = images.manifest_entry(
+                    article_num, pdf_file, fingerprint, params, record["outputs"])
+            elif not render:
+                # Read-only: compare against the cached render when it matches this PDF
+                if images.is_up_to_date(entry, fingerprint[2], params, output_filename):
+                    record["outputs"] = entry["outputs"]
+                else:
+                    print(f"   🖼️  {output_filename} is out of date, --write re-renders it")
+
+            if text_out:
+                for page, text in enumerate(record.get("pages", []), start=1):
+                    text_out.write(json.dumps({"file": str(pdf_file), "page": page, "text": text},
+                                              ensure_ascii=False) + "\n")
+            records.append((output_filename, record))
+    finally:
+        if text_out:
+            text_out.close()
+
+    # Identical covers share one file; articles.json points at the canonical one
+    clusters = {}
+    if args.write:
+        clusters = images.resolve_duplicates(manifest["images"], {"dedupe": images.dedupe_option(args)}, params)
+    if clusters:
+        print(f"♻️  Duplicate covers: {sum(map(len, clusters.values()))} share {len(clusters)} canonical file(s)")
+        for line in images.describe_clusters(clusters):
+            print(line)
+
+    for output_filename, record in records:
+        if record["outputs"]:
+            record["outputs"] = manifest["images"].get(output_filename, {}).get("outputs")
+        print(f"📝 {record['pdf']}")
+        for change in merge_article(articles_by_id[record["id"]], record):
+            print(f"   ✏️  {change}")
+            total_changes += 1
+
+    if args.write:
+        images.save_manifest(manifest)
+        images.COVER_MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+        images.save_manifest(images.build_cover_manifest(manifest["images"]), images.COVER_MANIFEST_PATH)
+
+    print()
+    print("=" * 60)
+    if args.write and total_changes:
+        images.write_articles_json(data, ARTICLES_JSON)
+        print(f"✅ {total_changes} change(s) written to {ARTICLES_JSON}")
+    elif total_changes:
+        print(f"🔍 {total_changes} change(s) pending, rerun with --write to save {ARTICLES_JSON}")
+    else:
+        print(f"✅ {ARTICLES_JSON} already up to date")
+    if args.write:
+        print(f"🧩 Thumbnail atlas: {images.describe_atlas(images.build_thumbnail_atlas())}")
+
+
+if __name__ == "__main__":
+    main()
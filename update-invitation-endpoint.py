@@ -3,30 +3,17 @@
 Script to add coach-client relationship creation to the invitation endpoint
 """
 
-file_path = 'index-supabase.js'
+import sys
+import importlib
 
-# Read the entire file
-with open(file_path, 'r', encoding='utf-8') as f:
-    content = f.read()
+file_path = 'index-supabase.js'
 
 # Find the start of the POST /api/send-invitation endpoint
 start_marker = "// POST /api/send-invitation"
 end_marker = "\t\t// ============ PDF GENERATION ENDPOINT ============"
 
-# Find positions
-start_pos = content.find(start_marker)
-end_pos = content.find(end_marker)
-
-if start_pos == -1 or end_pos == -1:
-    print("❌ Could not find markers")
-    exit(1)
-
-# Extract the part before and after
-before = content[:start_pos]
-after = content[end_pos:]
-
 # New endpoint code with coach_clients relationship creation
-new_endpoint = '''// POST /api/send-invitation
+NEW_ENDPOINT = '''// POST /api/send-invitation
 \tif (path === '/api/send-invitation' && method === 'POST') {
 \t\ttry {
 \t\t\tconst { to, clientName, personalMessage, coachId } = await request.json();
@@ -173,11 +160,10 @@ new_endpoint = '''// POST /api/send-invitation
 
 \t'''
 
-# Reconstruct file
-new_content = before + new_endpoint + after
-
-# Write back
-with open(file_path, 'w', encoding='utf-8') as f:
-    f.write(new_content)
-
-print("✅ Invitation endpoint updated with coach-client relationship creation")
+if __name__ == '__main__':
+    # Applied through patch-worker.py: it records the patch in the worker's
+    # "// @patch" ledger and skips it when it is already there, so running
+    # this script twice (or after patch-worker.py) no longer duplicates code.
+    # Extra arguments (--dry-run, --file) are passed through.
+    patcher = importlib.import_module('patch-worker')
+    patcher.main(['--only', 'invitation-coach-relation'] + sys.argv[1:])